@@ -0,0 +1,58 @@
+"""Cached system accessibility settings (macOS).
+
+Reading a setting means running `defaults`, which is far too slow for the
+first frame of an animation. AccessibilitySettings reads once at startup and
+then refreshes on a background timer; callers get the cached value instantly.
+"""
+
+import subprocess
+import sys
+import threading
+
+REFRESH_INTERVAL = 60  # seconds
+
+
+class AccessibilitySettings:
+    """Background-refreshed cache of the user's accessibility preferences."""
+
+    def __init__(self, refresh_interval=REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.reduce_motion = False
+        self.spawn_count = 0  # `defaults` processes started
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Read the settings in the background now and every `refresh_interval`."""
+        if sys.platform != "darwin" or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh(self):
+        """Re-read the settings (blocking; normally called by the refresh thread)."""
+        self.spawn_count += 1
+        self.reduce_motion = self._read_reduce_motion()
+
+    def _run(self):
+        while True:
+            self.refresh()
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    @staticmethod
+    def _read_reduce_motion():
+        try:
+            result = subprocess.run(
+                ["defaults", "read", "-g", "AppleReduceMotion"],
+                capture_output=True, text=True, timeout=5
+            )
+            return result.stdout.strip() == "1"
+        except Exception:
+            return False
+
+
+ACCESSIBILITY = AccessibilitySettings()
@@ -0,0 +1,238 @@
+"""Break adherence statistics from the break history.
+
+Rollups keeps per-day and per-ISO-week counters for each break type, fed
+one event at a time. The counters are saved to `rollups.json` next to the
+history with the timestamp of the last event they include; loading them
+folds in only the events logged since (found by binary search in the log),
+and a report over any date range sums whole weeks from the weekly rollups
+and the partial weeks at either end from the daily ones. The cost depends
+on the number of days, not the number of events.
+
+Usage: python analytics.py [--days 30 | --since YYYY-MM-DD [--until YYYY-MM-DD]] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from history import HISTORY_DIR, read_events
+
+ROLLUPS_FILE = "rollups.json"
+
+# Counters kept per break type per day and week
+COUNTERS = ("due", "taken", "completed", "snoozes", "skipped", "coalesced", "elapsed")
+
+
+def _empty():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def _week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02}"
+
+
+class Rollups:
+    """Incremental daily and weekly adherence counters per break type.
+
+    Counting rules: a trigger is a break falling due (a snoozed break coming
+    back is not due again); a close is a break taken, and completed if it
+    lasted its full duration; breaks folded into a longer one that fired at
+    the same time count as coalesced.
+    """
+
+    def __init__(self):
+        self.daily = {}   # "YYYY-MM-DD" -> {break name: counters}
+        self.weekly = {}  # "YYYY-Www" -> {break name: counters}
+        self.through = None  # Timestamp of the last event included
+        self.through_count = 0  # Events stamped `through` included; None if unknown (all of them)
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        """Fold one history event into the rollups."""
+        event = entry.get('event')
+        if event == "coalesce":
+            names = entry.get('names', [])
+            changes = {'coalesced': 1}
+        else:
+            names = [entry.get('break')]
+            changes = self._changes(entry)
+        with self._lock:
+            ts = entry['ts']
+            if self.through is None or ts > self.through:
+                self.through, self.through_count = ts, 1
+            elif ts == self.through and self.through_count is not None:
+                self.through_count += 1
+            if not changes or names == [None]:
+                return
+            day = datetime.fromtimestamp(ts).date()
+            for table, key in ((self.daily, day.isoformat()), (self.weekly, _week_key(day))):
+                bucket = table.setdefault(key, {})
+                for name in names:
+                    counters = bucket.setdefault(name, _empty())
+                    for counter, amount in changes.items():
+                        counters[counter] += amount
+
+    @staticmethod
+    def _changes(entry):
+        if entry.get('test'):
+            return {}  # Test breaks say nothing about adherence
+        event = entry.get('event')
+        if event == "trigger":
+            return {} if entry.get('snoozes') else {'due': 1}
+        if event == "close":
+            elapsed = entry.get('elapsed', 0)
+            return {'taken': 1, 'elapsed': elapsed,
+                    'completed': int(elapsed >= entry.get('duration', 0))}
+        if event == "snooze":
+            return {'snoozes': 1}
+        if event == "skip":
+            return {'skipped': 1}
+        return {}
+
+    def catch_up(self, directory=HISTORY_DIR):
+        """Fold in every logged event after the cursor; returns how many were read.
+
+        Timestamps repeat, so the cursor is `through` plus `through_count`:
+        the log is read from `through` and that many of the events stamped
+        exactly `through` are skipped as already included.
+        """
+        count = 0
+        since, seen = self.through, self.through_count
+        for entry in read_events(directory, since=since):
+            if since is not None:
+                if entry['ts'] < since:
+                    continue
+                if entry['ts'] == since and seen != 0:
+                    if seen is not None:
+                        seen -= 1
+                    continue
+            self.add(entry)
+            count += 1
+        return count
+
+    def query(self, start, end):
+        """Summed counters per break type for dates `start` through `end` (inclusive)."""
+        totals = {}
+        with self._lock:
+            day = start
+            while day <= end:
+                # Whole ISO weeks inside the range come from the weekly rollup
+                if day.isoweekday() == 1 and day + timedelta(days=6) <= end:
+                    bucket = self.weekly.get(_week_key(day), {})
+                    step = 7
+                else:
+                    bucket = self.daily.get(day.isoformat(), {})
+                    step = 1
+                for name, counters in bucket.items():
+                    total = totals.setdefault(name, _empty())
+                    for counter, amount in counters.items():
+                        total[counter] += amount
+                day += timedelta(days=step)
+        return totals
+
+    def report(self, start, end):
+        """Per-break adherence rows for `start` through `end` (inclusive)."""
+        rows = []
+        for name, c in sorted(self.query(start, end).items()):
+            rows.append({
+                'break': name,
+                'due': c['due'],
+                'taken': c['taken'],
+                'completed': c['completed'],
+                'skipped': c['skipped'],
+                'coalesced': c['coalesced'],
+                'adherence': c['taken'] / c['due'] if c['due'] else None,
+                'avg_snoozes': c['snoozes'] / c['due'] if c['due'] else 0.0,
+                'avg_length': c['elapsed'] / c['taken'] if c['taken'] else 0.0,
+            })
+        return rows
+
+    # Persistence
+
+    def to_dict(self):
+        with self._lock:
+            return {'through': self.through, 'through_count': self.through_count,
+                    'daily': self.daily, 'weekly': self.weekly}
+
+    def save(self, path):
+        """Atomically write the rollups to `path`."""
+        text = json.dumps(self.to_dict(), separators=(",", ":"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Rollups saved at `path`, or empty rollups if missing or unreadable."""
+        rollups = cls()
+        try:
+            data = json.loads(path.read_text())
+            rollups.through = data['through']
+            rollups.through_count = data.get('through_count')  # Missing in older files
+            rollups.daily = data['daily']
+            rollups.weekly = data['weekly']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return rollups
+
+
+def load_rollups(directory=HISTORY_DIR):
+    """Saved rollups for `directory`, caught up with the events logged since they were saved."""
+    directory = Path(directory)
+    rollups = Rollups.load(directory / ROLLUPS_FILE)
+    if rollups.catch_up(directory):
+        try:
+            rollups.save(directory / ROLLUPS_FILE)
+        except OSError:
+            pass
+    return rollups
+
+
+def format_report(rows):
+    lines = [f"{'Break':<20} {'Taken/Due':>10} {'Adherence':>10} {'Snoozes/break':>14} {'Avg length':>11}"]
+    for row in rows:
+        adherence = f"{row['adherence']:.0%}" if row['adherence'] is not None else "-"
+        lines.append(f"{row['break']:<20} {row['taken']:>4}/{row['due']:<5} {adherence:>10} "
+                     f"{row['avg_snoozes']:>14.2f} {row['avg_length']:>10.0f}s")
+    if not rows:
+        lines.append("No breaks recorded in this period.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report break adherence from the break history.")
+    parser.add_argument("--dir", type=Path, default=HISTORY_DIR, help=f"history directory (default: {HISTORY_DIR})")
+    parser.add_argument("--days", type=int, default=7, help="report the last N days (default: 7)")
+    parser.add_argument("--since", type=date.fromisoformat, help="first date to include (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="last date to include (default: today)")
+    parser.add_argument("--json", action="store_true", help="print rows as JSON")
+    args = parser.parse_args(argv)
+
+    end = args.until or date.today()
+    start = args.since or end - timedelta(days=args.days - 1)
+    rows = load_rollups(args.dir).report(start, end)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"Break adherence {start} to {end}")
+        print(format_report(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Benchmark the heap-backed break index and lazy queue offset against linear scans.
+
+Usage: python benchmarks/bench_break_index.py [--configs 10000] [--fires 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scheduler import BreakIndex  # noqa: E402
+
+
+class FakeBreak:
+    """Stand-in for BreakConfig: just an interval and a deadline."""
+
+    __slots__ = ("interval", "deadline")
+
+    def __init__(self, interval, deadline):
+        self.interval = interval
+        self.deadline = deadline
+
+
+def make_breaks(n, seed=1):
+    rng = random.Random(seed)
+    breaks = []
+    for _ in range(n):
+        interval = rng.randint(60, 8 * 3600)
+        breaks.append(FakeBreak(interval, rng.uniform(0, interval)))
+    return breaks
+
+
+def run_linear(breaks, fires):
+    """Old approach: scan every config to find the next due break."""
+    for _ in range(fires):
+        nxt = min(breaks, key=lambda b: b.deadline)
+        nxt.deadline += nxt.interval
+
+
+def run_heap(breaks, fires):
+    index = BreakIndex()
+    index.rebuild((b, b.deadline) for b in breaks)
+    for _ in range(fires):
+        deadline, nxt = index.peek()
+        for b in index.pop_due(deadline):
+            b.deadline += b.interval
+            index.schedule(b, b.deadline)
+
+
+def run_queue_rewrite(queue_len, closes):
+    """Old approach: subtract elapsed time from every queued break on close."""
+    queue = [{'duration': 600} for _ in range(queue_len)]
+    for _ in range(closes):
+        for item in queue:
+            item['duration'] -= 5
+
+
+def run_queue_offset(queue_len, closes):
+    queue = deque({'duration': 600, 'elapsed_mark': 0} for _ in range(queue_len))
+    elapsed = 0
+    for _ in range(closes):
+        elapsed += 5
+    while queue:
+        item = queue.popleft()
+        item['duration'] -= elapsed - item.pop('elapsed_mark')
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", type=int, default=10_000)
+    parser.add_argument("--fires", type=int, default=20_000)
+    args = parser.parse_args()
+
+    linear_fires = min(args.fires, 2_000)  # Linear scan is too slow for the full run
+    t_linear = timed(run_linear, make_breaks(args.configs), linear_fires)
+    t_heap = timed(run_heap, make_breaks(args.configs), args.fires)
+    t_rewrite = timed(run_queue_rewrite, args.configs, 1_000)
+    t_offset = timed(run_queue_offset, args.configs, 1_000)
+
+    print(f"{args.configs} break configs")
+    print(f"  next-due, linear scan : {t_linear / linear_fires * 1e6:10.2f} us/fire")
+    print(f"  next-due, heap index  : {t_heap / args.fires * 1e6:10.2f} us/fire")
+    print(f"  queue adjust, rewrite : {t_rewrite * 1e3:10.2f} ms (1000 closes)")
+    print(f"  queue adjust, offset  : {t_offset * 1e3:10.2f} ms (1000 closes + drain)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Stress the single-instance lock with many simultaneous launches.
+
+Each round starts N processes that all try to take the same InstanceLock at
+the same instant; exactly one must win. The winner is then killed with
+SIGKILL (a crash) and a fresh launch must get the lock straight away,
+showing that no stale lock survives.
+
+Usage: python benchmarks/stress_single_instance.py [--processes 50] [--rounds 5]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CONTENDER = """
+import sys, time
+sys.path.insert(0, {root!r})
+from pathlib import Path
+from instance import InstanceLock
+lock = InstanceLock(Path({path!r}))
+time.sleep(max(0, {start_at!r} - time.time()))
+t = time.perf_counter()
+won = lock.acquire()
+print("won" if won else "lost", (time.perf_counter() - t) * 1e6, flush=True)
+if won:
+    time.sleep({hold!r})
+"""
+
+
+def contend(path, processes, hold):
+    """Launch `processes` contenders together; returns (outcomes, winner process)."""
+    start_at = time.time() + 0.5 + processes * 0.01  # Let every interpreter boot first
+    code = CONTENDER.format(root=str(ROOT), path=str(path), start_at=start_at, hold=hold)
+    procs = [subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+             for _ in range(processes)]
+    outcomes = []
+    winner = None
+    for proc in procs:
+        line = proc.stdout.readline().split()
+        outcomes.append((line[0], float(line[1])))
+        if line[0] == "won":
+            winner = proc
+    for proc in procs:
+        if proc is not winner:
+            proc.wait()
+    return outcomes, winner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / ".lock"
+        for round_no in range(1, args.rounds + 1):
+            outcomes, winner = contend(path, args.processes, hold=30)
+            winners = sum(1 for result, _ in outcomes if result == "won")
+            worst_us = max(us for _, us in outcomes)
+
+            # Crash the winner; the very next launch must get the lock
+            if winner is not None:
+                winner.kill()
+                winner.wait()
+            after_crash, survivor = contend(path, 1, hold=0)
+            if survivor is not None:
+                survivor.wait()
+            recovered = after_crash[0][0] == "won"
+
+            ok = winners == 1 and recovered
+            failures += not ok
+            print(f"round {round_no}: {winners} winner(s) of {args.processes}, "
+                  f"slowest check {worst_us:.0f} us, "
+                  f"lock {'recovered' if recovered else 'STALE'} after crash"
+                  f"{'' if ok else '  <-- FAIL'}")
+
+    print("OK" if not failures else f"{failures} round(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Local control socket for a running Don't Forget Your Breaks instance.
+
+The running app listens on a Unix-domain socket; a second `launch.py`
+invocation (or any script) connects, sends one command line and reads one
+JSON reply, which takes milliseconds instead of starting a second Tk app.
+This module only uses the standard library, so for the quickest round trip
+scripts can run it directly: `python control.py status`.
+
+Protocol: the client sends `<command> [argument]\\n`; the server answers
+`{"ok": true, "result": ...}\\n` or `{"ok": false, "error": "..."}\\n` and
+closes the connection. For example, from a shell:
+
+    echo status | nc -U ~/Library/Application\\ Support/DontForgetYourBreaks/control.sock
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+from pathlib import Path
+
+CONTROL_SOCKET = Path.home() / "Library" / "Application Support" / "DontForgetYourBreaks" / "control.sock"
+CONTROL_COMMANDS = ["start", "pause", "resume", "reset", "status", "test-break", "next-break", "show", "metrics",
+                    "profile", "import-profiles", "export-profiles"]
+PATH_COMMANDS = {"metrics", "import-profiles", "export-profiles"}  # Commands whose argument is a file path
+CONTROL_TIMEOUT = 1.0  # seconds
+MAX_REQUEST_BYTES = 4096
+
+
+class ControlError(Exception):
+    """A command could not be delivered or was rejected by the running instance."""
+
+
+def supported():
+    return hasattr(socket, "AF_UNIX")
+
+
+class ControlServer:
+    """Serves commands on a Unix-domain socket from a daemon thread.
+
+    `commands` maps command names to callables taking the optional argument
+    string and returning JSON-serializable data. Callables run on the server
+    thread; anything that touches Tk must hop to the main thread itself.
+    """
+
+    def __init__(self, path, commands):
+        self.path = path
+        self.commands = {'ping': lambda argument: "pong", **commands}
+        self.request_count = 0
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        """Bind the socket and start serving; returns False if unsupported or already served."""
+        if not supported() or self._sock is not None:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            if ping(self.path):
+                return False  # Another instance owns the socket
+            try:
+                self.path.unlink()  # Stale socket left by a crashed instance
+            except FileNotFoundError:
+                pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)  # Owner-only socket
+        try:
+            sock.bind(str(self.path))
+        except OSError:
+            sock.close()
+            return False
+        finally:
+            os.umask(old_umask)
+        sock.listen(8)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop serving and remove the socket file."""
+        sock, self._sock = self._sock, None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # Wakes accept(); close() alone may not on Linux
+        except OSError:
+            pass
+        try:
+            sock.close()
+        except OSError:
+            pass
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _serve(self):
+        sock = self._sock  # stop() may reset self._sock at any moment
+        while sock is not None and self._sock is sock:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                if self._sock is not sock:
+                    return  # Socket shut down by stop()
+                continue  # E.g. a client that gave up before being accepted
+            with conn:
+                conn.settimeout(CONTROL_TIMEOUT)
+                try:
+                    self._handle(conn)
+                except OSError:
+                    pass
+
+    def _handle(self, conn):
+        request = b""
+        while b"\n" not in request and len(request) < MAX_REQUEST_BYTES:
+            chunk = conn.recv(MAX_REQUEST_BYTES)
+            if not chunk:
+                break
+            request += chunk
+        line = request.split(b"\n", 1)[0].decode("utf-8", "replace").strip()
+        self.request_count += 1
+        conn.sendall(json.dumps(self._dispatch(line)).encode("utf-8") + b"\n")
+
+    def _dispatch(self, line):
+        name, _, argument = line.partition(" ")
+        command = self.commands.get(name)
+        if command is None:
+            known = ", ".join(sorted(self.commands))
+            return {'ok': False, 'error': f"unknown command {name!r} (expected one of: {known})"}
+        try:
+            return {'ok': True, 'result': command(argument.strip() or None)}
+        except Exception as e:
+            return {'ok': False, 'error': str(e) or type(e).__name__}
+
+
+def send_command(path, command, argument=None, timeout=CONTROL_TIMEOUT):
+    """Send one command to the running instance and return its result.
+
+    Raises ControlError if no instance is listening or the command failed.
+    """
+    if not supported():
+        raise ControlError("control socket not supported on this platform")
+    line = command if argument is None else f"{command} {argument}"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(line.encode("utf-8") + b"\n")
+            reply = b""
+            while not reply.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                reply += chunk
+    except OSError as e:
+        raise ControlError(f"no running instance at {path}: {e}") from e
+    try:
+        reply = json.loads(reply)
+    except ValueError as e:
+        raise ControlError(f"malformed reply from running instance: {e}") from e
+    if not reply.get('ok'):
+        raise ControlError(reply.get('error', "command failed"))
+    return reply.get('result')
+
+
+def ping(path, timeout=CONTROL_TIMEOUT):
+    """Whether an instance is answering on `path`."""
+    try:
+        send_command(path, "ping", timeout=timeout)
+        return True
+    except ControlError:
+        return False
+
+
+def run_command(path, command, argument=None):
+    """Forward a command and print its reply; returns a process exit code."""
+    if command in PATH_COMMANDS and argument is not None:
+        argument = os.path.abspath(argument)  # The running instance has its own working directory
+    try:
+        result = send_command(path, command, argument)
+    except ControlError as e:
+        print(f"{command}: {e}", file=sys.stderr)
+        return 1
+    if result is not None:
+        print(json.dumps(result, indent=2) if isinstance(result, (dict, list)) else result)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send a command to the running break reminder.")
+    parser.add_argument("command", choices=CONTROL_COMMANDS)
+    parser.add_argument("argument", nargs="?",
+                        help="command argument (break name for test-break, profile name for profile, "
+                             "file path for metrics and import/export-profiles)")
+    parser.add_argument("--socket", type=Path, default=CONTROL_SOCKET,
+                        help=f"control socket path (default: {CONTROL_SOCKET})")
+    args = parser.parse_args(argv)
+    return run_command(args.socket, args.command, args.argument)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
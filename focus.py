@@ -0,0 +1,183 @@
+"""Background focus management for break popups (macOS).
+
+The frontmost app is read in-process from NSWorkspace, which takes
+microseconds, so it is captured synchronously before a popup takes focus.
+Re-activating an app (and capturing, when AppKit is unreachable) goes
+through `osascript`, which can take hundreds of milliseconds; FocusManager
+runs those on one worker thread so popups never wait on them. Jobs run in
+submission order, so a restore always sees the app captured before it.
+"""
+
+import queue
+import subprocess
+import sys
+import threading
+
+OSASCRIPT_TIMEOUT = 2  # seconds
+
+# Process names this app can run as; never treated as "the app to go back to"
+OWN_PROCESS_NAMES = ("Python", "Dont Forget Your Breaks", "Don't Forget Your Breaks")
+
+
+class AppRef:
+    """The app that was frontmost when a popup opened; `name` fills in asynchronously."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name=None):
+        self.name = name
+
+
+class NSWorkspaceFrontmost:
+    """Reads the frontmost app's name through the Objective-C runtime (macOS)."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library('objc'))
+        ctypes.cdll.LoadLibrary(ctypes.util.find_library('AppKit'))  # Registers NSWorkspace
+        objc.objc_getClass.restype = ctypes.c_void_p
+        objc.objc_getClass.argtypes = [ctypes.c_char_p]
+        objc.sel_registerName.restype = ctypes.c_void_p
+        objc.sel_registerName.argtypes = [ctypes.c_char_p]
+
+        # Fixed-signature views of objc_msgSend; never mutate shared argtypes across threads
+        send = ctypes.cast(objc.objc_msgSend, ctypes.c_void_p).value
+        self._send = ctypes.CFUNCTYPE(ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p)(send)
+        self._send_cstr = ctypes.CFUNCTYPE(ctypes.c_char_p, ctypes.c_void_p, ctypes.c_void_p)(send)
+
+        sel = objc.sel_registerName
+        self._NSWorkspace = objc.objc_getClass(b'NSWorkspace')
+        self._NSAutoreleasePool = objc.objc_getClass(b'NSAutoreleasePool')
+        if not self._NSWorkspace or not self._NSAutoreleasePool:
+            raise OSError("AppKit classes unavailable")
+        self._sel_new = sel(b'new')
+        self._sel_drain = sel(b'drain')
+        self._sel_shared = sel(b'sharedWorkspace')
+        self._sel_frontmost = sel(b'frontmostApplication')
+        self._sel_name = sel(b'localizedName')
+        self._sel_utf8 = sel(b'UTF8String')
+
+    def __call__(self):
+        # Callers may be on any thread, so give the autoreleased results a pool of their own
+        pool = self._send(self._NSAutoreleasePool, self._sel_new)
+        try:
+            app = self._send(self._send(self._NSWorkspace, self._sel_shared), self._sel_frontmost)
+            name = self._send(app, self._sel_name) if app else None
+            value = self._send_cstr(name, self._sel_utf8) if name else None
+            return value.decode('utf-8', errors='replace') if value else None
+        finally:
+            self._send(pool, self._sel_drain)
+
+
+class FocusManager:
+    """Queries and restores the frontmost macOS app off the Tk main thread.
+
+    Our own process (`own_names`) is never recorded as the frontmost app, so
+    a query that lands after the popup took focus keeps the cached answer.
+    """
+
+    def __init__(self, own_names=OWN_PROCESS_NAMES):
+        self.own_names = set(own_names)
+        self.frontmost_app = None  # Last observed frontmost app other than ours
+        self.spawn_count = 0  # osascript processes started
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._in_process = None  # NSWorkspaceFrontmost, False if unavailable, None until first use
+
+    @property
+    def enabled(self):
+        return sys.platform == "darwin"
+
+    def prefetch(self):
+        """Refresh the cached frontmost app (e.g. when a break is queued)."""
+        if self.enabled:
+            if self._frontmost_query():
+                self._capture(None)
+            else:
+                self._submit(lambda: self._capture(None))
+
+    def remember_frontmost(self):
+        """Capture the frontmost app; returns an AppRef.
+
+        Call before the popup takes focus. With AppKit reachable the ref is
+        filled in immediately; otherwise the worker fills it in, and until
+        then it holds the cached previous result.
+        """
+        ref = AppRef(self.frontmost_app)
+        if self.enabled:
+            if self._frontmost_query():
+                self._capture(ref)
+            else:
+                self._submit(lambda: self._capture(ref))
+        return ref
+
+    def restore(self, ref):
+        """Re-activate the app captured in `ref` (after any pending capture)."""
+        if self.enabled:
+            self._submit(lambda: self._activate(ref.name))
+
+    def _submit(self, job):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._work, daemon=True)
+                self._thread.start()
+        self._jobs.put(job)
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                job()
+            except Exception:
+                pass
+
+    def _capture(self, ref):
+        name = self._query_frontmost()
+        if name and name not in self.own_names:
+            self.frontmost_app = name
+        if ref is not None:
+            ref.name = self.frontmost_app
+
+    def _frontmost_query(self):
+        """The in-process query, loaded on first use; None if AppKit is unreachable."""
+        if self._in_process is None:
+            try:
+                self._in_process = NSWorkspaceFrontmost()
+            except (OSError, AttributeError, TypeError):
+                self._in_process = False
+        return self._in_process or None
+
+    def _query_frontmost(self):
+        query = self._frontmost_query()
+        if query:
+            try:
+                return query()
+            except Exception:
+                return None
+        self.spawn_count += 1
+        try:
+            result = subprocess.run(
+                ['osascript', '-e',
+                 'tell application "System Events" to get name of first process whose frontmost is true'],
+                capture_output=True, text=True, timeout=OSASCRIPT_TIMEOUT
+            )
+            return result.stdout.strip() if result.returncode == 0 else None
+        except Exception:
+            return None
+
+    def _activate(self, app_name):
+        if not app_name or app_name in self.own_names:
+            return
+        self.spawn_count += 1
+        subprocess.run(
+            ['osascript', '-e', f'tell application "{app_name}" to activate'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=OSASCRIPT_TIMEOUT
+        )
+
+
+FOCUS = FocusManager()
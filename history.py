@@ -0,0 +1,267 @@
+"""Append-only break history for Don't Forget Your Breaks.
+
+Every scheduler event worth reporting on (breaks triggered, started,
+closed, snoozed, skipped or deferred for quiet hours; timers started, paused, resumed and reset) is
+appended to `events.log` as one JSON object per line:
+
+    {"ts": 1760700000.0, "event": "close", "break": "Normal Break", "duration": 300, "elapsed": 287}
+
+Recording never touches the disk on the caller's thread: events are
+buffered and a writer thread appends and fsyncs them in batches. When the
+live file grows past `max_bytes` it is renamed to `events-<UTC time>.log`,
+and `read_events()` streams the archives and the live file in order, a line
+at a time, skipping archives that end before the requested range.
+
+Usage: python history.py [--dir DIR] [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+HISTORY_DIR = Path.home() / "Library" / "Application Support" / "DontForgetYourBreaks" / "history"
+LIVE_FILE = "events.log"
+ARCHIVE_PREFIX = "events-"
+ARCHIVE_TIME_FORMAT = "%Y%m%dT%H%M%S"
+
+FLUSH_INTERVAL = 5.0         # seconds between fsync batches
+FLUSH_BATCH = 64             # events that trigger an early flush
+MAX_BYTES = 4 * 1024 * 1024  # live file size that triggers rotation
+
+# Scheduler events recorded, and their names in the log
+SCHEDULER_EVENTS = {
+    "break_queued": "trigger",
+    "break_started": "start",
+    "break_ended": "close",
+    "break_snoozed": "snooze",
+    "break_skipped": "skip",
+    "breaks_coalesced": "coalesce",
+    "breaks_deferred": "defer",
+    "started": "run",
+    "paused": "pause",
+    "resumed": "resume",
+    "reset": "reset",
+}
+
+
+class EventLog:
+    """Buffered, batch-fsynced, rotating append-only event log in `directory`."""
+
+    def __init__(self, directory, flush_interval=FLUSH_INTERVAL, flush_batch=FLUSH_BATCH,
+                 max_bytes=MAX_BYTES, clock=time.time):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.write_count = 0  # Batches written (one fsync each)
+        self.event_count = 0
+        self._pending = []
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # Keeps batches in order between the writer and flush()
+        self._thread = None
+        self._closed = False
+
+    @property
+    def path(self):
+        return self.directory / LIVE_FILE
+
+    def record(self, event, **fields):
+        """Buffer one event; it reaches the disk with the next batch."""
+        entry = {'ts': self.clock(), 'event': event}
+        entry.update(fields)
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.append(entry)
+            self.event_count += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            if len(self._pending) in (1, self.flush_batch):
+                self._cond.notify_all()  # Start the flush_interval countdown, or flush early
+
+    def record_scheduler_event(self, event, data):
+        """BreakScheduler subscriber: log the events listed in SCHEDULER_EVENTS."""
+        name = SCHEDULER_EVENTS.get(event)
+        if name is None:
+            return
+        if event == "breaks_coalesced":
+            self.record(name, **{'break': data['into'], 'names': data['names']})
+        elif event == "breaks_deferred":
+            self.record(name, names=data['names'], seconds=data['seconds'])
+        elif data is not None:
+            fields = {'break': data['name'], 'duration': data['duration']}
+            if data.get('snoozes'):
+                fields['snoozes'] = data['snoozes']  # On a trigger, marks a snoozed break coming back
+            if data.get('test'):
+                fields['test'] = True  # Started from the Test button or `test-break`
+            if event == "break_ended":
+                fields['elapsed'] = data['elapsed']
+            self.record(name, **fields)
+        else:
+            self.record(name)
+
+    def flush(self):
+        """Write and fsync everything buffered so far."""
+        with self._io_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if batch:
+                self._write(batch)
+
+    def close(self):
+        """Flush and stop the writer; later records are dropped."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # Sleep until something is recorded; only then start the flush countdown
+                while not self._closed and not self._pending:
+                    self._cond.wait()
+                if not self._closed and len(self._pending) < self.flush_batch:
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    return  # close() writes what is left
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Warning: Could not write break history: {e}")
+
+    def _write(self, batch):
+        """Append one batch with a single write and fsync (caller holds `_io_lock`)."""
+        data = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in batch).encode("utf-8")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.write_count += 1
+
+    def _rotate(self):
+        # Named by the log's own clock, so no event in the archive is later than its name
+        stamp = datetime.fromtimestamp(self.clock(), timezone.utc).strftime(ARCHIVE_TIME_FORMAT)
+        target = self.directory / f"{ARCHIVE_PREFIX}{stamp}.log"
+        n = 1
+        while target.exists():
+            target = self.directory / f"{ARCHIVE_PREFIX}{stamp}_{n:03}.log"  # Sorts after the first
+            n += 1
+        os.replace(self.path, target)
+
+
+def _archive_end(path):
+    """UTC timestamp at which an archive was rotated out (no event in it is later)."""
+    stamp = path.stem[len(ARCHIVE_PREFIX):].split("_", 1)[0]
+    try:
+        return datetime.strptime(stamp, ARCHIVE_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def log_files(directory=HISTORY_DIR):
+    """Archives oldest first, then the live file."""
+    directory = Path(directory)
+    files = sorted(directory.glob(f"{ARCHIVE_PREFIX}*.log"))
+    live = directory / LIVE_FILE
+    if live.exists():
+        files.append(live)
+    return files
+
+
+def read_events(directory=HISTORY_DIR, since=None, until=None):
+    """Yield logged events (dicts) in order, one line at a time.
+
+    `since` and `until` are epoch seconds (inclusive, exclusive). Archives
+    rotated out before `since` are not opened, the first file read is
+    binary-searched for `since`, and reading stops at the first event at or
+    after `until`. Lines that do not parse (a write cut short by a crash)
+    are skipped.
+    """
+    for path in log_files(directory):
+        if since is not None and path.name != LIVE_FILE:
+            end = _archive_end(path)
+            if end is not None and end < since:
+                continue
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            continue  # Rotated away while listing
+        with f:
+            if since is not None:
+                _seek_since(f, since)
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                ts = entry.get('ts', 0)
+                if since is not None and ts < since:
+                    continue
+                if until is not None and ts >= until:
+                    return
+                yield entry
+
+
+def _line_ts(line):
+    try:
+        return json.loads(line).get('ts')
+    except ValueError:
+        return None
+
+
+def _seek_since(f, since):
+    """Position `f` at the first line with a timestamp at or after `since`.
+
+    Lines are appended in time order, so this is a binary search over byte
+    offsets: O(log size) reads instead of parsing the file from the start.
+    """
+    lo, hi = 0, os.fstat(f.fileno()).st_size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        if mid:
+            f.readline()  # Skip to the next line start
+        line = f.readline()
+        ts = _line_ts(line) if line else None
+        if not line or (ts is not None and ts >= since):
+            hi = mid
+        else:
+            lo = mid + 1
+    f.seek(lo)
+    if lo:
+        f.readline()
+
+
+def _parse_date(text):
+    return datetime.strptime(text, "%Y-%m-%d").timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the break history as JSON lines.")
+    parser.add_argument("--dir", type=Path, default=HISTORY_DIR, help=f"history directory (default: {HISTORY_DIR})")
+    parser.add_argument("--since", type=_parse_date, help="first local date to include (YYYY-MM-DD)")
+    parser.add_argument("--until", type=_parse_date, help="local date to stop before (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    for entry in read_events(args.dir, args.since, args.until):
+        sys.stdout.write(json.dumps(entry) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""User idle detection for Don't Forget Your Breaks.
+
+IdleMonitor polls an idle backend and tells the scheduler when the user
+has been away long enough to stop counting (`begin_idle`) and when they
+return (`end_idle`), so time away counts as a break instead of work.
+
+Backends report seconds since the last keyboard or mouse input:
+
+- QuartzIdleBackend: CGEventSourceSecondsSinceLastEventType (macOS)
+- XScreenSaverIdleBackend: the X11 MIT-SCREEN-SAVER extension (libXss)
+- ProcInterruptsIdleBackend: keyboard/mouse interrupt counts in
+  /proc/interrupts (Linux without X, e.g. Wayland or a console)
+- FakeIdleBackend: set by hand, for tests and simulations
+
+Polling is adaptive: while the user is active the next check is scheduled
+for the earliest moment they could cross the idle threshold, and while
+they are away the interval backs off exponentially up to `max_poll`.
+"""
+
+import re
+import sys
+import threading
+import time
+
+IDLE_THRESHOLD = 180  # seconds without input before the user counts as away
+MIN_POLL = 2          # seconds
+MAX_POLL = 30         # seconds; also bounds how late a return is noticed
+
+
+class IdleBackend:
+    """Reports how long the user has been idle."""
+
+    name = "base"
+
+    def idle_seconds(self):
+        """Seconds since the last user input, or None if unknown."""
+        raise NotImplementedError
+
+
+class QuartzIdleBackend(IdleBackend):
+    name = "quartz"
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        quartz = ctypes.cdll.LoadLibrary(ctypes.util.find_library('ApplicationServices'))
+        self._seconds_since = quartz.CGEventSourceSecondsSinceLastEventType
+        self._seconds_since.restype = ctypes.c_double
+        self._seconds_since.argtypes = [ctypes.c_int32, ctypes.c_uint32]
+
+    def idle_seconds(self):
+        # kCGEventSourceStateCombinedSessionState, kCGAnyInputEventType
+        return self._seconds_since(0, 0xFFFFFFFF)
+
+
+class XScreenSaverIdleBackend(IdleBackend):
+    name = "xscreensaver"
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        class XScreenSaverInfo(ctypes.Structure):
+            _fields_ = [("window", ctypes.c_ulong), ("state", ctypes.c_int),
+                        ("kind", ctypes.c_int), ("til_or_since", ctypes.c_ulong),
+                        ("idle", ctypes.c_ulong), ("eventMask", ctypes.c_ulong)]
+
+        x11 = ctypes.cdll.LoadLibrary(ctypes.util.find_library('X11'))
+        xss = ctypes.cdll.LoadLibrary(ctypes.util.find_library('Xss'))
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+        xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)]
+
+        self._display = x11.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        self._root = x11.XDefaultRootWindow(self._display)
+        self._info = xss.XScreenSaverAllocInfo()
+        self._query = xss.XScreenSaverQueryInfo
+
+    def idle_seconds(self):
+        if not self._query(self._display, self._root, self._info):
+            return None
+        return self._info.contents.idle / 1000.0
+
+
+class ProcInterruptsIdleBackend(IdleBackend):
+    """Infers idle time from keyboard and mouse interrupt counters.
+
+    Idle time is measured from the last poll that saw the counters change,
+    so its resolution is the polling interval.
+    """
+
+    name = "proc"
+
+    INPUT_DEVICES = re.compile(r"i8042|keyboard|mouse|touchpad|hid", re.IGNORECASE)
+
+    def __init__(self, path="/proc/interrupts", clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self._lines = self._input_lines()
+        if not self._lines:
+            raise OSError("no keyboard or mouse interrupts found")
+        self._last_counts = self._counts()
+        self._last_change = clock()
+
+    def _input_lines(self):
+        with open(self.path) as f:
+            return {line.split(":", 1)[0].strip() for line in f if self.INPUT_DEVICES.search(line)}
+
+    def _counts(self):
+        counts = []
+        with open(self.path) as f:
+            for line in f:
+                irq, _, rest = line.partition(":")
+                if irq.strip() in self._lines:
+                    counts.append(sum(int(field) for field in rest.split() if field.isdigit()))
+        return counts
+
+    def idle_seconds(self):
+        counts = self._counts()
+        now = self.clock()
+        if counts != self._last_counts:
+            self._last_counts = counts
+            self._last_change = now
+        return now - self._last_change
+
+
+class FakeIdleBackend(IdleBackend):
+    """Idle time driven by hand: `touch()` on input, `clock` for the current time."""
+
+    name = "fake"
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.last_input = clock()
+
+    def touch(self, at=None):
+        self.last_input = self.clock() if at is None else at
+
+    def idle_seconds(self):
+        return max(0.0, self.clock() - self.last_input)
+
+
+def default_backend():
+    """The best idle backend for this platform, or None if idle time cannot be read."""
+    candidates = []
+    if sys.platform == "darwin":
+        candidates.append(QuartzIdleBackend)
+    elif sys.platform.startswith("linux"):
+        candidates += [XScreenSaverIdleBackend, ProcInterruptsIdleBackend]
+    for backend in candidates:
+        try:
+            return backend()
+        except Exception:
+            continue
+    return None
+
+
+class IdleMonitor:
+    """Feeds user idle periods to a BreakScheduler from a background thread.
+
+    `poll()` does one check and returns the delay until the next; the
+    thread started by `start()` just loops on it, and a non-threaded caller
+    (such as a simulation) can call it directly.
+    """
+
+    def __init__(self, scheduler, backend, threshold=IDLE_THRESHOLD, min_poll=MIN_POLL,
+                 max_poll=MAX_POLL, clock=time.monotonic):
+        self.scheduler = scheduler
+        self.backend = backend
+        self.threshold = threshold
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.clock = clock
+        self.poll_count = 0
+        self.away = False
+        self._backoff = min_poll
+        self._poll_lock = threading.Lock()  # Backends are not thread-safe
+        self._stop = None  # Event of the running thread; each thread gets its own
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread and end any idle period; never waits on a poll in progress.
+
+        A poll can be blocked handing an event to the Tk main thread, which
+        may be the caller, so this neither joins the thread nor calls the
+        scheduler with `_poll_lock` held.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread = None
+        with self._poll_lock:
+            was_away, self.away = self.away, False
+        if was_away:
+            self.scheduler.end_idle()
+
+    def poll(self, stop=None):
+        """Check idle time once; returns seconds until the next check.
+
+        The decision is made under `_poll_lock` (backends are not
+        thread-safe); the scheduler is told after releasing it, because its
+        listeners may block on the UI thread.
+        """
+        with self._poll_lock:
+            if stop is not None and stop.is_set():
+                return 0
+            delay, call = self._poll()
+        if call is not None:
+            method, at = call
+            method(at)
+            if method == self.scheduler.begin_idle and stop is not None and stop.is_set():
+                self.scheduler.end_idle()  # stop() ran in between and already reset `away`
+        return delay
+
+    def _poll(self):
+        """One check: (delay until the next, scheduler call to make as (method, clock time) or None)."""
+        self.poll_count += 1
+        try:
+            idle = self.backend.idle_seconds()
+        except Exception:
+            idle = None
+        if idle is None:
+            return self.max_poll, None
+        now = self.clock()
+
+        if self.away:
+            if idle < self.threshold:
+                # Input since the last poll: the user came back `idle` seconds ago
+                self.away = False
+                self._backoff = self.min_poll
+                return self._active_delay(idle), (self.scheduler.end_idle, now - idle)
+            self._backoff = min(self.max_poll, self._backoff * 2)
+            return self._backoff, None
+
+        if idle >= self.threshold and self.scheduler.running:
+            self.away = True
+            self._backoff = self.min_poll
+            return self._backoff, (self.scheduler.begin_idle, now - idle)
+        return self._active_delay(idle), None
+
+    def _active_delay(self, idle):
+        """Idle time cannot reach the threshold sooner than this."""
+        return min(self.max_poll, max(self.min_poll, self.threshold - idle))
+
+    def _run(self, stop):
+        while not stop.is_set():
+            delay = self.poll(stop)
+            if stop.wait(delay):
+                return
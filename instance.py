@@ -0,0 +1,91 @@
+"""Single-instance lock for Don't Forget Your Breaks.
+
+The lock is an advisory `flock` on LOCK_FILE (`msvcrt.locking` on Windows),
+held on an open file descriptor for the life of the process. The kernel
+releases it when the process exits or crashes, so there are no stale locks
+and no PID-reuse false positives, and checking for a live holder is a
+single non-blocking system call.
+"""
+
+import os
+import sys
+
+
+class InstanceLock:
+    """Exclusive, process-lifetime lock on `path`.
+
+    The file is never deleted: unlinking it would let a later launch lock a
+    fresh inode while another process still holds the old one. The holder's
+    PID is written into it for information only.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    @property
+    def held(self):
+        return self._fd is not None
+
+    def acquire(self):
+        """Try to take the lock without blocking; returns False only if another process holds it.
+
+        If the lock file cannot be opened (read-only or unwritable
+        directory) this returns True without holding the lock: the app runs
+        without the single-instance guarantee rather than not at all.
+        """
+        if self._fd is not None:
+            return True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as e:
+            print(f"Warning: Could not open lock file, not checking for other instances: {e}")
+            return True
+        try:
+            _lock(fd)
+        except OSError:
+            os.close(fd)
+            return False
+        try:
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+        except OSError:
+            pass  # The PID is informational only
+        self._fd = fd
+        return True
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            try:
+                _unlock(fd)
+            finally:
+                os.close(fd)
+
+    def holder_pid(self):
+        """PID recorded by the current holder, or None (informational; may be stale)."""
+        try:
+            return int(self.path.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(fd):
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
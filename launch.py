@@ -1,18 +1,30 @@
+import time
+_IMPORT_START = time.perf_counter()  # For --profile-startup
+
 import customtkinter as ctk
-import tkinter as tk
-from tkinter import messagebox
 import threading
-import time
+import functools
+import math
 import sys
-import subprocess
-import json
-import os
+import argparse
+import datetime
 import atexit
-import webbrowser
-import platform
-from urllib.parse import quote as url_quote
+from collections import deque
 from pathlib import Path
 
+from accessibility import ACCESSIBILITY
+from control import (CONTROL_COMMANDS, CONTROL_SOCKET, CONTROL_TIMEOUT, ControlError, ControlServer,
+                     run_command, send_command)
+from focus import FOCUS
+from history import HISTORY_DIR, EventLog
+from instance import InstanceLock
+from metrics import METRICS, MainThreadWatchdog
+from policy import POLICY_DIR, ConfigWatcher, merge_layers, read_policy, user_layer
+from prefs import CONFIG_FILE, PreferenceStore
+from profiles import DEFAULT_PROFILE, sanitize_prefs, saved_profiles
+from scheduler import SLEEP_POLICIES, BreakScheduler, breaks_from_prefs, sleep_clock
+from sound import PLAYER, SOUNDS, looping_sound, play_sound
+
 # ------------------ CUSTOMTKINTER SETUP ------------------
 
 ctk.set_appearance_mode("system")  # Follow system dark/light mode
@@ -20,48 +32,10 @@ ctk.set_default_color_theme("blue")  # macOS-style blue accent
 
 APP_NAME = "Don't Forget Your Breaks"
 
-# Set macOS menu bar app name (instead of "Python")
-if sys.platform == "darwin":
-    try:
-        import ctypes
-        import ctypes.util
-        objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library('objc'))
-
-        # Setup objc runtime function signatures
-        objc.objc_getClass.restype = ctypes.c_void_p
-        objc.sel_registerName.restype = ctypes.c_void_p
-        objc.objc_msgSend.restype = ctypes.c_void_p
-        objc.objc_msgSend.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
-
-        NSBundle = objc.objc_getClass(b'NSBundle')
-        sel_mainBundle = objc.sel_registerName(b'mainBundle')
-        bundle = objc.objc_msgSend(NSBundle, sel_mainBundle)
-
-        sel_info = objc.sel_registerName(b'localizedInfoDictionary')
-        info = objc.objc_msgSend(bundle, sel_info)
-        if not info:
-            sel_info = objc.sel_registerName(b'infoDictionary')
-            info = objc.objc_msgSend(bundle, sel_info)
-
-        # Set CFBundleName
-        CFStr = ctypes.cdll.LoadLibrary(ctypes.util.find_library('CoreFoundation'))
-        CFStr.CFStringCreateWithCString.restype = ctypes.c_void_p
-        CFStr.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
-
-        key = CFStr.CFStringCreateWithCString(None, b'CFBundleName', 0)
-        val = CFStr.CFStringCreateWithCString(None, APP_NAME.encode('utf-8'), 0)
-
-        objc.objc_msgSend.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
-        sel_setObject = objc.sel_registerName(b'setObject:forKey:')
-        objc.objc_msgSend(info, sel_setObject, val, key)
-    except Exception:
-        pass
-
 # ------------------ CONFIGURATION ------------------
 
 TIME_UNITS = ["sec", "min", "hour"]
-SOUND_LOOP_INTERVAL = 1.2
-CONFIG_FILE = Path.home() / "Library" / "Preferences" / "com.yairs.dontforgetyourbreaks.json"
+PREFS_SAVE_DELAY = 1.0  # seconds; preference edits within this window are written once
 LOCK_FILE = Path.home() / "Library" / "Application Support" / "DontForgetYourBreaks" / ".lock"
 VERSION_FILE = Path(__file__).parent / "VERSION"
 GITHUB_NEW_ISSUE_URL = "https://github.com/YairShachar/dont-forget-your-breaks/issues/new"
@@ -78,6 +52,9 @@ FONT_SIZES = {
     'timer': 13,
     'helper': 10,
     'control': 14,
+    'small': 12,
+    'icon': 15,
+    'countdown': 48,
 }
 
 # Colors (dark mode)
@@ -117,44 +94,19 @@ ANIMATION_FRAME_INTERVAL = 16      # ms (60fps)
 ANIMATION_EXPAND_DURATION = 250    # ms
 ANIMATION_COLLAPSE_DURATION = 200  # ms
 
-# Sound options including "None"
-SOUNDS = {
-    "None": None,
-    "Glass": "Glass.aiff",
-    "Ping": "Ping.aiff",
-    "Pop": "Pop.aiff",
-    "Submarine": "Submarine.aiff"
-}
-
-
-# ------------------ SOUND FUNCTIONS ------------------
-
-def play_sound_mac(sound_name):
-    sound_file = SOUNDS.get(sound_name)
-    if sound_file:
-        subprocess.Popen(
-            ["afplay", f"/System/Library/Sounds/{sound_file}"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-
-
-def play_sound(sound_name="Glass"):
-    if sound_name == "None" or sound_name is None:
-        return
-    if sys.platform == "darwin":
-        play_sound_mac(sound_name)
-    elif sys.platform == "win32":
-        import winsound
-        winsound.MessageBeep()
-    else:
-        print("\a")
+# Break popup
+POPUP_WIDTH = 380
+POPUP_HEIGHT = 300
+POPUP_PROGRESS_PADX = 30
+POPUP_MIN_FRAME_MS = ANIMATION_FRAME_INTERVAL  # Fastest progress redraw rate
 
+# Statistics window: period -> days shown
+STATS_PERIODS = {"Week": 7, "Month": 30, "Year": 365}
 
-def looping_sound(stop_event, sound_name):
-    while not stop_event.is_set():
-        play_sound(sound_name)
-        time.sleep(SOUND_LOOP_INTERVAL)
+# Settings window
+SETTINGS_EXPANDED_MAX = 3    # With more breaks than this, panels open collapsed
+SETTINGS_SCROLL_MIN = 6      # With at least this many breaks, the panel list scrolls
+SETTINGS_PANEL_BATCH = 8     # Panels built per idle callback after the first screenful
 
 
 # ------------------ ANIMATION HELPERS ------------------
@@ -170,126 +122,209 @@ def ease_in_quad(t):
 
 
 def prefers_reduced_motion():
-    """Check if user has enabled reduced motion (macOS)."""
-    if sys.platform != "darwin":
-        return False
-    try:
-        result = subprocess.run(
-            ["defaults", "read", "-g", "AppleReduceMotion"],
-            capture_output=True, text=True
-        )
-        return result.stdout.strip() == "1"
-    except Exception:
-        return False
+    """Check if user has enabled reduced motion (macOS), from the background-refreshed cache."""
+    return ACCESSIBILITY.reduce_motion
 
 
-# ------------------ BREAK CONFIG ------------------
+# ------------------ STYLE REGISTRY ------------------
 
-class BreakConfig:
-    """Configuration for a single break type."""
+class StyleRegistry:
+    """Shared fonts keyed by FONT_SIZES role and weight.
 
-    def __init__(self, name, interval_val, interval_unit,
-                 duration_val, duration_unit, start_sound, end_sound,
-                 loop_end_sound=False, auto_dismiss=True):
-        self.name = ctk.StringVar(value=name)
-        self.interval_value = ctk.StringVar(value=str(interval_val))
-        self.interval_unit = ctk.StringVar(value=interval_unit)
-        self.duration_value = ctk.StringVar(value=str(duration_val))
-        self.duration_unit = ctk.StringVar(value=duration_unit)
-        self.start_sound = ctk.StringVar(value=start_sound)
-        self.end_sound = ctk.StringVar(value=end_sound)
-        self.loop_end_sound = ctk.BooleanVar(value=loop_end_sound)
-        self.auto_dismiss = ctk.BooleanVar(value=auto_dismiss)
-        self.remaining = self.get_interval_seconds()
-        self.timer_label = None  # Will be set by UI
+    Widgets reference `STYLE.font(role, weight)` instead of creating their own
+    CTkFont, so the app allocates at most one font per (role, weight) however
+    many breaks or panels exist. Because the font objects are shared,
+    rescaling or changing the family reconfigures each one once and every
+    widget using it follows.
+    """
 
-    @staticmethod
-    def _safe_int(var, fallback=1):
-        """Safely parse a StringVar to int, returning fallback for empty/invalid values."""
+    def __init__(self, family, sizes):
+        self.family = family
+        self.sizes = sizes
+        self.scale = 1.0
+        self._fonts = {}  # (role, weight) -> CTkFont, created on first use
+
+    @property
+    def font_count(self):
+        return len(self._fonts)
+
+    def font(self, role, weight="normal"):
+        """The shared font for a FONT_SIZES role (requires the Tk root to exist)."""
+        key = (role, weight)
+        font = self._fonts.get(key)
+        if font is None:
+            font = ctk.CTkFont(family=self.family, size=self._size(role), weight=weight)
+            self._fonts[key] = font
+        return font
+
+    def _size(self, role):
+        return round(self.sizes[role] * self.scale)
+
+    def set_font(self, family=None, scale=None):
+        """Change the family and/or size scale of every shared font in one pass."""
+        if family is not None:
+            self.family = family
+        if scale is not None:
+            self.scale = scale
+        for (role, _), font in self._fonts.items():
+            font.configure(family=self.family, size=self._size(role))
+
+    def set_appearance(self, mode, family=None, scale=None):
+        """Switch light/dark/system mode and update the shared fonts alongside.
+
+        CustomTkinter recolors its widgets from their (light, dark) colors in
+        a single pass over its own registry; fonts are updated once per role.
+        """
+        ctk.set_appearance_mode(mode)
+        if family is not None or scale is not None:
+            self.set_font(family=family, scale=scale)
+
+
+STYLE = StyleRegistry(FONT_FAMILY, FONT_SIZES)
+
+
+# ------------------ BREAK VARIABLES ------------------
+
+class BreakVars:
+    """Tk variables for editing a BreakSpec in a settings panel.
+
+    Only settings panels create these; edits are reported through
+    `on_change(field, value)`.
+    """
+
+    def __init__(self, spec, on_change):
+        self.name = ctk.StringVar(value=spec.name)
+        self.interval_value = ctk.StringVar(value=str(spec.interval_val))
+        self.interval_unit = ctk.StringVar(value=spec.interval_unit)
+        self.duration_value = ctk.StringVar(value=str(spec.duration_val))
+        self.duration_unit = ctk.StringVar(value=spec.duration_unit)
+        self.start_sound = ctk.StringVar(value=spec.start_sound)
+        self.end_sound = ctk.StringVar(value=spec.end_sound)
+        self.loop_end_sound = ctk.BooleanVar(value=spec.loop_end_sound)
+        self.auto_dismiss = ctk.BooleanVar(value=spec.auto_dismiss)
+        self._loading = False
+
+        for field, var in [("interval_val", self.interval_value),
+                           ("interval_unit", self.interval_unit),
+                           ("duration_val", self.duration_value),
+                           ("duration_unit", self.duration_unit),
+                           ("start_sound", self.start_sound),
+                           ("end_sound", self.end_sound),
+                           ("loop_end_sound", self.loop_end_sound),
+                           ("auto_dismiss", self.auto_dismiss)]:
+            var.trace_add('write', lambda *a, f=field, v=var: self._loading or on_change(f, v.get()))
+
+    def load(self, spec):
+        """Show another spec's values without reporting them as edits."""
+        self._loading = True
         try:
-            return int(var.get())
-        except (ValueError, TypeError):
-            return fallback
-
-    def get_interval_seconds(self):
-        """Convert interval to seconds."""
-        val = self._safe_int(self.interval_value)
-        unit = self.interval_unit.get()
-        if unit == "sec":
-            return val
-        elif unit == "min":
-            return val * 60
-        else:  # hour
-            return val * 3600
-
-    def get_duration_seconds(self):
-        """Convert duration to seconds."""
-        val = self._safe_int(self.duration_value)
-        unit = self.duration_unit.get()
-        if unit == "sec":
-            return val
-        elif unit == "min":
-            return val * 60
-        else:  # hour
-            return val * 3600
-
-    def reset_timer(self):
-        """Reset remaining time to interval."""
-        self.remaining = self.get_interval_seconds()
+            self.name.set(spec.name)
+            self.interval_value.set(str(spec.interval_val))
+            self.interval_unit.set(spec.interval_unit)
+            self.duration_value.set(str(spec.duration_val))
+            self.duration_unit.set(spec.duration_unit)
+            self.start_sound.set(spec.start_sound)
+            self.end_sound.set(spec.end_sound)
+            self.loop_end_sound.set(spec.loop_end_sound)
+            self.auto_dismiss.set(spec.auto_dismiss)
+        finally:
+            self._loading = False
+
+
+# ------------------ POPUP INSTRUMENTATION ------------------
+
+POPUP_STALL_LOG = deque(maxlen=50)  # PopupStalls for recent popups, oldest first
+POPUP_PROFILE_STREAM = None  # Set by --profile-popups to print each popup's show latency
+
+
+class PopupStalls:
+    """Main-thread time spent in one popup's lifecycle, per phase."""
+
+    def __init__(self, title):
+        self.title = title
+        self.phases = {}  # phase -> [calls, total seconds, worst seconds]
+        self.show_latency = None  # Seconds from trigger to first paint
+
+    def record(self, phase, seconds):
+        entry = self.phases.setdefault(phase, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def worst(self):
+        """Longest single main-thread stall in seconds."""
+        return max((entry[2] for entry in self.phases.values()), default=0.0)
+
+    def summary(self):
+        summary = {phase: {'calls': calls, 'total_ms': total * 1e3, 'worst_ms': worst * 1e3}
+                   for phase, (calls, total, worst) in self.phases.items()}
+        if self.show_latency is not None:
+            summary['show_latency_ms'] = self.show_latency * 1e3
+        return summary
+
+
+def main_thread_timed(phase):
+    """Record how long a CountdownPopup method blocks the Tk main thread.
+
+    Durations go to the popup's PopupStalls and, when metrics are enabled,
+    to the "popup.<phase>" histogram.
+    """
+    metric = f"popup.{phase}"
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                stalls = getattr(self, 'stalls', None)
+                if stalls is not None:
+                    stalls.record(phase, seconds)
+                METRICS.observe(metric, seconds * 1e3)
+        return wrapper
+    return decorator
 
 
 # ------------------ COUNTDOWN POPUP ------------------
 
 class CountdownPopup:
-    """A modern popup with countdown timer, progress bar, glassmorphism effect."""
+    """A modern popup with countdown timer, progress bar, glassmorphism effect.
+
+    The window and its widgets are built once, hidden, and reused: `show()`
+    reconfigures them for a break and `close()`/`snooze()` hide them again.
+    """
 
     SNOOZE_MINUTES = 5
 
-    def __init__(self, parent, title, message, duration,
-                 auto_dismiss=True, on_close=None, on_snooze=None,
-                 end_sound=None, loop_end_sound=False):
+    def __init__(self, parent):
         self.parent = parent
-        self.duration = duration
-        self.remaining = duration
-        self.auto_dismiss = auto_dismiss
-        self.on_close = on_close
-        self.on_snooze = on_snooze
-        self.end_sound = end_sound
-        self.loop_end_sound = loop_end_sound
-        self.closed = False
+        self.closed = True  # Hidden until show()
         self.snoozed = False
+        self.duration = 0
+        self.remaining = 0
+        self.auto_dismiss = True
+        self.on_close = None
+        self.on_snooze = None
+        self.end_sound = None
+        self.loop_end_sound = False
         self.sound_stop_event = threading.Event()
-        self._start_time = time.time()  # For smooth progress bar
-        self._previous_app = self._get_frontmost_app()  # Remember active app
+        self.stalls = None
+        self.render_count = 0
+        self._jobs = {}  # Pending after() ids by loop name, cancelled on hide
+        self._shown_at = None  # perf_counter() of the trigger awaiting first paint
+        self._previous_app = None
 
-        # Create popup window
+        # Create popup window, hidden until a break needs it
         self.window = ctk.CTkToplevel(parent)
-        self.window.title(title)
+        self.window.withdraw()
         self.window.resizable(False, False)
 
-        # Make window always on top
-        self.window.attributes('-topmost', True)
-
-        # Larger popup size with modern styling
-        popup_w, popup_h = 380, 300
-
-        # Position popup at mouse cursor location (works across all monitors)
-        self.window.update_idletasks()
-        mouse_x = self.window.winfo_pointerx()
-        mouse_y = self.window.winfo_pointery()
-        x = mouse_x - popup_w // 2 + 20
-        y = mouse_y - popup_h // 2 + 20
-        self.window.geometry(f"{popup_w}x{popup_h}+{x}+{y}")
-
         # Glassmorphism effect (semi-transparent on macOS)
         if sys.platform == "darwin":
             self.window.attributes('-alpha', 0.95)
 
-        # Force focus and request attention
-        self.window.lift()
-        self.window.focus_force()
-        self._request_attention()
-
         # Main container with padding
         container = ctk.CTkFrame(
             self.window,
@@ -299,27 +334,27 @@ class CountdownPopup:
         container.pack(fill="both", expand=True, padx=0, pady=0)
 
         # Title
-        title_label = ctk.CTkLabel(
+        self.title_label = ctk.CTkLabel(
             container,
-            text=title,
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['title'], weight="bold")
+            text="",
+            font=STYLE.font('title', weight="bold")
         )
-        title_label.pack(pady=(PADDING_PANEL_Y, 5))
+        self.title_label.pack(pady=(PADDING_PANEL_Y, 5))
 
         # Message
-        msg_label = ctk.CTkLabel(
+        self.msg_label = ctk.CTkLabel(
             container,
-            text=message,
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input']),
+            text="",
+            font=STYLE.font('input'),
             text_color=COLORS['text_secondary']
         )
-        msg_label.pack(pady=(0, ROW_SPACING))
+        self.msg_label.pack(pady=(0, ROW_SPACING))
 
         # Countdown label - large and prominent
         self.countdown_label = ctk.CTkLabel(
             container,
-            text=self._format_time(self.remaining),
-            font=ctk.CTkFont(family=FONT_FAMILY, size=48, weight="bold")
+            text="",
+            font=STYLE.font('countdown', weight="bold")
         )
         self.countdown_label.pack(pady=10)
 
@@ -330,29 +365,26 @@ class CountdownPopup:
             corner_radius=4,
             progress_color=COLORS['accent_blue']
         )
-        self.progress.pack(fill="x", padx=30, pady=ROW_SPACING)
-        self.progress.set(1.0)  # Start full
+        self.progress.pack(fill="x", padx=POPUP_PROGRESS_PADX, pady=ROW_SPACING)
 
         # Button frame
         btn_frame = ctk.CTkFrame(container, fg_color="transparent")
         btn_frame.pack(pady=ROW_SPACING)
 
-        # Snooze button (only if not auto-dismiss) - secondary style
-        if not auto_dismiss:
-            self.snooze_btn = ctk.CTkButton(
-                btn_frame,
-                text=f"Snooze {self.SNOOZE_MINUTES}m",
-                command=self.snooze,
-                width=130,
-                height=40,
-                corner_radius=CORNER_RADIUS_BUTTON,
-                fg_color="transparent",
-                border_width=1,
-                border_color=COLORS['border'],
-                hover_color=COLORS['bg_hover'],
-                font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input'])
-            )
-            self.snooze_btn.pack(side="left", padx=8)
+        # Snooze button - secondary style, packed only for breaks without auto-dismiss
+        self.snooze_btn = ctk.CTkButton(
+            btn_frame,
+            text=f"Snooze {self.SNOOZE_MINUTES}m",
+            command=self.snooze,
+            width=130,
+            height=40,
+            corner_radius=CORNER_RADIUS_BUTTON,
+            fg_color="transparent",
+            border_width=1,
+            border_color=COLORS['border'],
+            hover_color=COLORS['bg_hover'],
+            font=STYLE.font('input')
+        )
 
         # Done button - primary style
         self.ok_btn = ctk.CTkButton(
@@ -364,18 +396,125 @@ class CountdownPopup:
             corner_radius=CORNER_RADIUS_BUTTON,
             fg_color=COLORS['accent_blue'],
             hover_color=COLORS['accent_hover'],
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input'], weight="bold")
+            font=STYLE.font('input', weight="bold")
         )
         self.ok_btn.pack(side="left", padx=8)
 
         # Handle window close
         self.window.protocol("WM_DELETE_WINDOW", self.close)
 
+        # First paint after each show() closes its latency measurement
+        self.window.bind("<Map>", self._on_map, add="+")
+
+    def exists(self):
+        """Whether the pooled window is still alive and can be shown again."""
+        try:
+            return bool(self.window.winfo_exists())
+        except Exception:
+            return False
+
+    @main_thread_timed("open")
+    def show(self, title, message, duration,
+             auto_dismiss=True, on_close=None, on_snooze=None,
+             end_sound=None, loop_end_sound=False, triggered_at=None):
+        """Reconfigure the popup for a break and show it.
+
+        `triggered_at` is the `time.perf_counter()` at which the break was
+        picked up; the time from then to the first paint is recorded as the
+        popup's show latency.
+        """
+        self.stalls = PopupStalls(title)
+        POPUP_STALL_LOG.append(self.stalls)
+        self._shown_at = triggered_at if triggered_at is not None else time.perf_counter()
+        self._previous_app = FOCUS.remember_frontmost()  # Before focus_force() below
+
+        self.duration = duration
+        self.remaining = duration
+        self.auto_dismiss = auto_dismiss
+        self.on_close = on_close
+        self.on_snooze = on_snooze
+        self.end_sound = end_sound
+        self.loop_end_sound = loop_end_sound
+        self.closed = False
+        self.snoozed = False
+        self.sound_stop_event = threading.Event()
+        self._start_time = time.monotonic()  # Label and progress bar both derive from this
+        self._rendered_text = None
+        self._rendered_pixel = None
+        self.render_count = 0
+
+        self.window.title(title)
+        self.title_label.configure(text=title)
+        self.msg_label.configure(text=message)
+        self.ok_btn.configure(fg_color=COLORS['accent_blue'])
+        self.progress.set(1.0)  # Start full
+        if auto_dismiss:
+            self.snooze_btn.pack_forget()
+        else:
+            self.snooze_btn.pack(side="left", padx=8, before=self.ok_btn)
+
+        # Position popup at mouse cursor location (works across all monitors)
+        self._place_at_pointer()
+
+        # Make window always on top, then force focus and request attention
+        self.window.attributes('-topmost', True)
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+        self._request_attention()
+
         # Start countdown and keep-on-top mechanism
-        self.update_countdown()
-        self._update_progress_smooth()
+        self._render()
         self._keep_on_top()
 
+    def _on_map(self, event):
+        if event.widget is self.window and self._shown_at is not None:
+            self.window.after_idle(self._on_painted)
+
+    def _on_painted(self):
+        if self._shown_at is None or self.stalls is None:
+            return
+        self.stalls.show_latency = time.perf_counter() - self._shown_at
+        self._shown_at = None
+        METRICS.observe("popup.show_latency", self.stalls.show_latency * 1e3)
+        if POPUP_PROFILE_STREAM is not None:
+            print(f"Popup '{self.stalls.title}' shown in {self.stalls.show_latency * 1e3:.1f} ms "
+                  f"(worst stall {self.stalls.worst() * 1e3:.1f} ms)", file=POPUP_PROFILE_STREAM)
+
+    def _after(self, name, ms, callback):
+        """Schedule a loop step, replacing any pending step of the same loop."""
+        self._cancel(name)
+        self._jobs[name] = self.window.after(ms, callback)
+
+    def _cancel(self, name):
+        job = self._jobs.pop(name, None)
+        if job is not None:
+            try:
+                self.window.after_cancel(job)
+            except Exception:
+                pass
+
+    def _hide(self):
+        """Stop this break's loops and sounds and hide the window for the next break."""
+        self.sound_stop_event.set()
+        for name in list(self._jobs):
+            self._cancel(name)
+        self._shown_at = None
+        self._prevent_focus_steal()  # Call before hiding to prevent focus transfer
+        try:
+            self.window.withdraw()
+        except Exception:
+            pass
+        self._prevent_focus_steal(restore=True)  # Call again after to ensure app is deactivated
+
+    def _place_at_pointer(self):
+        mouse_x = self.window.winfo_pointerx()
+        mouse_y = self.window.winfo_pointery()
+        popup_w, popup_h = POPUP_WIDTH, POPUP_HEIGHT
+        x = mouse_x - popup_w // 2 + 20
+        y = mouse_y - popup_h // 2 + 20
+        self.window.geometry(f"{popup_w}x{popup_h}+{x}+{y}")
+
     def _format_time(self, seconds):
         """Format seconds as MM:SS or just Xs for short durations."""
         if seconds < 60:
@@ -383,109 +522,100 @@ class CountdownPopup:
         m, s = divmod(seconds, 60)
         return f"{m:02}:{s:02}"
 
-    def update_countdown(self):
-        if self.closed:
-            return
+    def _progress_width(self):
+        """Pixel width of the progress bar (its layout width before it is drawn)."""
+        width = self.progress.winfo_width()
+        return width if width > 1 else POPUP_WIDTH - 2 * POPUP_PROGRESS_PADX
 
-        self.remaining -= 1
-        self.countdown_label.configure(text=self._format_time(self.remaining))
-
-        if self.remaining <= 0:
-            # Timer finished - handle end sound
-            if self.end_sound and self.end_sound != "None":
-                if self.loop_end_sound:
-                    threading.Thread(
-                        target=looping_sound,
-                        args=(self.sound_stop_event, self.end_sound),
-                        daemon=True
-                    ).start()
-                else:
-                    play_sound(self.end_sound)
-
-            if self.auto_dismiss:
-                self.close()
-            else:
-                self.countdown_label.configure(text="Done!")
-                self._bring_to_attention()
-        else:
-            self.window.after(1000, self.update_countdown)
+    @main_thread_timed("render")
+    def _render(self):
+        """Single clock-driven render loop for the countdown label and progress bar.
 
-    def _update_progress_smooth(self):
-        """Smooth progress bar update (runs every 50ms for fluid animation)."""
+        Both derive from `_start_time`, and the next frame is scheduled for
+        whichever comes first: the label's next whole second or the bar
+        moving by one pixel (capped at ~60fps for short breaks).
+        """
         if self.closed:
             return
+        self.render_count += 1
+
+        elapsed = time.monotonic() - self._start_time
+        self.remaining = max(0, math.ceil(self.duration - elapsed))
+        text = self._format_time(self.remaining)
+        if text != self._rendered_text:
+            self._rendered_text = text
+            self.countdown_label.configure(text=text)
+
+        if elapsed >= self.duration:
+            self.progress.set(0)
+            self._finish()
+            return
 
-        try:
-            elapsed = time.time() - self._start_time
-            progress_value = max(0, 1 - (elapsed / self.duration)) if self.duration > 0 else 0
-            self.progress.set(progress_value)
-        except Exception:
-            pass
+        width = self._progress_width()
+        filled = (1 - elapsed / self.duration) * width
+        pixel = math.ceil(filled)
+        if pixel != self._rendered_pixel:
+            self._rendered_pixel = pixel
+            self.progress.set(pixel / width)
+
+        # Seconds until the label's text changes, and until the bar loses a pixel
+        to_next_second = (self.duration - elapsed) - (self.remaining - 1)
+        to_next_pixel = (filled - (pixel - 1)) / width * self.duration
+        delay = min(to_next_second, to_next_pixel)
+        delay_ms = max(POPUP_MIN_FRAME_MS, math.ceil(delay * 1000))
+        self._after("render", delay_ms, self._render)
+
+    def _finish(self):
+        """Countdown reached zero: play the end sound, then dismiss or wait for the user."""
+        if self.end_sound and self.end_sound != "None":
+            if self.loop_end_sound:
+                threading.Thread(
+                    target=looping_sound,
+                    args=(self.sound_stop_event, self.end_sound),
+                    daemon=True
+                ).start()
+            else:
+                play_sound(self.end_sound)
 
-        if self.remaining > 0:
-            self.window.after(50, self._update_progress_smooth)
+        if self.auto_dismiss:
+            self.close()
+        else:
+            self.countdown_label.configure(text="Done!")
+            self._bring_to_attention()
 
+    @main_thread_timed("snooze")
     def snooze(self):
         """Snooze the break for a few minutes."""
         if self.closed or self.snoozed:
             return
         self.snoozed = True
-        self.sound_stop_event.set()
+        self.closed = True
         if self.on_snooze:
             self.on_snooze(self.SNOOZE_MINUTES)
-        try:
-            self.window.withdraw()
-        except Exception:
-            pass
-        self._prevent_focus_steal()  # Call before destroy
-        self.window.destroy()
-        self.closed = True
-        self._prevent_focus_steal()  # Call after destroy
+        self._hide()
 
+    @main_thread_timed("close")
     def close(self):
         if self.closed:
             return
         self.closed = True
-        self.sound_stop_event.set()
         if self.on_close:
             self.on_close()
-        try:
-            self.window.withdraw()
-        except Exception:
-            pass
-        self._prevent_focus_steal()  # Call before destroy to prevent focus transfer
-        self.window.destroy()
-        self._prevent_focus_steal()  # Call again after to ensure app is deactivated
-
-    def _get_frontmost_app(self):
-        """Get the name of the currently frontmost application."""
-        if sys.platform != "darwin":
-            return None
-        try:
-            result = subprocess.run(
-                ['osascript', '-e',
-                 'tell application "System Events" to get name of first process whose frontmost is true'],
-                capture_output=True, text=True, timeout=2
-            )
-            return result.stdout.strip() if result.returncode == 0 else None
-        except Exception:
-            return None
+        self._hide()
+
+    def _prevent_focus_steal(self, restore=False):
+        """Prevent main window from stealing focus and triggering Space switch on macOS.
 
-    def _prevent_focus_steal(self):
-        """Prevent main window from stealing focus and triggering Space switch on macOS."""
+        Re-activating the previous app runs on the FocusManager worker so the
+        Tk event loop never waits on osascript.
+        """
         if sys.platform == "darwin":
             try:
                 # Lower the parent window
                 self.parent.lower()
                 # Reactivate the app that was active before the popup appeared
-                if self._previous_app and self._previous_app != "Python":
-                    subprocess.run(
-                        ['osascript', '-e',
-                         f'tell application "{self._previous_app}" to activate'],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                        timeout=2
-                    )
+                if restore and self._previous_app is not None:
+                    FOCUS.restore(self._previous_app)
             except Exception:
                 pass
 
@@ -496,6 +626,7 @@ class CountdownPopup:
         except Exception:
             pass
 
+    @main_thread_timed("keep_on_top")
     def _keep_on_top(self):
         """Periodically ensure popup stays on top and visible."""
         if self.closed:
@@ -505,19 +636,15 @@ class CountdownPopup:
             self.window.attributes('-topmost', True)
         except Exception:
             return
-        self.window.after(2000, self._keep_on_top)
+        self._after("keep_on_top", 2000, self._keep_on_top)
 
+    @main_thread_timed("bring_to_user")
     def bring_to_user(self):
         """Bring popup to user's current location."""
         if self.closed:
             return
         try:
-            mouse_x = self.window.winfo_pointerx()
-            mouse_y = self.window.winfo_pointery()
-            popup_w, popup_h = 380, 300
-            x = mouse_x - popup_w // 2 + 20
-            y = mouse_y - popup_h // 2 + 20
-            self.window.geometry(f"{popup_w}x{popup_h}+{x}+{y}")
+            self._place_at_pointer()
             self.window.lift()
             self.window.focus_force()
             self.window.attributes('-topmost', True)
@@ -534,6 +661,7 @@ class CountdownPopup:
         except Exception:
             pass
 
+    @main_thread_timed("flash")
     def _flash_button(self, count=6):
         """Flash Done button to draw attention."""
         if self.closed or count <= 0:
@@ -541,9 +669,9 @@ class CountdownPopup:
         try:
             current_color = self.ok_btn.cget('fg_color')
             flash_color = "#FF6B6B"
-            new_color = flash_color if current_color != flash_color else None
+            new_color = flash_color if current_color != flash_color else COLORS['accent_blue']
             self.ok_btn.configure(fg_color=new_color)
-            self.window.after(200, lambda: self._flash_button(count - 1))
+            self._after("flash", 200, lambda: self._flash_button(count - 1))
         except Exception:
             pass
 
@@ -551,27 +679,40 @@ class CountdownPopup:
 # ------------------ BREAK CONFIG PANEL ------------------
 
 class BreakConfigPanel(ctk.CTkFrame):
-    """Modern UI panel for configuring a single break with collapsible support."""
+    """Modern UI panel for configuring a single break with collapsible support.
 
-    def __init__(self, parent, config, on_test):
+    Only the header is built up front; the body (and its Tk variables) is
+    built the first time the panel is expanded.
+    """
+
+    def __init__(self, parent, timer, on_change, on_test, expanded=True):
         super().__init__(
             parent,
             corner_radius=CORNER_RADIUS_PANEL,
             fg_color=COLORS['bg_panel']
         )
-        self.config = config
+        self.timer = timer
+        self.vars = None  # BreakVars, created with the body
+        self.on_change = on_change
         self.on_test = on_test
-        self._expanded = True
+        self.content_frame = None
+        self.timer_label = None
+        self._expanded = expanded
+        self._time_text = "--:--"
 
         # Animation state
         self._animating = False
         self._animation_id = None
-        self._expanded_height = None  # Set after UI is built
+        self._expanded_height = None  # Set after the body is built
         self._collapsed_height = PANEL_COLLAPSED_HEIGHT
 
-        self._build_ui()
+        self._build_header()
+        if expanded:
+            self._build_body()
+        else:
+            self._show_collapsed_header()
 
-    def _build_ui(self):
+    def _build_header(self):
         # Header (always visible) - clickable to toggle expand/collapse
         self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.header_frame.pack(fill="x", padx=PADDING_PANEL_X, pady=(PADDING_PANEL_Y // 2, 0))
@@ -579,8 +720,8 @@ class BreakConfigPanel(ctk.CTkFrame):
         # Left side: break name
         self.header_label = ctk.CTkLabel(
             self.header_frame,
-            text=self.config.name.get(),
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['status'], weight="bold"),
+            text=self.timer.spec.name,
+            font=STYLE.font('status', weight="bold"),
             cursor="hand2"
         )
         self.header_label.pack(side="left")
@@ -592,7 +733,7 @@ class BreakConfigPanel(ctk.CTkFrame):
         # Timer in header (visible when collapsed)
         self.header_timer = ctk.CTkLabel(
             header_right, text="--:--",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['timer'], weight="bold")
+            font=STYLE.font('timer', weight="bold")
         )
         self.header_timer.pack(side="left", padx=(0, 12))
         self.header_timer.pack_forget()  # Hidden by default (shown when collapsed)
@@ -601,7 +742,7 @@ class BreakConfigPanel(ctk.CTkFrame):
         self.chevron = ctk.CTkLabel(
             header_right,
             text="\u25B2",  # Up arrow when expanded
-            font=ctk.CTkFont(family=FONT_FAMILY, size=12),
+            font=STYLE.font('small'),
             text_color=COLORS['text_secondary'],
             cursor="hand2"
         )
@@ -615,6 +756,10 @@ class BreakConfigPanel(ctk.CTkFrame):
         self.header_frame.bind("<Return>", lambda e: self.toggle_expand())
         self.header_frame.bind("<space>", lambda e: self.toggle_expand())
 
+    def _build_body(self):
+        """Build the configuration rows (once, on first expand)."""
+        self.vars = BreakVars(self.timer.spec, lambda field, value: self.on_change(self.timer, field, value))
+
         # Content frame (hidden when collapsed)
         self.content_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.content_frame.pack(fill="x", padx=0, pady=0)
@@ -625,38 +770,38 @@ class BreakConfigPanel(ctk.CTkFrame):
 
         ctk.CTkLabel(
             row1, text="Every:",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
+            font=STYLE.font('label')
         ).pack(side="left")
         interval_entry = ctk.CTkEntry(
             row1, width=70, height=36,
-            textvariable=self.config.interval_value,
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input']),
+            textvariable=self.vars.interval_value,
+            font=STYLE.font('input'),
             corner_radius=CORNER_RADIUS_INPUT
         )
         interval_entry.pack(side="left", padx=(8, 4))
         interval_unit = ctk.CTkComboBox(
-            row1, variable=self.config.interval_unit,
+            row1, variable=self.vars.interval_unit,
             values=TIME_UNITS, width=80, height=36, state="readonly",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input']),
+            font=STYLE.font('input'),
             corner_radius=CORNER_RADIUS_INPUT
         )
         interval_unit.pack(side="left")
 
         ctk.CTkLabel(
             row1, text="Duration:",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
+            font=STYLE.font('label')
         ).pack(side="left", padx=(24, 0))
         duration_entry = ctk.CTkEntry(
             row1, width=70, height=36,
-            textvariable=self.config.duration_value,
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input']),
+            textvariable=self.vars.duration_value,
+            font=STYLE.font('input'),
             corner_radius=CORNER_RADIUS_INPUT
         )
         duration_entry.pack(side="left", padx=(8, 4))
         duration_unit = ctk.CTkComboBox(
-            row1, variable=self.config.duration_unit,
+            row1, variable=self.vars.duration_unit,
             values=TIME_UNITS, width=80, height=36, state="readonly",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input']),
+            font=STYLE.font('input'),
             corner_radius=CORNER_RADIUS_INPUT
         )
         duration_unit.pack(side="left")
@@ -667,12 +812,12 @@ class BreakConfigPanel(ctk.CTkFrame):
 
         ctk.CTkLabel(
             row2, text="Start:",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
+            font=STYLE.font('label')
         ).pack(side="left")
         start_sound = ctk.CTkComboBox(
-            row2, variable=self.config.start_sound,
+            row2, variable=self.vars.start_sound,
             values=list(SOUNDS.keys()), width=130, height=36, state="readonly",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input']),
+            font=STYLE.font('input'),
             corner_radius=CORNER_RADIUS_INPUT
         )
         start_sound.pack(side="left", padx=(8, 4))
@@ -681,18 +826,18 @@ class BreakConfigPanel(ctk.CTkFrame):
             corner_radius=CORNER_RADIUS_INPUT,
             fg_color=COLORS['bg_hover'],
             hover_color=COLORS['border'],
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['helper']),
-            command=lambda: play_sound(self.config.start_sound.get())
+            font=STYLE.font('helper'),
+            command=lambda: play_sound(self.vars.start_sound.get())
         ).pack(side="left", padx=(0, 16))
 
         ctk.CTkLabel(
             row2, text="End:",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
+            font=STYLE.font('label')
         ).pack(side="left")
         end_sound = ctk.CTkComboBox(
-            row2, variable=self.config.end_sound,
+            row2, variable=self.vars.end_sound,
             values=list(SOUNDS.keys()), width=130, height=36, state="readonly",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['input']),
+            font=STYLE.font('input'),
             corner_radius=CORNER_RADIUS_INPUT
         )
         end_sound.pack(side="left", padx=(8, 4))
@@ -701,8 +846,8 @@ class BreakConfigPanel(ctk.CTkFrame):
             corner_radius=CORNER_RADIUS_INPUT,
             fg_color=COLORS['bg_hover'],
             hover_color=COLORS['border'],
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['helper']),
-            command=lambda: play_sound(self.config.end_sound.get())
+            font=STYLE.font('helper'),
+            command=lambda: play_sound(self.vars.end_sound.get())
         ).pack(side="left")
 
         # Row 3: Options and Timer
@@ -711,20 +856,20 @@ class BreakConfigPanel(ctk.CTkFrame):
 
         ctk.CTkCheckBox(
             row3, text="Loop end sound",
-            variable=self.config.loop_end_sound,
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
+            variable=self.vars.loop_end_sound,
+            font=STYLE.font('label')
         ).pack(side="left")
 
         ctk.CTkCheckBox(
             row3, text="Auto-dismiss",
-            variable=self.config.auto_dismiss,
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
+            variable=self.vars.auto_dismiss,
+            font=STYLE.font('label')
         ).pack(side="left", padx=(16, 0))
 
         # Test button on right
         ctk.CTkButton(
             row3, text="Test",
-            command=lambda: self.on_test(self.config),
+            command=lambda: self.on_test(self.timer.spec),
             width=60, height=BUTTON_HEIGHT_SMALL,
             corner_radius=CORNER_RADIUS_INPUT,
             fg_color="transparent",
@@ -732,25 +877,33 @@ class BreakConfigPanel(ctk.CTkFrame):
             border_color=COLORS['border'],
             hover_color=COLORS['bg_hover'],
             text_color=COLORS['text_secondary'],
-            font=ctk.CTkFont(family=FONT_FAMILY, size=12)
+            font=STYLE.font('small')
         ).pack(side="right")
 
-        self.config.timer_label = ctk.CTkLabel(
-            row3, text="--:--",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['timer'], weight="bold")
+        self.timer_label = ctk.CTkLabel(
+            row3, text=self._time_text,
+            font=STYLE.font('timer', weight="bold")
         )
-        self.config.timer_label.pack(side="right", padx=(0, 16))
+        self.timer_label.pack(side="right", padx=(0, 16))
 
         ctk.CTkLabel(
             row3, text="Next:",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label']),
+            font=STYLE.font('label'),
             text_color=COLORS['text_secondary']
         ).pack(side="right")
 
-        # Measure and store expanded height after UI is built
+        # Measure and store expanded height after the body is built
+        self.pack_propagate(True)
         self.update_idletasks()
         self._expanded_height = self.winfo_reqheight()
 
+    def set_timer(self, timer):
+        """Show another break in this panel (profile switch) without rebuilding it."""
+        self.timer = timer
+        self.header_label.configure(text=timer.spec.name)
+        if self.vars is not None:
+            self.vars.load(timer.spec)
+
     def toggle_expand(self):
         """Toggle between expanded and collapsed states."""
         if self._expanded:
@@ -772,7 +925,11 @@ class BreakConfigPanel(ctk.CTkFrame):
         self._animating = True
 
         # Show content first (needed for height calculation and animation)
-        self.content_frame.pack(fill="x", padx=0, pady=0)
+        if self.content_frame is None:
+            self._build_body()
+        else:
+            self.content_frame.pack(fill="x", padx=0, pady=0)
+            self._set_label(self.timer_label, self._time_text)
         self.header_timer.pack_forget()
         self.chevron.configure(text="\u25B2")  # Up arrow
         self.header_frame.pack_configure(pady=(PADDING_PANEL_Y // 2, 0))
@@ -813,9 +970,7 @@ class BreakConfigPanel(ctk.CTkFrame):
         def on_complete():
             self._animating = False
             self.content_frame.pack_forget()
-            self.header_timer.pack(side="left", padx=(0, 12))
-            self.chevron.configure(text="\u25BC")  # Down arrow
-            self.header_frame.pack_configure(pady=(PADDING_PANEL_Y // 2, PADDING_PANEL_Y // 2))
+            self._show_collapsed_header()
 
         self._animate_height(
             current_height,
@@ -828,9 +983,30 @@ class BreakConfigPanel(ctk.CTkFrame):
         """Return whether the panel is currently expanded."""
         return self._expanded
 
-    def update_header_timer(self, time_text):
-        """Update the header timer display (for collapsed state)."""
-        self.header_timer.configure(text=time_text)
+    def _show_collapsed_header(self):
+        self.header_timer.pack(side="left", padx=(0, 12))
+        self._set_label(self.header_timer, self._time_text)
+        self.chevron.configure(text="\u25BC")  # Down arrow
+        self.header_frame.pack_configure(pady=(PADDING_PANEL_Y // 2, PADDING_PANEL_Y // 2))
+
+    def show_time(self, text):
+        """Show this break's countdown; returns True if a label was redrawn.
+
+        Only the visible label (header when collapsed, body when expanded) is
+        updated; the other catches up when the panel is toggled.
+        """
+        if text == self._time_text:
+            return False
+        self._time_text = text
+        label = self.timer_label if self._expanded else self.header_timer
+        return self._set_label(label, text)
+
+    @staticmethod
+    def _set_label(label, text):
+        if label is None or label.cget("text") == text:
+            return False
+        label.configure(text=text)
+        return True
 
     def _animate_height(self, start_height, end_height, duration, on_complete):
         """Frame-by-frame height animation with easing."""
@@ -861,32 +1037,61 @@ class BreakConfigPanel(ctk.CTkFrame):
         step()
 
 
+# ------------------ STARTUP PROFILING ------------------
+
+class StartupProfiler:
+    """Records startup phases for `--profile-startup`; a no-op unless enabled."""
+
+    STARTUP_TARGET_MS = 300
+
+    def __init__(self, start):
+        self.enabled = False
+        self._last = start
+        self._start = start
+        self.phases = []
+
+    def mark(self, phase):
+        """Close the current phase, naming what ran since the previous mark."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self, stream=sys.stderr):
+        total = self._last - self._start
+        print("Startup profile:", file=stream)
+        for phase, seconds in self.phases:
+            print(f"  {phase:<28} {seconds * 1e3:8.1f} ms", file=stream)
+        verdict = "OK" if total * 1e3 <= self.STARTUP_TARGET_MS else "over target"
+        print(f"  {'total to first paint':<28} {total * 1e3:8.1f} ms "
+              f"({verdict}, target {self.STARTUP_TARGET_MS} ms)", file=stream)
+
+
+STARTUP = StartupProfiler(_IMPORT_START)
+
+
 # ------------------ MAIN APP ------------------
 
 class BreakApp:
-    def __init__(self, root):
+    def __init__(self, root, policy_dir=POLICY_DIR):
         self.root = root
         root.title(APP_NAME)
         root.resizable(False, False)
 
-        self.running = False
-        self.paused = False
-        self.stop_event = threading.Event()
-        self.break_queue = []
         self.active_popup = None
-        self.break_start_time = None
-
-        # Default break configurations
-        self.default_breaks = [
-            {"name": "Micro Break", "interval_val": 25, "interval_unit": "min",
-             "duration_val": 5, "duration_unit": "sec", "start_sound": "Ping",
-             "end_sound": "Glass", "loop_end_sound": False, "auto_dismiss": True},
-            {"name": "Normal Break", "interval_val": 50, "interval_unit": "min",
-             "duration_val": 10, "duration_unit": "min", "start_sound": "Glass",
-             "end_sound": "Submarine", "loop_end_sound": True, "auto_dismiss": False}
-        ]
-
-        # Load saved preferences or use defaults
+        self._popup = None  # Pooled CountdownPopup, built once after startup
+
+        # UI refresh state: last text rendered per widget, pending tick, counters
+        self._rendered = {}
+        self._ui_job = None
+        self.ui_tick_count = 0
+        self.redraw_count = 0
+
+        # Load saved preferences (over the system policy, if any) or use defaults
+        self.prefs = PreferenceStore(CONFIG_FILE, delay=PREFS_SAVE_DELAY)
+        self.policy_dir = policy_dir
+        self.policy, self.locked = {}, set()
         self.saved_prefs = self._load_preferences()
 
         # Restore saved window position (size is derived from content after UI build)
@@ -904,25 +1109,54 @@ class BreakApp:
         root.attributes('-topmost', self.always_on_top.get())
 
         # Create break configurations from saved or default values
-        self.breaks = []
-        for i, default in enumerate(self.default_breaks):
-            prefs = self.saved_prefs.get("breaks", [{}] * len(self.default_breaks))
-            break_prefs = prefs[i] if i < len(prefs) else {}
-            self.breaks.append(BreakConfig(
-                name=break_prefs.get("name", default["name"]),
-                interval_val=break_prefs.get("interval_val", default["interval_val"]),
-                interval_unit=break_prefs.get("interval_unit", default["interval_unit"]),
-                duration_val=break_prefs.get("duration_val", default["duration_val"]),
-                duration_unit=break_prefs.get("duration_unit", default["duration_unit"]),
-                start_sound=break_prefs.get("start_sound", default["start_sound"]),
-                end_sound=break_prefs.get("end_sound", default["end_sound"]),
-                loop_end_sound=break_prefs.get("loop_end_sound", default["loop_end_sound"]),
-                auto_dismiss=break_prefs.get("auto_dismiss", default["auto_dismiss"])
-            ))
+        sleep_policy = self.saved_prefs.get("sleep_policy", "break")
+        if sleep_policy not in SLEEP_POLICIES:
+            sleep_policy = "break"
+        self.scheduler = BreakScheduler(breaks_from_prefs(self.saved_prefs),
+                                        sleep_clock=sleep_clock(), sleep_policy=sleep_policy)
+        self.scheduler.subscribe(self._on_scheduler_event)
+
+        # Named profiles: break lists by name; the active one is what the scheduler runs
+        self.active_profile = self.saved_prefs.get("active_profile", DEFAULT_PROFILE)
+        self.profiles = {name: [spec.to_dict() for spec in specs]
+                         for name, specs in saved_profiles(self.saved_prefs).items()}
+        self.profiles.setdefault(self.active_profile, [t.spec.to_dict() for t in self.scheduler.breaks])
+        self.profile_name = ctk.StringVar(value=self.active_profile)
+        self.profile_name.trace_add('write', self._on_profile_selected)
+
+        # What a system sleep means for the timers, shown by its description
+        self.sleep_policy = ctk.StringVar(value=SLEEP_POLICIES[sleep_policy])
+        self.sleep_policy.trace_add('write', self._apply_sleep_policy)
+
+        # Idle detection: time away from the keyboard counts as a break (default True)
+        self.idle_monitor = None
+        self.idle_detection = ctk.BooleanVar(
+            value=self.saved_prefs.get("idle_detection", True)
+        )
+        self.idle_detection.trace_add('write', self._apply_idle_detection)
+        root.after(2000, self._apply_idle_detection)  # Backend setup stays off the startup path
+
+        # Quiet hours from preferences rules and calendar files, parsed off the main thread
+        root.after(2500, self._load_quiet_hours)
+
+        # Pick up edits to the policy directory or preferences file while running
+        self.config_watcher = ConfigWatcher([CONFIG_FILE], [policy_dir],
+                                            lambda: self.root.after(0, self._reload_config),
+                                            ignore=lambda path: path == CONFIG_FILE and self.prefs.is_own_write())
+        root.after(3000, self.config_watcher.start)
+
+        # Break history (triggers, closes, snoozes, pauses, resets) for adherence reporting
+        self.history = EventLog(HISTORY_DIR)
+        self.scheduler.subscribe(self.history.record_scheduler_event)
+        atexit.register(self.history.close)  # Also on Cmd-Q, which skips _on_close
+        STARTUP.mark("BreakApp.__init__")
 
         self._build_ui()
+        STARTUP.mark("_build_ui")
+        # Load sounds once the window is up, off the Tk thread (backend loads can block)
+        root.after(1000, lambda: threading.Thread(target=PLAYER.preload, daemon=True).start())
+        root.after(1500, self._get_popup)  # Pre-build the break popup off the startup path
         self._fit_window_to_content()
-        self._setup_auto_save()
 
         # Save window geometry on close
         root.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -930,6 +1164,35 @@ class BreakApp:
         # Bring popup to user when main window is focused
         root.bind("<FocusIn>", self._on_main_focus)
 
+        # Timer displays stop ticking while minimized; catch up when shown again
+        root.bind("<Map>", lambda e: self.request_ui_update() if e.widget is root else None, add="+")
+
+        # Accept commands from other launches and scripts
+        self.control = ControlServer(CONTROL_SOCKET, self._control_commands())
+        self.control.start()
+
+        self._register_metrics()
+
+    def _register_metrics(self):
+        """Expose counters kept elsewhere as metrics gauges; start the stall watchdog if enabled."""
+        for name, read in [
+            ("sound.spawns", lambda: PLAYER.spawn_count),
+            ("focus.spawns", lambda: FOCUS.spawn_count),
+            ("accessibility.spawns", lambda: ACCESSIBILITY.spawn_count),
+            ("prefs.writes", lambda: self.prefs.write_count),
+            ("prefs.skipped_writes", lambda: self.prefs.skipped_count),
+            ("history.fsyncs", lambda: self.history.write_count),
+            ("ui.ticks", lambda: self.ui_tick_count),
+            ("ui.redraws", lambda: self.redraw_count),
+            ("control.requests", lambda: self.control.request_count),
+            ("idle.polls", lambda: self.idle_monitor.poll_count if self.idle_monitor else 0),
+            ("config.reloads", lambda: self.config_watcher.change_count),
+            ("popup.recent", lambda: [dict(stalls.summary(), title=stalls.title) for stalls in POPUP_STALL_LOG]),
+        ]:
+            METRICS.gauge(name, read)
+        if METRICS.enabled:
+            MainThreadWatchdog(METRICS, self.root.after).start()
+
     def _build_ui(self):
         # Main container
         main_frame = ctk.CTkFrame(self.root, fg_color="transparent")
@@ -942,7 +1205,7 @@ class BreakApp:
         self.status = ctk.CTkLabel(
             status_frame,
             text="Idle",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['title'], weight="bold"),
+            font=STYLE.font('title', weight="bold"),
             text_color=COLORS['text_secondary']
         )
         self.status.pack(side="left")
@@ -957,13 +1220,13 @@ class BreakApp:
             fg_color="transparent",
             hover_color=COLORS['bg_hover'],
             text_color=COLORS['text_secondary'],
-            font=ctk.CTkFont(size=15)
+            font=STYLE.font('icon')
         )
         self.settings_btn.pack(side="right", padx=(6, 0))
 
         self.next_break_label = ctk.CTkLabel(
             status_frame, text="",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['timer'], weight="bold"),
+            font=STYLE.font('timer', weight="bold"),
             text_color=COLORS['text_secondary']
         )
         self.next_break_label.pack(side="right")
@@ -979,7 +1242,7 @@ class BreakApp:
             corner_radius=CORNER_RADIUS_BUTTON,
             fg_color=COLORS['accent_blue'],
             hover_color=COLORS['accent_hover'],
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['control'], weight="bold")
+            font=STYLE.font('control', weight="bold")
         )
         self.toggle_btn.pack(side="left", padx=(0, 4), expand=True, fill="x")
 
@@ -992,29 +1255,18 @@ class BreakApp:
             border_width=1,
             border_color=COLORS['border'],
             hover_color=COLORS['bg_panel'],
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['control']),
+            font=STYLE.font('control'),
             state="disabled"
         )
         self.reset_btn.pack(side="left", padx=(4, 0), expand=True, fill="x")
 
         # Compact timer display cards
+        self._timer_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        self._timer_frame.pack(fill="x")
+        self._timer_cards = []  # (card, name label) per break
         self._timer_labels = []
-        for config in self.breaks:
-            card = ctk.CTkFrame(main_frame, corner_radius=CORNER_RADIUS_PANEL, fg_color=COLORS['bg_panel'])
-            card.pack(fill="x", pady=(0, 6))
-
-            ctk.CTkLabel(
-                card, text=config.name.get(),
-                font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
-            ).pack(side="left", padx=(PADDING_PANEL_X, 0), pady=8)
-
-            timer_label = ctk.CTkLabel(
-                card, text="--:--",
-                font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['timer'], weight="bold")
-            )
-            timer_label.pack(side="right", padx=(0, PADDING_PANEL_X), pady=8)
-
-            self._timer_labels.append(timer_label)
+        for timer in self.scheduler.breaks:
+            self._add_timer_card(timer)
 
         # Bottom bar: feedback
         bottom_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -1030,17 +1282,86 @@ class BreakApp:
             fg_color="transparent",
             hover_color=COLORS['bg_hover'],
             text_color="gray50",
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['helper'])
+            font=STYLE.font('helper')
+        ).pack(side="right")
+
+        ctk.CTkButton(
+            bottom_frame,
+            text="Stats",
+            command=self._open_stats,
+            width=50,
+            height=22,
+            corner_radius=6,
+            fg_color="transparent",
+            hover_color=COLORS['bg_hover'],
+            text_color="gray50",
+            font=STYLE.font('helper')
         ).pack(side="right")
 
         # Bind keyboard shortcuts
         self.root.bind('<Command-s>', lambda e: self._handle_toggle())
         self.root.bind('<Command-comma>', lambda e: self._open_settings())
-        self.root.bind('<Command-period>', lambda e: self.reset() if self.running else None)
+        self.root.bind('<Command-period>', lambda e: self.reset() if self.scheduler.running else None)
 
         # Start UI update loop
         self.update_ui()
 
+    def _add_timer_card(self, timer):
+        card = ctk.CTkFrame(self._timer_frame, corner_radius=CORNER_RADIUS_PANEL, fg_color=COLORS['bg_panel'])
+        card.pack(fill="x", pady=(0, 6))
+
+        name_label = ctk.CTkLabel(
+            card, text=timer.spec.name,
+            font=STYLE.font('label')
+        )
+        name_label.pack(side="left", padx=(PADDING_PANEL_X, 0), pady=8)
+
+        timer_label = ctk.CTkLabel(
+            card, text="--:--",
+            font=STYLE.font('timer', weight="bold")
+        )
+        timer_label.pack(side="right", padx=(0, PADDING_PANEL_X), pady=8)
+
+        self._timer_cards.append((card, name_label))
+        self._timer_labels.append(timer_label)
+
+    def _sync_break_widgets(self):
+        """Match timer cards and settings panels to the scheduler's breaks after a profile switch.
+
+        Existing widgets are relabelled and re-pointed at the new timers;
+        only the difference in count is built or destroyed.
+        """
+        breaks = list(self.scheduler.breaks)
+        for (card, name_label), timer in zip(self._timer_cards, breaks):
+            self._set_text(name_label, timer.spec.name)
+        for timer in breaks[len(self._timer_cards):]:
+            self._add_timer_card(timer)
+        while len(self._timer_cards) > len(breaks):
+            self._timer_cards.pop()[0].destroy()
+            self._timer_labels.pop()
+        self.root.update_idletasks()
+        self.root.geometry(f"{self.root.winfo_reqwidth()}x{self.root.winfo_reqheight()}")
+
+        if not (hasattr(self, '_settings_window') and self._settings_window
+                and self._settings_window.winfo_exists()):
+            return
+        if (len(breaks) >= SETTINGS_SCROLL_MIN) != (len(self._settings_panels) >= SETTINGS_SCROLL_MIN):
+            # The panel list changes between plain and scrolling: build the window afresh when next opened
+            visible = self._settings_visible()
+            self._settings_window.destroy()
+            self._settings_window = None
+            if visible:
+                self._open_settings()
+            return
+        for panel, timer in zip(self._settings_panels, breaks):
+            panel.set_timer(timer)
+        while len(self._settings_panels) > len(breaks):
+            self._settings_panels.pop().destroy()
+        extra = breaks[len(self._settings_panels):]
+        if extra:
+            self._build_settings_panels(self._settings_panel_list, extra,
+                                        expanded=len(breaks) <= SETTINGS_EXPANDED_MAX)
+
     def _fit_window_to_content(self):
         """Size the window to fit its content, then lock the size."""
         self.root.update_idletasks()
@@ -1054,44 +1375,81 @@ class BreakApp:
     # ------------------ PREFERENCES ------------------
 
     def _load_preferences(self):
-        """Load preferences from config file."""
-        try:
-            if CONFIG_FILE.exists():
-                with open(CONFIG_FILE, 'r') as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not load preferences: {e}")
-        return {}
+        """Load the policy directory and the user's preferences over it, dropping invalid entries."""
+        self.policy, self.locked, warnings = read_policy(self.policy_dir)
+        for warning in warnings:
+            print(f"Warning: Policy: {warning}")
+        prefs, warnings = sanitize_prefs(self.prefs.load())
+        for warning in warnings:
+            print(f"Warning: Preferences: {warning}")
+        return merge_layers(self.policy, self.locked, prefs)
+
+    def _reload_config(self):
+        """Apply policy or preferences edits made outside the app while it runs.
+
+        Only what differs from the running state is touched: changed breaks
+        are swapped in place (a timer restarts only if its interval changed)
+        and every other break keeps counting down.
+        """
+        self.prefs.flush()  # Edits made in the app and not yet written win over the file
+        prefs = self._load_preferences()
+
+        self.active_profile = prefs.get("active_profile", DEFAULT_PROFILE)
+        specs = breaks_from_prefs(prefs)
+        if specs != [timer.spec for timer in self.scheduler.breaks]:
+            self.scheduler.set_breaks(specs)
+            self._sync_break_widgets()
+        self.profiles = {name: [spec.to_dict() for spec in profile_specs]
+                         for name, profile_specs in saved_profiles(prefs).items()}
+        self.profiles[self.active_profile] = [spec.to_dict() for spec in specs]
+        self._refresh_profile_menu()
+
+        for var, key in [(self.always_on_top, "always_on_top"), (self.idle_detection, "idle_detection")]:
+            if var.get() != prefs.get(key, True):
+                var.set(prefs.get(key, True))
+        sleep_policy = prefs.get("sleep_policy", "break")
+        if sleep_policy in SLEEP_POLICIES and sleep_policy != self.scheduler.sleep_policy:
+            self.sleep_policy.set(SLEEP_POLICIES[sleep_policy])
+
+        quiet_changed = any(prefs.get(key) != self.saved_prefs.get(key) for key in ("quiet_hours", "calendars"))
+        self.saved_prefs = prefs
+        if quiet_changed:
+            self._load_quiet_hours()
+        self.request_ui_update()
 
     def _save_preferences(self, *args, include_geometry=False):
-        """Save current preferences to config file."""
-        prefs = {"breaks": [], "always_on_top": self.always_on_top.get()}
-        for config in self.breaks:
-            prefs["breaks"].append({
-                "name": config.name.get(),
-                "interval_val": BreakConfig._safe_int(config.interval_value),
-                "interval_unit": config.interval_unit.get(),
-                "duration_val": BreakConfig._safe_int(config.duration_value),
-                "duration_unit": config.duration_unit.get(),
-                "start_sound": config.start_sound.get(),
-                "end_sound": config.end_sound.get(),
-                "loop_end_sound": config.loop_end_sound.get(),
-                "auto_dismiss": config.auto_dismiss.get()
-            })
+        """Stage current preferences; PreferenceStore coalesces and writes them."""
+        breaks = [timer.spec.to_dict() for timer in self.scheduler.breaks]
+        self.profiles[self.active_profile] = breaks
+        prefs = {
+            "breaks": breaks,
+            "active_profile": self.active_profile,
+            "profiles": {name: {"breaks": profile} for name, profile in self.profiles.items()},
+            "always_on_top": self.always_on_top.get(),
+            "idle_detection": self.idle_detection.get(),
+            "sleep_policy": self.scheduler.sleep_policy
+        }
         if include_geometry:
             prefs["window_geometry"] = self.root.geometry()
         elif hasattr(self, 'saved_prefs') and "window_geometry" in self.saved_prefs:
             prefs["window_geometry"] = self.saved_prefs["window_geometry"]
-        try:
-            CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(prefs, f, indent=2)
-        except IOError as e:
-            print(f"Warning: Could not save preferences: {e}")
+        for key in ("quiet_hours", "calendars"):  # Edited by hand; kept as saved
+            if hasattr(self, 'saved_prefs') and key in self.saved_prefs:
+                prefs[key] = self.saved_prefs[key]
+        self.prefs.save(user_layer(prefs, self.policy, self.locked))  # Only what differs from the policy
 
     def _on_close(self):
         """Handle window close."""
+        self.control.stop()
+        self.config_watcher.stop()
+        if self.idle_monitor is not None:
+            self.idle_monitor.stop()
         self._save_preferences(include_geometry=True)
+        self.prefs.flush()
+        try:
+            self.history.close()
+        except OSError as e:
+            print(f"Warning: Could not write break history: {e}")  # Never block closing the window
         self.root.destroy()
 
     def _on_main_focus(self, event=None):
@@ -1101,6 +1459,11 @@ class BreakApp:
 
     def _open_feedback(self):
         """Open GitHub new issue page with pre-filled system info."""
+        # Imported here: only needed on this rarely used path
+        import platform
+        import webbrowser
+        from urllib.parse import quote as url_quote
+
         try:
             app_version = VERSION_FILE.read_text().strip()
         except (FileNotFoundError, IOError):
@@ -1122,34 +1485,163 @@ class BreakApp:
         url = f"{GITHUB_NEW_ISSUE_URL}?body={url_quote(body)}"
         webbrowser.open(url)
 
-    def _setup_auto_save(self):
-        """Setup auto-save when any preference changes."""
-        for config in self.breaks:
-            config.interval_value.trace_add('write', lambda *a, c=config: self._on_interval_changed(c))
-            config.interval_unit.trace_add('write', lambda *a, c=config: self._on_interval_changed(c))
-            config.duration_value.trace_add('write', self._save_preferences)
-            config.duration_unit.trace_add('write', self._save_preferences)
-            config.start_sound.trace_add('write', self._save_preferences)
-            config.end_sound.trace_add('write', self._save_preferences)
-            config.loop_end_sound.trace_add('write', self._save_preferences)
-            config.auto_dismiss.trace_add('write', self._save_preferences)
-
-    def _on_interval_changed(self, config):
-        """Handle interval change — reset timer and save preferences."""
-        config.reset_timer()
+    # ------------------ STATISTICS ------------------
+
+    def _open_stats(self):
+        """Open the break adherence window, or bring it to front if already open."""
+        if getattr(self, '_stats_window', None) is not None and self._stats_window.winfo_exists():
+            self._stats_window.deiconify()
+            self._stats_window.lift()
+            self._refresh_stats()
+            return
+
+        self._stats_window = ctk.CTkToplevel(self.root)
+        self._stats_window.title("Break Statistics")
+        self._stats_window.resizable(False, False)
+        self._stats_window.attributes('-topmost', self.always_on_top.get())
+
+        container = ctk.CTkFrame(self._stats_window, fg_color="transparent")
+        container.pack(fill="both", expand=True, padx=PADDING_WINDOW, pady=PADDING_WINDOW)
+
+        self._stats_period = ctk.StringVar(value="Week")
+        ctk.CTkSegmentedButton(
+            container, values=list(STATS_PERIODS),
+            variable=self._stats_period,
+            command=lambda value: self._refresh_stats(),
+            font=STYLE.font('label')
+        ).pack(fill="x", pady=(0, ROW_SPACING))
+
+        self._stats_table = ctk.CTkFrame(container, corner_radius=CORNER_RADIUS_PANEL, fg_color=COLORS['bg_panel'])
+        self._stats_table.pack(fill="both", expand=True)
+        self._stats_rollups = None
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        """Bring the rollups up to date off the main thread, then redraw the table."""
+        def load():
+            from analytics import load_rollups
+            self.history.flush()
+            rollups = load_rollups(HISTORY_DIR)  # Reads only events logged since the last load
+            self.root.after(0, lambda: self._show_stats(rollups))
+
+        if self._stats_rollups is not None:
+            self._show_stats(self._stats_rollups)  # Show what we have while catching up
+        threading.Thread(target=load, daemon=True).start()
+
+    def _show_stats(self, rollups):
+        if not self._stats_window.winfo_exists():
+            return
+        self._stats_rollups = rollups
+        end = datetime.date.today()
+        start = end - datetime.timedelta(days=STATS_PERIODS[self._stats_period.get()] - 1)
+        rows = rollups.report(start, end)
+
+        for widget in self._stats_table.winfo_children():
+            widget.destroy()
+        headers = ("Break", "Taken / Due", "Snoozes", "Avg length")
+        for column, text in enumerate(headers):
+            ctk.CTkLabel(
+                self._stats_table, text=text,
+                font=STYLE.font('label', weight="bold"),
+                text_color=COLORS['text_secondary']
+            ).grid(row=0, column=column, sticky="w", padx=PADDING_PANEL_X // 2, pady=(PADDING_PANEL_Y // 2, 4))
+        for i, row in enumerate(rows, start=1):
+            adherence = f" ({row['adherence']:.0%})" if row['adherence'] is not None else ""
+            cells = (row['break'], f"{row['taken']} / {row['due']}{adherence}",
+                     f"{row['avg_snoozes']:.1f}", self._format_time(round(row['avg_length'])))
+            for column, text in enumerate(cells):
+                ctk.CTkLabel(
+                    self._stats_table, text=text, font=STYLE.font('label')
+                ).grid(row=i, column=column, sticky="w", padx=PADDING_PANEL_X // 2, pady=2)
+        if not rows:
+            ctk.CTkLabel(
+                self._stats_table, text="No breaks recorded in this period.",
+                font=STYLE.font('label'), text_color=COLORS['text_secondary']
+            ).grid(row=1, column=0, columnspan=len(headers), padx=PADDING_PANEL_X // 2, pady=PADDING_PANEL_Y)
+
+    # ------------------ PROFILES ------------------
+
+    def switch_profile(self, name):
+        """Make profile `name` the active one, updating the running timers in place."""
+        if name not in self.profiles:
+            raise ValueError(f"unknown profile {name!r}; profiles: {', '.join(self.profiles)}")
+        if name != self.active_profile:
+            self._save_preferences()  # Keep the outgoing profile's edits
+            self.active_profile = name
+        self.scheduler.set_breaks(breaks_from_prefs({"breaks": self.profiles[name]}))
+        self._sync_break_widgets()
+        self._refresh_profile_menu()
+        self.request_ui_update()
+        self._save_preferences()
+        return {'profile': name, 'breaks': [t.spec.name for t in self.scheduler.breaks]}
+
+    def import_profiles(self, path):
+        """Add or replace profiles from a bundle; re-applies the active profile if the bundle has it."""
+        from profiles import read_bundle
+        profiles = read_bundle(path)
+        for name, specs in profiles.items():
+            self.profiles[name] = [spec.to_dict() for spec in specs]
+        if self.active_profile in profiles:
+            self.switch_profile(self.active_profile)
+        else:
+            self._refresh_profile_menu()
+            self._save_preferences()
+        return {'imported': list(profiles), 'active': self.active_profile}
+
+    def export_profiles(self, path, names=None):
+        """Write profiles (default: all) to a bundle at `path`."""
+        from profiles import write_bundle
+        self.profiles[self.active_profile] = [t.spec.to_dict() for t in self.scheduler.breaks]
+        names = names or list(self.profiles)
+        write_bundle(path, {name: breaks_from_prefs({"breaks": self.profiles[name]}) for name in names})
+        return {'exported': names, 'path': str(path)}
+
+    def _on_profile_selected(self, *args):
+        if self.profile_name.get() != self.active_profile:
+            self.switch_profile(self.profile_name.get())
+
+    def _refresh_profile_menu(self):
+        if hasattr(self, '_profile_menu') and self._profile_menu.winfo_exists():
+            self._profile_menu.configure(values=list(self.profiles))
+        if self.profile_name.get() != self.active_profile:
+            self.profile_name.set(self.active_profile)
+
+    def _import_profiles_dialog(self):
+        from tkinter import filedialog, messagebox
+        from profiles import ProfileError
+        path = filedialog.askopenfilename(parent=self._settings_window, title="Import Break Profiles",
+                                          filetypes=[("Break profiles", "*.json")])
+        if not path:
+            return
+        try:
+            self.import_profiles(path)
+        except (ProfileError, OSError) as e:
+            messagebox.showerror("Import Break Profiles", f"{Path(path).name} was not imported:\n\n{e}",
+                                 parent=self._settings_window)
+
+    def _export_profiles_dialog(self):
+        from tkinter import filedialog, messagebox
+        path = filedialog.asksaveasfilename(parent=self._settings_window, title="Export Break Profiles",
+                                            defaultextension=".json", initialfile="break-profiles.json")
+        if not path:
+            return
+        try:
+            self.export_profiles(path)
+        except OSError as e:
+            messagebox.showerror("Export Break Profiles", str(e), parent=self._settings_window)
+
+    def _on_break_changed(self, timer, field, value):
+        """Auto-save: push a settings edit to the scheduler and save preferences."""
+        self.scheduler.update_break(timer, **{field: value})
+        self.request_ui_update()
         self._save_preferences()
 
     # ------------------ CONTROLS ------------------
 
     def start(self):
-        if self.running:
+        if self.scheduler.running:
             return
-        self.running = True
-        self.paused = False
-        self.stop_event.clear()
-
-        for config in self.breaks:
-            config.reset_timer()
+        self.scheduler.start()
 
         self.status.configure(text="Working", text_color=COLORS['accent_green'])
         self.toggle_btn.configure(
@@ -1159,13 +1651,11 @@ class BreakApp:
         )
         self.reset_btn.configure(state="normal")
 
-        threading.Thread(target=self.timer_loop, daemon=True).start()
-
     def toggle_pause(self):
-        if not self.running:
+        if not self.scheduler.running:
             return
-        if self.paused:
-            self.paused = False
+        if self.scheduler.paused:
+            self.scheduler.resume()
             self.toggle_btn.configure(
                 text="Pause",
                 fg_color=COLORS['accent_orange'],
@@ -1173,7 +1663,7 @@ class BreakApp:
             )
             self.status.configure(text="Working", text_color=COLORS['accent_green'])
         else:
-            self.paused = True
+            self.scheduler.pause()
             self.toggle_btn.configure(
                 text="Resume",
                 fg_color=COLORS['accent_blue'],
@@ -1182,11 +1672,8 @@ class BreakApp:
             self.status.configure(text="Paused", text_color=COLORS['accent_orange'])
 
     def reset(self):
-        self.running = False
-        self.paused = False
-        self.stop_event.set()
+        self.scheduler.reset()
 
-        self.break_queue.clear()
         if self.active_popup:
             try:
                 self.active_popup.close()
@@ -1194,9 +1681,6 @@ class BreakApp:
                 pass
             self.active_popup = None
 
-        for config in self.breaks:
-            config.reset_timer()
-
         self.status.configure(text="Idle", text_color=COLORS['text_secondary'])
         self.toggle_btn.configure(
             text="Start",
@@ -1210,9 +1694,46 @@ class BreakApp:
         self.root.attributes('-topmost', self.always_on_top.get())
         self._save_preferences()
 
+    def _apply_idle_detection(self, *args):
+        """Start or stop the idle monitor; saves preferences when the setting changes."""
+        if self.idle_detection.get():
+            if self.idle_monitor is None:
+                from idle import IdleMonitor, default_backend
+                backend = default_backend()
+                if backend is not None:
+                    self.idle_monitor = IdleMonitor(self.scheduler, backend)
+            if self.idle_monitor is not None:
+                self.idle_monitor.start()
+        elif self.idle_monitor is not None:
+            self.idle_monitor.stop()
+        if args:
+            self._save_preferences()
+
+    def _load_quiet_hours(self):
+        """Build the quiet schedule on a background thread and hand it to the scheduler."""
+        rules = self.saved_prefs.get("quiet_hours", [])
+        calendars = self.saved_prefs.get("calendars", [])
+        if not rules and not calendars:
+            self.scheduler.set_quiet(None)
+            return
+
+        def load():
+            from quiet import load_quiet_schedule
+            self.scheduler.set_quiet(load_quiet_schedule(rules, calendars))
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def _apply_sleep_policy(self, *args):
+        """Apply the sleep policy chosen in settings and save preferences."""
+        for policy, description in SLEEP_POLICIES.items():
+            if description == self.sleep_policy.get():
+                self.scheduler.set_sleep_policy(policy)
+                self._save_preferences()
+                return
+
     def _handle_toggle(self):
         """Unified Start/Pause toggle handler."""
-        if not self.running:
+        if not self.scheduler.running:
             self.start()
         else:
             self.toggle_pause()
@@ -1223,6 +1744,7 @@ class BreakApp:
             self._settings_window.deiconify()
             self._settings_window.lift()
             self._settings_window.focus_force()
+            self.request_ui_update()  # Panel timers are not updated while hidden
             return
 
         self._settings_window = ctk.CTkToplevel(self.root)
@@ -1251,95 +1773,154 @@ class BreakApp:
         container = ctk.CTkFrame(self._settings_window, fg_color="transparent")
         container.pack(fill="both", expand=True, padx=PADDING_WINDOW, pady=PADDING_WINDOW)
 
-        # Reuse existing BreakConfigPanel class
+        # Break panels: headers only, bodies are built when a panel is expanded
+        breaks = list(self.scheduler.breaks)
+        if len(breaks) >= SETTINGS_SCROLL_MIN:
+            panel_list = ctk.CTkScrollableFrame(container, fg_color="transparent")
+            panel_list.pack(fill="both", expand=True)
+        else:
+            panel_list = ctk.CTkFrame(container, fg_color="transparent")
+            panel_list.pack(fill="x")
+        self._settings_panel_list = panel_list
         self._settings_panels = []
-        for config in self.breaks:
-            panel = BreakConfigPanel(container, config, self.test_break)
-            panel.pack(fill="x", pady=(0, ROW_SPACING))
-            self._settings_panels.append(panel)
+        self._build_settings_panels(panel_list, breaks, expanded=len(breaks) <= SETTINGS_EXPANDED_MAX)
 
         # General settings
         general_frame = ctk.CTkFrame(container, corner_radius=CORNER_RADIUS_PANEL, fg_color=COLORS['bg_panel'])
         general_frame.pack(fill="x", pady=(ROW_SPACING, 0))
 
+        profile_row = ctk.CTkFrame(general_frame, fg_color="transparent")
+        profile_row.pack(fill="x", padx=PADDING_PANEL_X, pady=(PADDING_PANEL_Y, ROW_SPACING // 2))
+        ctk.CTkLabel(
+            profile_row, text="Profile:",
+            font=STYLE.font('label')
+        ).pack(side="left")
+        self._profile_menu = ctk.CTkComboBox(
+            profile_row, variable=self.profile_name,
+            values=list(self.profiles), width=200, height=36, state="readonly",
+            font=STYLE.font('input'),
+            corner_radius=CORNER_RADIUS_INPUT
+        )
+        self._profile_menu.pack(side="left", padx=(8, 0))
+        for text, command in [("Export\u2026", self._export_profiles_dialog),
+                              ("Import\u2026", self._import_profiles_dialog)]:
+            ctk.CTkButton(
+                profile_row, text=text,
+                command=command,
+                width=70, height=BUTTON_HEIGHT_SMALL,
+                corner_radius=CORNER_RADIUS_INPUT,
+                fg_color="transparent",
+                border_width=1,
+                border_color=COLORS['border'],
+                hover_color=COLORS['bg_hover'],
+                text_color=COLORS['text_secondary'],
+                font=STYLE.font('small')
+            ).pack(side="right", padx=(6, 0))
+
         ctk.CTkCheckBox(
             general_frame, text="Always on top",
             variable=self.always_on_top,
-            font=ctk.CTkFont(family=FONT_FAMILY, size=FONT_SIZES['label'])
-        ).pack(padx=PADDING_PANEL_X, pady=PADDING_PANEL_Y, anchor="w")
-
-    # ------------------ TIMER ------------------
-
-    def timer_loop(self):
-        """Single timer loop managing all breaks."""
-        while self.running and not self.stop_event.is_set():
-            time.sleep(1)
-            if self.paused or self.active_popup:
-                continue
-
-            fired_breaks = []
-            for config in self.breaks:
-                config.remaining -= 1
-                if config.remaining <= 0:
-                    fired_breaks.append(config)
-
-            if fired_breaks:
-                longest = max(fired_breaks, key=lambda c: c.get_duration_seconds())
-                for config in fired_breaks:
-                    config.reset_timer()
-                self.trigger_break(longest)
-
-    def trigger_break(self, config):
-        """Queue a break with the given configuration."""
-        break_data = {
-            'name': config.name.get(),
-            'duration': config.get_duration_seconds(),
-            'auto_dismiss': config.auto_dismiss.get(),
-            'start_sound': config.start_sound.get(),
-            'end_sound': config.end_sound.get(),
-            'loop_end_sound': config.loop_end_sound.get()
-        }
-        self.break_queue.append(break_data)
-        self.root.after(0, self._process_break_queue)
+            font=STYLE.font('label')
+        ).pack(padx=PADDING_PANEL_X, pady=ROW_SPACING // 2, anchor="w")
+
+        ctk.CTkCheckBox(
+            general_frame, text="Count time away from the keyboard as a break",
+            variable=self.idle_detection,
+            font=STYLE.font('label')
+        ).pack(padx=PADDING_PANEL_X, pady=ROW_SPACING // 2, anchor="w")
+
+        sleep_row = ctk.CTkFrame(general_frame, fg_color="transparent")
+        sleep_row.pack(fill="x", padx=PADDING_PANEL_X, pady=(ROW_SPACING // 2, PADDING_PANEL_Y))
+        ctk.CTkLabel(
+            sleep_row, text="When the computer sleeps:",
+            font=STYLE.font('label')
+        ).pack(side="left")
+        ctk.CTkComboBox(
+            sleep_row, variable=self.sleep_policy,
+            values=list(SLEEP_POLICIES.values()), width=220, height=36, state="readonly",
+            font=STYLE.font('input'),
+            corner_radius=CORNER_RADIUS_INPUT
+        ).pack(side="left", padx=(8, 0))
+
+    def _build_settings_panels(self, panel_list, timers, expanded):
+        """Build settings panels a batch at a time so long lists never block the window.
+
+        The first SETTINGS_PANEL_BATCH (about a screenful of collapsed
+        headers) are built immediately; the rest follow in idle callbacks.
+        """
+        batch = SETTINGS_PANEL_BATCH
+        for timer in timers[:batch]:
+            panel = BreakConfigPanel(panel_list, timer, self._on_break_changed, self.test_break,
+                                     expanded=expanded)
+            panel.pack(fill="x", pady=(0, ROW_SPACING))
+            self._settings_panels.append(panel)
+        self.request_ui_update()  # Fill in the new panels' timers
+        rest = timers[batch:]
+        if rest:
+            self._settings_window.after_idle(
+                lambda: self._build_settings_panels(panel_list, rest, expanded))
+
+    # ------------------ BREAKS ------------------
+
+    def _on_scheduler_event(self, event, data):
+        """Scheduler subscriber; may be called from the timer thread."""
+        if event == "break_queued":
+            if 'lateness' in data:  # Test breaks have no deadline
+                METRICS.observe("break.trigger_lateness", data['lateness'] * 1e3)
+            FOCUS.prefetch()  # Learn the frontmost app before the popup takes focus
+            self.root.after(0, self._process_break_queue)
+        elif event in ("idle_started", "idle_ended"):
+            self.root.after(0, self._show_running_status)
+        self.root.after(0, self.request_ui_update)
+
+    def _show_running_status(self):
+        """Status label for the running states: Away, Paused or Working."""
+        if not self.scheduler.running or self.active_popup:
+            return
+        if self.scheduler.idle_since is not None:
+            self.status.configure(text="Away", text_color=COLORS['text_secondary'])
+        elif self.scheduler.paused:
+            self.status.configure(text="Paused", text_color=COLORS['accent_orange'])
+        else:
+            self.status.configure(text="Working", text_color=COLORS['accent_green'])
+
+    def _get_popup(self):
+        """Return the pooled break popup, building it if needed."""
+        if self._popup is None or not self._popup.exists():
+            self._popup = CountdownPopup(self.root)
+        return self._popup
 
+    @METRICS.timed("after.process_break_queue")
     def _process_break_queue(self):
         """Process the next break in the queue if no popup is active."""
-        if self.active_popup or not self.break_queue:
+        if self.active_popup:
             return
 
-        break_data = self.break_queue.pop(0)
-
-        if break_data['duration'] <= 0:
-            self.root.after(0, self._process_break_queue)
+        triggered_at = time.perf_counter()
+        break_data = self.scheduler.begin_next_break()
+        if break_data is None:
             return
 
         play_sound(break_data['start_sound'])
-        self.break_start_time = time.time()
 
         def on_popup_close():
-            elapsed = int(time.time() - self.break_start_time) if self.break_start_time else 0
-            for queued_break in self.break_queue:
-                queued_break['duration'] -= elapsed
-
+            self.scheduler.end_break()
             self.active_popup = None
-            self.break_start_time = None
-            if self.running and not self.paused:
+            if self.scheduler.running and not self.scheduler.paused:
                 self.status.configure(text="Working", text_color=COLORS['accent_green'])
-            elif not self.running:
+            elif not self.scheduler.running:
                 self.status.configure(text="Idle", text_color=COLORS['text_secondary'])
             self.root.after(0, self._process_break_queue)
 
         def on_snooze(snooze_minutes):
+            self.scheduler.snooze_break(snooze_minutes)
             self.active_popup = None
-            self.break_start_time = None
-            if self.running and not self.paused:
+            if self.scheduler.running and not self.scheduler.paused:
                 self.status.configure(text="Working", text_color=COLORS['accent_green'])
-                snooze_ms = snooze_minutes * 60 * 1000
-                self.root.after(snooze_ms, lambda: self._requeue_break(break_data))
 
         self.status.configure(text=break_data['name'], text_color=COLORS['accent_orange'])
-        self.active_popup = CountdownPopup(
-            self.root,
+        self.active_popup = self._get_popup()
+        self.active_popup.show(
             break_data['name'],
             "Take a break!",
             break_data['duration'],
@@ -1347,49 +1928,179 @@ class BreakApp:
             on_close=on_popup_close,
             on_snooze=on_snooze,
             end_sound=break_data['end_sound'],
-            loop_end_sound=break_data['loop_end_sound']
+            loop_end_sound=break_data['loop_end_sound'],
+            triggered_at=triggered_at
         )
 
-    def _requeue_break(self, break_data):
-        """Re-queue a snoozed break."""
-        if self.running and not self.paused:
-            self.break_queue.append(break_data)
-            self.root.after(0, self._process_break_queue)
-
-    def test_break(self, config):
+    def test_break(self, spec):
         """Test a specific break configuration."""
-        self.trigger_break(config)
+        self.scheduler.trigger(spec)
+
+    # ------------------ CONTROL SOCKET ------------------
+
+    def _control_commands(self):
+        """Commands served on CONTROL_SOCKET (see control.py), keyed by name."""
+        on_main = self._on_main_thread
+        return {
+            'start': on_main(lambda arg: self.start() or self.scheduler.status()),
+            'pause': on_main(lambda arg: self._control_pause(True)),
+            'resume': on_main(lambda arg: self._control_pause(False)),
+            'reset': on_main(lambda arg: self.reset() or self.scheduler.status()),
+            'status': lambda arg: self.scheduler.status(),
+            'test-break': self._control_test_break,
+            'next-break': self._control_next_break,
+            'show': on_main(lambda arg: activate_window(self.root)),
+            'metrics': self._control_metrics,
+            'profile': on_main(self._control_profile),
+            'import-profiles': on_main(self._control_import_profiles),
+            'export-profiles': on_main(self._control_export_profiles),
+        }
+
+    def _control_profile(self, name):
+        """Switch to profile `name`, or list profiles when no name is given."""
+        if name is None:
+            return {'active': self.active_profile, 'profiles': list(self.profiles)}
+        if name not in self.profiles:
+            raise ControlError(f"no profile named {name!r}")
+        return self.switch_profile(name)
+
+    def _control_import_profiles(self, path):
+        from profiles import ProfileError
+        if path is None:
+            raise ControlError("import-profiles needs a bundle path")
+        try:
+            return self.import_profiles(path)
+        except (ProfileError, OSError) as e:
+            raise ControlError(f"{path} was not imported: {e}") from e
+
+    def _control_export_profiles(self, path):
+        if path is None:
+            raise ControlError("export-profiles needs a bundle path")
+        return self.export_profiles(path)
+
+    def _on_main_thread(self, func):
+        """Wrap `func` so the control thread runs it on the Tk main thread and waits for it."""
+        def call(arg):
+            done = threading.Event()
+            outcome = {}
+
+            def run():
+                try:
+                    outcome['result'] = func(arg)
+                except Exception as e:
+                    outcome['error'] = e
+                finally:
+                    done.set()
+
+            self.root.after(0, run)
+            if not done.wait(CONTROL_TIMEOUT):
+                raise ControlError("timed out waiting for the UI")
+            if 'error' in outcome:
+                raise outcome['error']
+            return outcome.get('result')
+        return call
+
+    def _control_pause(self, pause):
+        if not self.scheduler.running:
+            raise ControlError("not running")
+        if self.scheduler.paused != pause:
+            self.toggle_pause()
+        return self.scheduler.status()
+
+    def _control_test_break(self, name):
+        """Trigger the named break (or the first one) now."""
+        timers = self.scheduler.breaks
+        if name is not None:
+            timers = [t for t in timers if t.spec.name.lower() == name.lower()]
+            if not timers:
+                raise ControlError(f"no break named {name!r}")
+        self.test_break(timers[0].spec)
+        return timers[0].spec.name
+
+    def _control_metrics(self, path):
+        """Return a metrics snapshot, also writing it to `path` if given."""
+        if path is not None:
+            METRICS.write_json(path)
+        return METRICS.snapshot()
+
+    def _control_next_break(self, arg):
+        """Take the next scheduled break now."""
+        timer = self.scheduler.fire_next()
+        if timer is None:
+            raise ControlError("no break is counting down")
+        return timer.spec.name
 
     # ------------------ UI UPDATE ------------------
 
-    def update_ui(self):
-        """Update timer displays for all breaks."""
-        next_break = None
-        min_remaining = float('inf')
+    def request_ui_update(self):
+        """Refresh the timer displays now, restarting the 1 s tick if it is needed."""
+        if self._ui_job is not None:
+            self.root.after_cancel(self._ui_job)
+            self._ui_job = None
+        self.update_ui()
+
+    def _set_text(self, widget, text):
+        """Configure a label only if its text differs from what was last rendered."""
+        if self._rendered.get(widget) == text:
+            return
+        self._rendered[widget] = text
+        widget.configure(text=text)
+        self.redraw_count += 1
 
-        for i, config in enumerate(self.breaks):
-            time_text = self._format_time(config.remaining)
+    def _settings_visible(self):
+        window = getattr(self, '_settings_window', None)
+        try:
+            return window is not None and window.state() == "normal"
+        except Exception:
+            return False
+
+    def _needs_tick(self):
+        """Timer text only changes while timers count down and the window is visible."""
+        scheduler = self.scheduler
+        if not scheduler.running or scheduler.paused or scheduler.active_break is not None:
+            return False
+        if scheduler.idle_since is not None:
+            return False  # Frozen while the user is away; "idle_ended" restarts the tick
+        return self.root.state() not in ("withdrawn", "iconic")
+
+    @METRICS.timed("after.update_ui")
+    def update_ui(self):
+        """Update timer displays for all breaks.
+
+        Only labels whose text changed are reconfigured, and the 1 s tick is
+        not rescheduled while idle, paused, on a break or minimized; control
+        actions, scheduler events and re-showing the window restart it via
+        `request_ui_update`.
+        """
+        self._ui_job = None
+        self.ui_tick_count += 1
+        settings_visible = self._settings_visible()
+
+        for i, seconds in enumerate(self.scheduler.time_left()):
+            time_text = self._format_time(math.ceil(seconds))
             if i < len(self._timer_labels):
-                self._timer_labels[i].configure(text=time_text)
-            # Update settings panel header timer if settings window is open
-            if hasattr(self, '_settings_panels') and i < len(self._settings_panels):
+                self._set_text(self._timer_labels[i], time_text)
+            # Update settings panel timers only while the settings window is shown
+            if settings_visible and i < len(self._settings_panels):
                 try:
-                    self._settings_panels[i].update_header_timer(time_text)
+                    if self._settings_panels[i].show_time(time_text):
+                        self.redraw_count += 1
                 except Exception:
                     pass
 
-            if self.running and not self.paused and config.remaining < min_remaining:
-                min_remaining = config.remaining
-                next_break = config
-
-        if next_break and self.running and not self.active_popup:
-            self.next_break_label.configure(
-                text=f"Next: {next_break.name.get()} in {self._format_time(min_remaining)}"
+        running = self.scheduler.running
+        next_due = self.scheduler.next_due()
+        if next_due and running and not self.scheduler.paused and not self.active_popup:
+            next_break, seconds = next_due
+            self._set_text(
+                self.next_break_label,
+                f"Next: {next_break.spec.name} in {self._format_time(math.ceil(seconds))}"
             )
-        elif not self.running:
-            self.next_break_label.configure(text="")
+        elif not running:
+            self._set_text(self.next_break_label, "")
 
-        self.root.after(1000, self.update_ui)
+        if self._needs_tick():
+            self._ui_job = self.root.after(1000, self.update_ui)
 
     @staticmethod
     def _format_time(seconds):
@@ -1398,60 +2109,71 @@ class BreakApp:
         return f"{m:02}:{s:02}"
 
 
-# ------------------ SINGLE INSTANCE ------------------
+# ------------------ MACOS INTEGRATION ------------------
 
-def is_instance_running():
-    """Check if another instance is already running by examining the lock file."""
-    if not LOCK_FILE.exists():
-        return False
+def set_macos_app_name():
+    """Set the macOS menu bar app name (instead of "Python").
 
+    Must run before the Tk root is created, since that is when the menu bar
+    reads CFBundleName.
+    """
+    if sys.platform != "darwin":
+        return
     try:
-        with open(LOCK_FILE, 'r') as f:
-            pid = int(f.read().strip())
-        # Check if process with this PID is still running
-        os.kill(pid, 0)
-        return True
-    except (ValueError, ProcessLookupError, PermissionError, FileNotFoundError, OSError):
-        # PID invalid, process not running, or file doesn't exist
-        return False
+        import ctypes
+        import ctypes.util
+        objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library('objc'))
 
+        # Setup objc runtime function signatures
+        objc.objc_getClass.restype = ctypes.c_void_p
+        objc.sel_registerName.restype = ctypes.c_void_p
+        objc.objc_msgSend.restype = ctypes.c_void_p
+        objc.objc_msgSend.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
 
-def create_lock_file():
-    """Create lock file with current PID."""
-    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOCK_FILE, 'w') as f:
-        f.write(str(os.getpid()))
+        NSBundle = objc.objc_getClass(b'NSBundle')
+        sel_mainBundle = objc.sel_registerName(b'mainBundle')
+        bundle = objc.objc_msgSend(NSBundle, sel_mainBundle)
 
+        sel_info = objc.sel_registerName(b'localizedInfoDictionary')
+        info = objc.objc_msgSend(bundle, sel_info)
+        if not info:
+            sel_info = objc.sel_registerName(b'infoDictionary')
+            info = objc.objc_msgSend(bundle, sel_info)
 
-def remove_lock_file():
-    """Remove lock file on exit."""
-    try:
-        LOCK_FILE.unlink()
-    except FileNotFoundError:
+        # Set CFBundleName
+        CFStr = ctypes.cdll.LoadLibrary(ctypes.util.find_library('CoreFoundation'))
+        CFStr.CFStringCreateWithCString.restype = ctypes.c_void_p
+        CFStr.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+
+        key = CFStr.CFStringCreateWithCString(None, b'CFBundleName', 0)
+        val = CFStr.CFStringCreateWithCString(None, APP_NAME.encode('utf-8'), 0)
+
+        objc.objc_msgSend.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+        sel_setObject = objc.sel_registerName(b'setObject:forKey:')
+        objc.objc_msgSend(info, sel_setObject, val, key)
+    except Exception:
         pass
 
 
-def check_single_instance():
-    """Check for existing instance and prompt user if found.
+# ------------------ SINGLE INSTANCE ------------------
 
-    Returns True if app should continue, False if it should exit.
-    """
-    if not is_instance_running():
-        return True
+INSTANCE_LOCK = InstanceLock(LOCK_FILE)
 
-    # Show dialog using basic tkinter (before CTk is initialized)
-    temp_root = tk.Tk()
-    temp_root.withdraw()
 
-    result = messagebox.askyesno(
-        "Already Running",
-        "Don't Forget Your Breaks is already running.\n\n"
-        "Do you want to launch another instance anyway?",
-        parent=temp_root
-    )
+def check_single_instance():
+    """Take the single-instance lock, or hand off to the instance holding it.
 
-    temp_root.destroy()
-    return result
+    Returns True if this process holds the lock and should continue, False
+    if another instance is running (it is asked to show its window).
+    """
+    if INSTANCE_LOCK.acquire():
+        return True
+    try:
+        send_command(CONTROL_SOCKET, "show")
+    except ControlError:
+        pid = INSTANCE_LOCK.holder_pid()
+        print(f"{APP_NAME} is already running" + (f" (pid {pid})" if pid else "") + ".", file=sys.stderr)
+    return False
 
 
 # ------------------ MAIN ------------------
@@ -1463,17 +2185,70 @@ def activate_window(root):
     root.focus_force()
 
 
+def watch_first_paint(root):
+    """Report the startup profile once the main window has been drawn."""
+    def on_map(event):
+        if event.widget is root:
+            root.unbind("<Map>", bind_id)
+            root.after_idle(on_painted)
+
+    def on_painted():
+        STARTUP.mark("first paint")
+        STARTUP.report()
+
+    bind_id = root.bind("<Map>", on_map, add="+")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=APP_NAME)
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print a breakdown of startup time to stderr")
+    parser.add_argument("--profile-popups", action="store_true",
+                        help="print each break popup's trigger-to-paint latency to stderr")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect timer and UI latency metrics (read them with the 'metrics' command)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="also serve metrics as JSON at http://127.0.0.1:PORT/metrics (implies --metrics)")
+    parser.add_argument("--policy-dir", type=Path, default=POLICY_DIR,
+                        help=f"directory of centrally managed settings files (default: {POLICY_DIR})")
+    parser.add_argument("command", nargs="?", choices=CONTROL_COMMANDS,
+                        help="send a command to the running instance instead of starting the app")
+    parser.add_argument("argument", nargs="?",
+                        help="command argument (break name for test-break, profile name for profile, "
+                             "file path for metrics and import/export-profiles)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    # Check for existing instance
+    args = parse_args()
+    if args.command:
+        sys.exit(run_command(CONTROL_SOCKET, args.command, args.argument))
+    STARTUP.enabled = args.profile_startup
+    METRICS.enabled = args.metrics or args.metrics_port is not None
+    STARTUP.mark("imports")
+    if args.profile_popups:
+        POPUP_PROFILE_STREAM = sys.stderr
+
+    # Exit if another instance holds the lock; the lock is released when this process exits
     if not check_single_instance():
         sys.exit(0)
+    STARTUP.mark("single-instance check")
+    # Only the instance that holds the lock binds the port; metrics are optional
+    if args.metrics_port is not None:
+        try:
+            METRICS.serve(args.metrics_port)
+        except OSError as e:
+            print(f"Warning: Could not serve metrics on port {args.metrics_port}: {e}")
 
-    # Create lock file and register cleanup
-    create_lock_file()
-    atexit.register(remove_lock_file)
-
+    set_macos_app_name()
+    STARTUP.mark("macOS app name")
+    ACCESSIBILITY.start()
     root = ctk.CTk()
-    app = BreakApp(root)
+    STARTUP.mark("Tk root")
+    if STARTUP.enabled:
+        watch_first_paint(root)
+    app = BreakApp(root, policy_dir=args.policy_dir)
+    STARTUP.mark("window fit")
 
     if sys.platform == "darwin":
         root.after(100, lambda: activate_window(root))
@@ -0,0 +1,215 @@
+"""Opt-in runtime metrics for Don't Forget Your Breaks.
+
+METRICS collects latency histograms (break trigger lateness, Tk callback
+durations, main-thread stalls, popup show latency) and reads counters that
+other modules already keep (sound player spawns, preference writes, UI
+redraws) when a snapshot is taken. Everything is off by default: disabled
+hooks return after a single attribute check.
+
+Snapshots can be written to a JSON file or served as JSON from a local HTTP
+endpoint (127.0.0.1 only):
+
+    python launch.py --metrics --metrics-port 8765
+    curl http://127.0.0.1:8765/metrics
+"""
+
+import bisect
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open-ended)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+WATCHDOG_INTERVAL_MS = 100
+STALL_THRESHOLD_MS = 50  # Heartbeat delay beyond this counts as a main-thread stall
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS + (self.max,), self.counts):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        labels = [f"le_{b}" for b in BUCKETS_MS] + ["inf"]
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max,
+            'buckets': {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class Metrics:
+    """Process-wide metrics registry; a no-op until `enabled` is set."""
+
+    def __init__(self):
+        self.enabled = False
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}  # name -> zero-argument callable read at snapshot time
+        self._lock = threading.Lock()
+        self._server = None
+
+    def observe(self, name, ms):
+        """Add a millisecond observation to histogram `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def increment(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def gauge(self, name, read):
+        """Report `read()` under `name` in every snapshot (e.g. an existing counter)."""
+        self._gauges[name] = read
+
+    def timed(self, name):
+        """Decorator recording each call's duration in histogram `name`."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, (time.perf_counter() - start) * 1e3)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """All metrics as JSON-serializable data."""
+        gauges = {}
+        for name, read in list(self._gauges.items()):
+            try:
+                gauges[name] = read()
+            except Exception:
+                gauges[name] = None
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'time': time.time(),
+                'histograms': {name: h.to_dict() for name, h in sorted(self._histograms.items())},
+                'counters': dict(sorted(self._counters.items())),
+                'gauges': dict(sorted(gauges.items())),
+            }
+
+    # Export
+
+    def write_json(self, path):
+        """Atomically write a snapshot to `path`."""
+        text = json.dumps(self.snapshot(), indent=2)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def serve(self, port):
+        """Serve snapshots at http://127.0.0.1:<port>/metrics from a daemon thread."""
+        # Imported here: only needed when the endpoint is requested
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(metrics.snapshot(), indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+class MainThreadWatchdog:
+    """Detects main-thread stalls from the lateness of a periodic heartbeat.
+
+    `schedule(ms, callback)` must run `callback` on the thread being
+    watched (for Tk, `root.after`). Each beat records how late it ran; beats
+    later than `threshold_ms` count as stalls.
+    """
+
+    def __init__(self, metrics, schedule, interval_ms=WATCHDOG_INTERVAL_MS, threshold_ms=STALL_THRESHOLD_MS):
+        self.metrics = metrics
+        self.schedule = schedule
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self._expected = None
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1e3
+        self.schedule(self.interval_ms, self._beat)
+
+    def _beat(self):
+        now = time.perf_counter()
+        late_ms = max(0.0, (now - self._expected) * 1e3)
+        self.metrics.observe("main_thread.heartbeat_delay", late_ms)
+        if late_ms > self.threshold_ms:
+            self.metrics.increment("main_thread.stalls")
+            self.metrics.observe("main_thread.stall", late_ms)
+        self._expected = now + self.interval_ms / 1e3
+        self.schedule(self.interval_ms, self._beat)
+
+
+METRICS = Metrics()
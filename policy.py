@@ -0,0 +1,298 @@
+"""Centrally managed break policy for Don't Forget Your Breaks.
+
+IT can push settings by dropping JSON files into POLICY_DIR. Each file is
+a partial preferences object, checked like the user's own preferences:
+
+    {"breaks": [{"name": "Micro Break", "interval_val": 20, ...}],
+     "profiles": {"Team standard": {"breaks": [...]}},
+     "locked": ["breaks"]}
+
+The effective settings are the policy files merged in name order, then the
+user's CONFIG_FILE on top, except for keys listed under "locked", which
+the user cannot override. Profiles merge by name. The user's file stores
+only what differs from the policy (see `user_layer`), so a policy update
+reaches everyone who has not changed that setting.
+
+ConfigWatcher notices edits to either layer: with inotify on Linux, and by
+polling modification times elsewhere.
+"""
+
+import json
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+from profiles import sanitize_prefs
+
+if sys.platform == "darwin":
+    POLICY_DIR = Path("/Library/Application Support/DontForgetYourBreaks/policy")
+else:
+    POLICY_DIR = Path("/etc/dont-forget-your-breaks/policy.d")
+
+POLL_INTERVAL = 5.0     # seconds between modification-time checks without inotify
+RELOAD_DEBOUNCE = 0.25  # seconds; changes within this window trigger one reload
+
+MERGED_BY_NAME = ("profiles",)  # Keys whose entries merge one by one instead of replacing
+ANY_JSON = object()  # ConfigWatcher: stands for every .json file in a watched directory
+
+
+# ------------------ LAYERS ------------------
+
+def read_policy(directory=POLICY_DIR):
+    """Merged policy files in `directory`: (settings, locked keys, warnings).
+
+    A missing directory is an empty policy. Files are applied in name
+    order, so `50-team.json` overrides `10-company.json`.
+    """
+    policy, locked, warnings = {}, set(), []
+    try:
+        paths = sorted(Path(directory).glob("*.json"))
+    except OSError:
+        paths = []
+    for path in paths:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            warnings.append(f"{path.name}: could not read policy: {e}")
+            continue
+        if isinstance(data, dict):
+            file_locked = data.pop("locked", [])
+            if isinstance(file_locked, list):
+                locked.update(key for key in file_locked if isinstance(key, str))
+            else:
+                warnings.append(f"{path.name}: locked: must be a list of setting names")
+        data, file_warnings = sanitize_prefs(data)
+        warnings += [f"{path.name}: {warning}" for warning in file_warnings]
+        for key, value in data.items():
+            if key in MERGED_BY_NAME and isinstance(policy.get(key), dict):
+                policy[key] = {**policy[key], **value}
+            else:
+                policy[key] = value
+    return policy, locked, warnings
+
+
+def merge_layers(policy, locked, user):
+    """Effective settings: `user` over `policy`, except for `locked` keys."""
+    merged = dict(policy)
+    for key, value in user.items():
+        if key in locked:
+            continue
+        if key in MERGED_BY_NAME and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def user_layer(prefs, policy, locked):
+    """The part of `prefs` to save for the user: whatever differs from the policy."""
+    layer = {}
+    for key, value in prefs.items():
+        if key in locked:
+            continue
+        if key in MERGED_BY_NAME and isinstance(policy.get(key), dict):
+            value = {name: entry for name, entry in value.items() if policy[key].get(name) != entry}
+            if value:
+                layer[key] = value
+        elif policy.get(key) != value:
+            layer[key] = value
+    return layer
+
+
+# ------------------ WATCHING ------------------
+
+class ConfigWatcher:
+    """Calls `on_change()` from a daemon thread when watched settings are created, edited or removed.
+
+    `files` are watched by name; `directories` for any `*.json` file in
+    them, including directories that only appear later. Changes for which
+    `ignore(path)` is true for every changed path (e.g. the app's own
+    preference writes) are dropped.
+
+    Uses inotify on the parent directories where available (no polling;
+    atomic replaces show up as renames), otherwise compares modification
+    times every `poll_interval` seconds. Bursts of changes within
+    RELOAD_DEBOUNCE cause a single call.
+    """
+
+    def __init__(self, files, directories, on_change, ignore=None, poll_interval=POLL_INTERVAL):
+        self.files = [Path(p) for p in files]
+        self.directories = [Path(p) for p in directories]
+        self.on_change = on_change
+        self.ignore = ignore
+        self.poll_interval = poll_interval
+        self.change_count = 0
+        self.backend = None  # "inotify" or "poll" once started
+        self._stop = threading.Event()
+        self._wake = None  # Pipe used to interrupt the inotify wait on stop()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        inotify = _Inotify.create()
+        self.backend = "inotify" if inotify else "poll"
+        if inotify:
+            self._wake = os.pipe()
+        target = (lambda: self._run_inotify(inotify)) if inotify else self._run_poll
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        wake = self._wake
+        if wake is not None:
+            try:
+                os.write(wake[1], b"x")
+            except OSError:
+                pass  # The watcher already exited and closed the pipe
+
+    def _changed(self, paths):
+        if self.ignore is not None and paths and all(self.ignore(path) for path in paths):
+            return
+        self.change_count += 1
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"Warning: Could not reload settings: {e}")
+
+    # Polling
+
+    def _signature(self):
+        """{path: (modification time, size)} of every watched file and directory entry."""
+        signature = {}
+        for path in self.files:
+            try:
+                st = path.stat()
+                signature[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                signature[path] = None
+        for directory in self.directories:
+            try:
+                for entry in directory.glob("*.json"):
+                    st = entry.stat()
+                    signature[entry] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                signature[directory] = None
+        return signature
+
+    def _run_poll(self):
+        self.backend = "poll"
+        last = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            current = self._signature()
+            if current != last:
+                changed = {path for path in last.keys() | current.keys() if last.get(path) != current.get(path)}
+                last = current
+                self._changed(changed)
+
+    # inotify
+
+    def _run_inotify(self, inotify):
+        try:
+            polling = not self._watch_inotify(inotify)
+        finally:
+            inotify.close()
+            for fd in self._wake:
+                os.close(fd)
+            self._wake = None
+        if polling and not self._stop.is_set():
+            self._run_poll()
+
+    def _watch_inotify(self, inotify):
+        """Wait for inotify events until stopped; False if a watch could not be added."""
+        wanted = {}  # watched directory -> names of interest (ANY_JSON: every .json file)
+        for path in self.files:
+            wanted.setdefault(path.parent, set()).add(path.name)
+        for directory in self.directories:
+            # The parent sees the directory itself appear, vanish or be replaced
+            wanted.setdefault(directory.parent, set()).add(directory.name)
+            wanted.setdefault(directory, set()).add(ANY_JSON)
+        watches = {}  # watch descriptor -> directory
+        for directory in wanted:
+            if directory in self.directories and not directory.is_dir():
+                continue  # Watched once it is created
+            wd = inotify.watch(directory)
+            if wd < 0:
+                return False
+            watches[wd] = directory
+
+        while not self._stop.is_set():
+            readable, _, _ = select.select([inotify.fd, self._wake[0]], [], [])
+            if self._wake[0] in readable:
+                return True
+            changed = set()
+            events = inotify.read()
+            # Let a burst of writes settle, then reload once
+            while select.select([inotify.fd, self._wake[0]], [], [], RELOAD_DEBOUNCE)[0]:
+                if self._stop.is_set():
+                    return True
+                events += inotify.read()
+            for wd, name in events:
+                if wd == -1:  # Queue overflow: events were lost
+                    changed.add(None)
+                    continue
+                directory = watches.get(wd)
+                names = wanted.get(directory, ())
+                if name in names or (ANY_JSON in names and name.endswith(".json")):
+                    changed.add(directory / name)
+            for directory in self.directories:
+                if directory in changed and directory.is_dir():
+                    wd = inotify.watch(directory)
+                    if wd < 0:
+                        return False
+                    watches[wd] = directory
+            if changed:
+                self._changed(changed)
+        return True
+
+
+class _Inotify:
+    """Minimal inotify binding through ctypes (Linux only)."""
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self, libc, fd):
+        self._libc = libc
+        self.fd = fd
+
+    @classmethod
+    def create(cls):
+        if not sys.platform.startswith("linux"):
+            return None
+        import ctypes
+        import ctypes.util
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        return cls(libc, fd) if fd >= 0 else None
+
+    def watch(self, directory):
+        return self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+
+    def read(self):
+        """Pending events as (watch descriptor, file name) pairs."""
+        data = os.read(self.fd, 64 * 1024)
+        events = []
+        offset = 0
+        while offset + self.HEADER.size <= len(data):
+            wd, _, _, length = self.HEADER.unpack_from(data, offset)
+            offset += self.HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            events.append((wd, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
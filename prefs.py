@@ -0,0 +1,112 @@
+"""Write-behind preference storage for Don't Forget Your Breaks."""
+
+import json
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+CONFIG_FILE = Path.home() / "Library" / "Preferences" / "com.yairs.dontforgetyourbreaks.json"
+
+
+class PreferenceStore:
+    """Loads preferences and saves them debounced, atomically and only when changed.
+
+    `save()` only stages a snapshot; the file is written `delay` seconds after
+    the last call, on a background thread, so a burst of edits (typing "120"
+    into a field) costs a single write. Writes go to a temp file in the same
+    directory followed by `os.replace`, and are skipped entirely when the
+    serialized content matches what is already on disk.
+    """
+
+    def __init__(self, path, delay=1.0):
+        self.path = path
+        self.delay = delay
+        self.write_count = 0
+        self.skipped_count = 0
+        self._lock = threading.Lock()  # Guards _pending and _timer
+        self._write_lock = threading.Lock()  # Serializes flushes
+        self._pending = None
+        self._timer = None
+        self._last_written = None  # Serialized content currently on disk
+        self._written_stat = None  # (inode, mtime, size) of the file this store last wrote
+
+    def load(self):
+        """Load preferences from disk, returning {} if missing or unreadable."""
+        try:
+            if self.path.exists():
+                text = self.path.read_text()
+                prefs = json.loads(text)
+                self._last_written = text
+                return prefs
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not load preferences: {e}")
+        return {}
+
+    def is_own_write(self):
+        """Whether the file on disk is still the one this store last wrote."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return False
+        return self._written_stat == (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def save(self, prefs):
+        """Stage `prefs` to be written once changes settle."""
+        with self._lock:
+            self._pending = prefs
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write any staged preferences now.
+
+        Only taking the snapshot holds `_lock`, so `save()` on the UI thread
+        never waits for the disk; `_write_lock` keeps writes in order.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                prefs, self._pending = self._pending, None
+            if prefs is None:
+                return
+            text = json.dumps(prefs, indent=2)
+            if text == self._last_written:
+                self.skipped_count += 1
+                return
+            try:
+                self._write_atomic(text)
+            except (IOError, OSError) as e:
+                print(f"Warning: Could not save preferences: {e}")
+                return
+            self._last_written = text
+            self.write_count += 1
+
+    def _write_atomic(self, text):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                try:  # mkstemp creates 0600; keep the existing file's permissions
+                    os.fchmod(f.fileno(), stat.S_IMODE(self.path.stat().st_mode))
+                except FileNotFoundError:
+                    pass
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+                st = os.fstat(f.fileno())
+            # Recorded before the rename so a watcher woken by it already sees the write as ours
+            self._written_stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,366 @@
+"""Named break profiles for Don't Forget Your Breaks.
+
+A profile is a named list of breaks. Preferences keep every profile under
+"profiles" and the name of the one in use under "active_profile"; "breaks"
+always holds the active profile's breaks as edited.
+
+Profiles are shared as bundles, JSON files holding one or more profiles:
+
+    {"format": "dont-forget-your-breaks/profiles", "version": 1,
+     "profiles": {"Team standard": {"breaks": [{"name": "Micro Break", ...}]}}}
+
+Everything read from disk is checked against the schema below in a single
+pass. Errors name the offending field and say what was expected, e.g.
+`profiles["Team"].breaks[1].interval_unit: must be one of sec, min, hour (got "mins")`.
+
+Usage: python profiles.py {list,validate,import,export} ...
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from control import CONTROL_SOCKET, ControlError, send_command
+from prefs import CONFIG_FILE, PreferenceStore
+from scheduler import DEFAULT_BREAKS, TIME_UNIT_SECONDS, BreakSpec
+from sound import SOUNDS
+
+BUNDLE_FORMAT = "dont-forget-your-breaks/profiles"
+BUNDLE_VERSION = 1
+DEFAULT_PROFILE = "Default"
+MAX_BREAKS = 100
+MAX_NAME_LENGTH = 64
+
+
+class ProfileError(ValueError):
+    """A profile, bundle or preferences file does not match the schema; `errors` lists every problem."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("\n".join(errors))
+
+
+# ------------------ SCHEMA ------------------
+
+def _name(value):
+    if not isinstance(value, str) or not value.strip():
+        return "must be a non-empty string"
+    if len(value) > MAX_NAME_LENGTH:
+        return f"must be at most {MAX_NAME_LENGTH} characters"
+
+
+def _count(value):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        return "must be a whole number of at least 1"
+
+
+def _choice(choices):
+    def check(value):
+        if value not in choices:
+            return f"must be one of {', '.join(choices)}"
+    return check
+
+
+def _flag(value):
+    if not isinstance(value, bool):
+        return "must be true or false"
+
+
+# Break fields: (check, default); fields without a default are required
+BREAK_SCHEMA = {
+    "name": (_name, None),
+    "interval_val": (_count, None),
+    "interval_unit": (_choice(list(TIME_UNIT_SECONDS)), None),
+    "duration_val": (_count, None),
+    "duration_unit": (_choice(list(TIME_UNIT_SECONDS)), None),
+    "start_sound": (_choice(list(SOUNDS)), "None"),
+    "end_sound": (_choice(list(SOUNDS)), "None"),
+    "loop_end_sound": (_flag, False),
+    "auto_dismiss": (_flag, True),
+}
+
+# Other preferences and the types they must have; anything else is left alone
+PREFS_TYPES = {
+    "active_profile": str,
+    "always_on_top": bool,
+    "idle_detection": bool,
+    "sleep_policy": str,
+    "window_geometry": str,
+    "quiet_hours": list,
+    "calendars": list,
+}
+
+
+def _unknown(key, known):
+    import difflib  # Only needed to report a mistake
+    hint = difflib.get_close_matches(key, known, n=1)
+    return f"unknown field {key!r}" + (f" (did you mean {hint[0]!r}?)" if hint else "")
+
+
+def check_break(data, path, errors, defaults=None):
+    """Validate one break; returns a BreakSpec, or None after appending to `errors`.
+
+    `defaults` (used for saved preferences) fills fields the entry leaves
+    out and replaces invalid ones, which are then reported but not fatal.
+    """
+    if not isinstance(data, dict):
+        errors.append(f"{path}: must be an object with {', '.join(BREAK_SCHEMA)}")
+        return None
+    failed = False
+    fields = {}
+    for key, (check, default) in BREAK_SCHEMA.items():
+        if key in data:
+            value = data[key]
+        elif defaults is not None and key in defaults:
+            value = defaults[key]
+        elif default is not None:
+            value = default
+        else:
+            errors.append(f"{path}.{key}: required")
+            failed = True
+            continue
+        problem = check(value)
+        if problem and defaults is not None and key in defaults:
+            errors.append(f"{path}.{key}: {problem} (got {json.dumps(value)}); using {json.dumps(defaults[key])}")
+            value = defaults[key]
+        elif problem:
+            errors.append(f"{path}.{key}: {problem} (got {json.dumps(value)})")
+            failed = True
+        fields[key] = value
+    for key in data:
+        if key not in BREAK_SCHEMA:
+            errors.append(f"{path}: {_unknown(key, BREAK_SCHEMA)}")
+            failed = failed or defaults is None
+    if failed:
+        return None
+    return BreakSpec(**fields)
+
+
+def check_breaks(data, path, errors, fill_defaults=False):
+    """Validate a list of breaks with unique names; returns BreakSpecs, or None on errors."""
+    if not isinstance(data, list) or not data:
+        errors.append(f"{path}: must be a non-empty list of breaks")
+        return None
+    if len(data) > MAX_BREAKS:
+        errors.append(f"{path}: at most {MAX_BREAKS} breaks are allowed (got {len(data)})")
+        return None
+    failed = False
+    specs = []
+    seen = set()
+    for i, entry in enumerate(data):
+        defaults = DEFAULT_BREAKS[min(i, len(DEFAULT_BREAKS) - 1)] if fill_defaults else None
+        spec = check_break(entry, f"{path}[{i}]", errors, defaults)
+        if spec is None:
+            failed = True
+            continue
+        if spec.name in seen:
+            errors.append(f"{path}[{i}].name: duplicate break name {spec.name!r}")
+            failed = True
+        seen.add(spec.name)
+        specs.append(spec)
+    return None if failed else specs
+
+
+def check_profiles(data, path, errors):
+    """Validate a {name: {"breaks": [...]}} mapping; returns {name: [BreakSpec]} of the valid ones."""
+    if not isinstance(data, dict):
+        errors.append(f"{path}: must be an object mapping profile names to profiles")
+        return {}
+    profiles = {}
+    for name, profile in data.items():
+        where = f"{path}[{json.dumps(name)}]"
+        problem = _name(name)
+        if problem:
+            errors.append(f"{where}: profile name {problem}")
+            continue
+        if not isinstance(profile, dict) or "breaks" not in profile:
+            errors.append(f"{where}: must be an object with a \"breaks\" list")
+            continue
+        for key in profile:
+            if key != "breaks":
+                errors.append(f"{where}: {_unknown(key, ['breaks'])}")
+        specs = check_breaks(profile["breaks"], f"{where}.breaks", errors)
+        if specs is not None:
+            profiles[name] = specs
+    return profiles
+
+
+def validate_bundle(data):
+    """Profiles in a bundle as {name: [BreakSpec]}; raises ProfileError listing every problem."""
+    errors = []
+    if not isinstance(data, dict):
+        raise ProfileError(["bundle: must be a JSON object"])
+    if data.get("format") != BUNDLE_FORMAT:
+        errors.append(f"format: must be {json.dumps(BUNDLE_FORMAT)} (got {json.dumps(data.get('format'))})")
+    if data.get("version") != BUNDLE_VERSION:
+        errors.append(f"version: must be {BUNDLE_VERSION} (got {json.dumps(data.get('version'))})")
+    for key in data:
+        if key not in ("format", "version", "profiles"):
+            errors.append(f"bundle: {_unknown(key, ['format', 'version', 'profiles'])}")
+    profiles = check_profiles(data.get("profiles"), "profiles", errors)
+    if not profiles and not errors:
+        errors.append("profiles: must contain at least one profile")
+    if errors:
+        raise ProfileError(errors)
+    return profiles
+
+
+def sanitize_prefs(prefs):
+    """Saved preferences with invalid entries dropped, plus warnings describing them.
+
+    Dropped settings fall back to their defaults, so a damaged or
+    hand-edited file never stops the app from starting.
+    """
+    if not isinstance(prefs, dict):
+        return {}, ["preferences: must be a JSON object; using defaults"]
+    errors = []
+    clean = dict(prefs)
+    for key, expected in PREFS_TYPES.items():
+        if key in clean and not isinstance(clean[key], expected):
+            errors.append(f"{key}: must be {expected.__name__} (got {json.dumps(clean[key])}); using default")
+            del clean[key]
+    if "breaks" in clean:
+        specs = check_breaks(clean["breaks"], "breaks", errors, fill_defaults=True)
+        if specs is None:
+            del clean["breaks"]
+        else:
+            clean["breaks"] = [spec.to_dict() for spec in specs]
+    if "profiles" in clean:
+        clean["profiles"] = {name: {"breaks": [spec.to_dict() for spec in specs]}
+                             for name, specs in check_profiles(clean["profiles"], "profiles", errors).items()}
+    return clean, errors
+
+
+# ------------------ BUNDLES ------------------
+
+def make_bundle(profiles):
+    """Bundle data for {name: [BreakSpec]}."""
+    return {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "profiles": {name: {"breaks": [spec.to_dict() for spec in specs]} for name, specs in profiles.items()},
+    }
+
+
+def read_bundle(path):
+    """Validated profiles from the bundle at `path`; raises ProfileError (or OSError)."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except ValueError as e:
+        raise ProfileError([f"{path}: not valid JSON: {e}"]) from e
+    return validate_bundle(data)
+
+
+def write_bundle(path, profiles):
+    """Atomically write {name: [BreakSpec]} as a bundle."""
+    path = Path(path)
+    text = json.dumps(make_bundle(profiles), indent=2)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def saved_profiles(prefs):
+    """{name: [BreakSpec]} of sanitized preferences, with the active one as currently edited."""
+    profiles = {name: [BreakSpec(**b) for b in profile["breaks"]]
+                for name, profile in prefs.get("profiles", {}).items()}
+    if "breaks" in prefs:
+        profiles[prefs.get("active_profile", DEFAULT_PROFILE)] = [BreakSpec(**b) for b in prefs["breaks"]]
+    return profiles
+
+
+# ------------------ CLI ------------------
+
+def _load_prefs(path):
+    try:
+        prefs = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    prefs, warnings = sanitize_prefs(prefs)
+    for warning in warnings:
+        print(f"Warning: {warning}", file=sys.stderr)
+    return prefs
+
+
+def _import_into_prefs(path, profiles):
+    """Merge profiles into a preferences file directly (when the app is not running)."""
+    prefs = _load_prefs(path)
+    stored = prefs.setdefault("profiles", {})
+    for name, specs in profiles.items():
+        stored[name] = {"breaks": [spec.to_dict() for spec in specs]}
+    if prefs.get("active_profile", DEFAULT_PROFILE) in profiles:
+        prefs["breaks"] = stored[prefs.get("active_profile", DEFAULT_PROFILE)]["breaks"]
+    store = PreferenceStore(path)
+    store.save(prefs)
+    store.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage break profiles and profile bundles.")
+    parser.add_argument("--prefs", type=Path, default=CONFIG_FILE, help=f"preferences file (default: {CONFIG_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list saved profiles")
+    validate = commands.add_parser("validate", help="check bundles without importing them")
+    validate.add_argument("bundles", nargs="+", type=Path)
+    import_ = commands.add_parser("import", help="add or replace profiles from a bundle")
+    import_.add_argument("bundle", type=Path)
+    export = commands.add_parser("export", help="write saved profiles to a bundle")
+    export.add_argument("bundle", type=Path)
+    export.add_argument("names", nargs="*", help="profiles to export (default: all)")
+    args = parser.parse_args(argv)
+
+    if args.command == "validate":
+        failed = 0
+        for path in args.bundles:
+            try:
+                profiles = read_bundle(path)
+            except (ProfileError, OSError) as e:
+                print(f"{path}: invalid\n  " + str(e).replace("\n", "\n  "))
+                failed += 1
+            else:
+                print(f"{path}: ok ({', '.join(profiles)})")
+        return 1 if failed else 0
+
+    if args.command == "import":
+        try:
+            profiles = read_bundle(args.bundle)
+        except (ProfileError, OSError) as e:
+            print(f"{args.bundle}: {e}", file=sys.stderr)
+            return 1
+        try:
+            # Through the running app, so its next save does not overwrite the import
+            print(json.dumps(send_command(CONTROL_SOCKET, "import-profiles", str(args.bundle.resolve()))))
+        except ControlError:
+            _import_into_prefs(args.prefs, profiles)
+            print(f"Imported {', '.join(profiles)}")
+        return 0
+
+    prefs = _load_prefs(args.prefs)
+    profiles = saved_profiles(prefs)
+    if args.command == "list":
+        active = prefs.get("active_profile", DEFAULT_PROFILE)
+        for name, specs in profiles.items():
+            print(f"{'*' if name == active else ' '} {name} ({len(specs)} breaks)")
+        return 0
+
+    missing = [name for name in args.names if name not in profiles]
+    if missing:
+        print(f"Unknown profile(s): {', '.join(missing)}", file=sys.stderr)
+        return 1
+    write_bundle(args.bundle, {name: profiles[name] for name in args.names or profiles})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+"""Quiet hours for Don't Forget Your Breaks.
+
+A QuietSchedule holds busy periods during which no break popup should
+appear: events from local `.ics` calendar files and recurring rules from
+preferences, e.g.
+
+    "quiet_hours": [{"days": ["mon", "wed"], "start": "10:00", "end": "10:30"}],
+    "calendars": ["~/Calendars/work.ics"]
+
+Nothing is expanded up front. The first lookup in a week expands that
+week's occurrences (recurring events are generated only for the dates in
+it, one-off events are sliced from a sorted list by binary search) and
+merges them into sorted, non-overlapping intervals, which are cached per
+week. A lookup is then a binary search, O(log n) in the week's busy
+periods, however large the calendar.
+
+Usage: python quiet.py [--rules PREFS_JSON] [CALENDAR.ics ...] [--days 7]
+"""
+
+import argparse
+import bisect
+import json
+import re
+import sys
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+
+WEEK = 7 * 24 * 3600
+WEEK_ORIGIN = 4 * 24 * 3600  # Monday 1970-01-05 00:00 UTC; weeks are cache buckets only
+WEEK_CACHE_SIZE = 8          # expanded weeks kept
+SEARCH_LIMIT = 14 * 24 * 3600  # longest a break is pushed back, in seconds
+
+WEEKDAYS = ("mo", "tu", "we", "th", "fr", "sa", "su")
+RULE_ORIGIN = date(2000, 1, 3)  # A Monday; recurring rules start here
+
+
+# ------------------ RECURRENCE ------------------
+
+class Recurrence:
+    """A repeating busy period: the RRULE subset calendars use for meetings.
+
+    FREQ=DAILY, WEEKLY (with BYDAY), MONTHLY and YEARLY, with INTERVAL,
+    COUNT, UNTIL and EXDATE. Occurrences are computed per date, so
+    expanding any window costs the number of days in it, not the number of
+    occurrences since the series began.
+    """
+
+    __slots__ = ("start", "length", "freq", "interval", "byday", "count", "until", "exdates")
+
+    def __init__(self, start, length, freq="WEEKLY", interval=1, byday=None, count=None,
+                 until=None, exdates=()):
+        self.start = start      # datetime of the first occurrence (naive means local time)
+        self.length = length    # timedelta
+        self.freq = freq
+        self.interval = max(1, interval)
+        self.byday = sorted(byday) if byday else [start.weekday()]
+        self.count = count
+        self.until = until      # epoch seconds, or None
+        self.exdates = set(exdates)  # epoch seconds of cancelled occurrences
+
+    def _index(self, day):
+        """Occurrence number falling on `day`, or None if none does."""
+        first = self.start.date()
+        days = (day - first).days
+        if days < 0:
+            return None
+        if self.freq == "DAILY":
+            return days // self.interval if days % self.interval == 0 else None
+        if self.freq == "WEEKLY":
+            if day.weekday() not in self.byday:
+                return None
+            weeks = (days + first.weekday() - day.weekday()) // 7
+            if weeks % self.interval:
+                return None
+            skipped = sum(1 for d in self.byday if d < first.weekday())  # Before the series began
+            return (weeks // self.interval) * len(self.byday) + self.byday.index(day.weekday()) - skipped
+        if self.freq == "MONTHLY":
+            months = (day.year - first.year) * 12 + day.month - first.month
+            if day.day != first.day or months % self.interval:
+                return None
+            return months // self.interval
+        if self.freq == "YEARLY":
+            years = day.year - first.year
+            if (day.month, day.day) != (first.month, first.day) or years % self.interval:
+                return None
+            return years // self.interval
+        return 0 if days == 0 else None  # Unsupported rule: the first occurrence only
+
+    def occurrences(self, window_start, window_end):
+        """Yield `(start, end)` epoch seconds of occurrences overlapping the window."""
+        first_day = datetime.fromtimestamp(window_start - self.length.total_seconds()).date() - timedelta(days=1)
+        last_day = datetime.fromtimestamp(window_end).date() + timedelta(days=1)
+        day = first_day
+        while day <= last_day:
+            index = self._index(day)
+            if index is not None and (self.count is None or index < self.count):
+                begin = datetime.combine(day, self.start.timetz()).timestamp()
+                if self.until is not None and begin > self.until:
+                    return
+                end = begin + self.length.total_seconds()
+                if begin not in self.exdates and end > window_start and begin < window_end:
+                    yield begin, end
+            day += timedelta(days=1)
+
+
+def rule_recurrence(rule):
+    """Recurrence for a preferences rule: {"days": [...], "start": "HH:MM", "end": "HH:MM"}.
+
+    `days` defaults to every day; an end before the start runs past midnight.
+    """
+    try:
+        start = dt_time.fromisoformat(rule["start"])
+        end = dt_time.fromisoformat(rule["end"])
+        days = [WEEKDAYS.index(d.strip().lower()[:2]) for d in rule.get("days", WEEKDAYS)]
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise ValueError(f"invalid quiet hours rule {rule!r}: expected days, start and end "
+                         f"like {{\"days\": [\"mon\"], \"start\": \"12:00\", \"end\": \"13:00\"}}") from e
+    first = datetime.combine(RULE_ORIGIN, start)
+    length = datetime.combine(RULE_ORIGIN, end) - first
+    if length <= timedelta(0):
+        length += timedelta(days=1)
+    return Recurrence(first, length, "WEEKLY", byday=days)
+
+
+# ------------------ ICS ------------------
+
+_DURATION = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+def _unfold(text):
+    """Content lines with RFC 5545 line folding undone."""
+    lines = []
+    for line in text.splitlines():
+        if line[:1] in (" ", "\t") and lines:
+            lines[-1] += line[1:]
+        elif line:
+            lines.append(line)
+    return lines
+
+
+def _property(line):
+    """Split `NAME;PARAM=x:value` into (name, params, value)."""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.partition("=")[::2] for p in params), value
+
+
+def _zone(tzid):
+    if not tzid:
+        return None
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(tzid.strip('"'))
+    except Exception:
+        return None  # Unknown zone: treat as local time
+
+
+def _parse_datetime(value, params):
+    """datetime for a DTSTART/DTEND/EXDATE value, or a date for an all-day value."""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").date()
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    return datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=_zone(params.get("TZID")))
+
+
+def _parse_duration(value):
+    match = _DURATION.match(value.strip())
+    if not match:
+        raise ValueError(f"bad duration {value!r}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    length = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                       minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -length if sign == "-" else length
+
+
+def _parse_rrule(value, start):
+    parts = dict(p.partition("=")[::2] for p in value.upper().split(";"))
+    until = None
+    if "UNTIL" in parts:
+        until_value = _parse_datetime(parts["UNTIL"], {})
+        if not isinstance(until_value, datetime):
+            until_value = datetime.combine(until_value, dt_time.max)
+        until = until_value.timestamp()
+    freq = parts.get("FREQ", "WEEKLY")
+    byday = None
+    if "BYDAY" in parts:
+        if freq not in ("DAILY", "WEEKLY"):
+            freq = "UNSUPPORTED"  # e.g. "second Tuesday of the month"
+        byday = [WEEKDAYS.index(d[-2:].lower()) for d in parts["BYDAY"].split(",")]
+    return Recurrence(start, timedelta(0), freq, int(parts.get("INTERVAL", 1)),
+                      byday, int(parts["COUNT"]) if "COUNT" in parts else None, until)
+
+
+def parse_ics(text):
+    """Busy periods in an iCalendar file: (one-off `(start, end, summary)` tuples, recurrences).
+
+    Free (TRANSP:TRANSPARENT), cancelled and all-day events are left out:
+    all-day events mark days (holidays, birthdays), not meetings. Events
+    that cannot be parsed are skipped.
+    """
+    events, recurrences = [], []
+    props = None
+    for line in _unfold(text):
+        name, params, value = _property(line)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            props = []
+        elif name == "END" and value.upper() == "VEVENT" and props is not None:
+            try:
+                _add_event(props, events, recurrences)
+            except (ValueError, KeyError, IndexError):
+                pass
+            props = None
+        elif props is not None:
+            props.append((name, params, value))
+    return events, recurrences
+
+
+def _add_event(props, events, recurrences):
+    fields = {}
+    exdates = []
+    for name, params, value in props:
+        if name == "EXDATE":
+            exdates += [_parse_datetime(v, params) for v in value.split(",")]
+        else:
+            fields.setdefault(name, (params, value))
+    if fields.get("TRANSP", ({}, ""))[1].upper() == "TRANSPARENT":
+        return
+    if fields.get("STATUS", ({}, ""))[1].upper() == "CANCELLED":
+        return
+    start = _parse_datetime(fields["DTSTART"][1], fields["DTSTART"][0])
+    if not isinstance(start, datetime):
+        return  # All-day
+    if "DTEND" in fields:
+        length = _parse_datetime(fields["DTEND"][1], fields["DTEND"][0]) - start
+    elif "DURATION" in fields:
+        length = _parse_duration(fields["DURATION"][1])
+    else:
+        return  # Zero-length: nothing to be quiet for
+    if length <= timedelta(0):
+        return
+    summary = fields.get("SUMMARY", ({}, ""))[1]
+    if "RRULE" in fields:
+        recurrence = _parse_rrule(fields["RRULE"][1], start)
+        recurrence.length = length
+        recurrence.exdates = {d.timestamp() for d in exdates if isinstance(d, datetime)}
+        recurrences.append(recurrence)
+    else:
+        begin = start.timestamp()
+        events.append((begin, begin + length.total_seconds(), summary))
+
+
+# ------------------ SCHEDULE ------------------
+
+class QuietSchedule:
+    """Busy periods with lazy, per-week expansion and O(log n) lookups."""
+
+    def __init__(self, events=(), recurrences=()):
+        self._events = sorted(events)
+        self._event_starts = [e[0] for e in self._events]
+        self._longest = max((e[1] - e[0] for e in self._events), default=0)
+        self._recurrences = list(recurrences)
+        self._weeks = {}  # week number -> (starts, ends) of merged busy periods
+        self.expanded_weeks = 0  # Weeks expanded so far (cache misses)
+
+    def __bool__(self):
+        return bool(self._events or self._recurrences)
+
+    def _week(self, number):
+        cached = self._weeks.get(number)
+        if cached is not None:
+            return cached
+        window_start = WEEK_ORIGIN + number * WEEK
+        window_end = window_start + WEEK
+
+        # One-off events: binary search for those that can overlap the week
+        lo = bisect.bisect_left(self._event_starts, window_start - self._longest)
+        hi = bisect.bisect_left(self._event_starts, window_end)
+        spans = [(s, e) for s, e, _ in self._events[lo:hi] if e > window_start]
+        for recurrence in self._recurrences:
+            spans.extend(recurrence.occurrences(window_start, window_end))
+        spans.sort()
+
+        starts, ends = [], []
+        for s, e in spans:
+            if ends and s <= ends[-1]:
+                ends[-1] = max(ends[-1], e)
+            else:
+                starts.append(s)
+                ends.append(e)
+
+        if len(self._weeks) >= WEEK_CACHE_SIZE:
+            del self._weeks[next(iter(self._weeks))]  # Oldest expanded
+        self._weeks[number] = cached = (starts, ends)
+        self.expanded_weeks += 1
+        return cached
+
+    def busy_until(self, when):
+        """End of the busy period containing epoch time `when`, or None if free."""
+        starts, ends = self._week(int((when - WEEK_ORIGIN) // WEEK))
+        i = bisect.bisect_right(starts, when) - 1
+        if i >= 0 and ends[i] > when:
+            return ends[i]
+        return None
+
+    def free_at(self, when):
+        """Earliest epoch time at or after `when` outside every busy period.
+
+        Back-to-back periods (including ones across a week boundary) are
+        followed through, up to SEARCH_LIMIT.
+        """
+        limit = when + SEARCH_LIMIT
+        while when < limit:
+            end = self.busy_until(when)
+            if end is None:
+                return when
+            when = end
+        return limit
+
+    def busy_periods(self, start, end):
+        """Merged `(start, end)` busy periods overlapping `start` to `end` (epoch seconds)."""
+        periods = []
+        number = int((start - WEEK_ORIGIN) // WEEK)
+        while WEEK_ORIGIN + number * WEEK < end:
+            for s, e in zip(*self._week(number)):
+                if e > start and s < end:
+                    if periods and s <= periods[-1][1]:
+                        periods[-1] = (periods[-1][0], max(periods[-1][1], e))
+                    else:
+                        periods.append((s, e))
+            number += 1
+        return periods
+
+
+def load_quiet_schedule(rules=(), calendars=()):
+    """QuietSchedule from preferences rules and `.ics` files; bad entries are reported and skipped."""
+    events, recurrences = [], []
+    for rule in rules:
+        try:
+            recurrences.append(rule_recurrence(rule))
+        except ValueError as e:
+            print(f"Warning: {e}")
+    for calendar in calendars:
+        path = Path(calendar).expanduser()
+        try:
+            calendar_events, calendar_recurrences = parse_ics(path.read_text(encoding="utf-8", errors="replace"))
+        except OSError as e:
+            print(f"Warning: Could not read calendar {path}: {e}")
+            continue
+        events += calendar_events
+        recurrences += calendar_recurrences
+    return QuietSchedule(events, recurrences)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List upcoming quiet hours (busy periods).")
+    parser.add_argument("calendars", nargs="*", type=Path, help=".ics files to read")
+    parser.add_argument("--rules", type=Path, help="preferences JSON with a quiet_hours list (and calendars)")
+    parser.add_argument("--days", type=int, default=7, help="days ahead to list (default: 7)")
+    args = parser.parse_args(argv)
+
+    rules, calendars = [], list(args.calendars)
+    if args.rules:
+        with open(args.rules, 'r') as f:
+            prefs = json.load(f)
+        rules = prefs.get("quiet_hours", [])
+        calendars += prefs.get("calendars", [])
+    schedule = load_quiet_schedule(rules, calendars)
+    now = datetime.now().timestamp()
+    for s, e in schedule.busy_periods(now, now + args.days * 24 * 3600):
+        print(f"{datetime.fromtimestamp(s):%a %Y-%m-%d %H:%M} - {datetime.fromtimestamp(e):%H:%M}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,856 @@
+"""Break scheduling engine for Don't Forget Your Breaks.
+
+Pure Python with no Tk dependency, so it can run headless
+(`python scheduler.py`) or drive the CustomTkinter app in launch.py.
+"""
+
+import argparse
+import functools
+import heapq
+import itertools
+import json
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+
+# ------------------ BREAK INDEX ------------------
+
+class BreakIndex:
+    """Min-heap of break deadlines with lazy invalidation.
+
+    Re-scheduling a break pushes a fresh entry instead of searching the heap;
+    superseded entries are dropped when they surface at the top. Next-due
+    lookup and re-arming are O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._live = {}  # item -> sequence number of its current entry
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, item):
+        return item in self._live
+
+    def schedule(self, item, deadline):
+        """Set (or move) the deadline of `item`."""
+        seq = next(self._seq)
+        self._live[item] = seq
+        heapq.heappush(self._heap, (deadline, seq, item))
+        if len(self._heap) > 2 * len(self._live) + 16:
+            self._compact()
+
+    def discard(self, item):
+        """Remove `item` from the index if present."""
+        self._live.pop(item, None)
+
+    def clear(self):
+        self._heap.clear()
+        self._live.clear()
+
+    def rebuild(self, entries):
+        """Replace the index contents with `(item, deadline)` pairs in O(n)."""
+        self.clear()
+        for item, deadline in entries:
+            seq = next(self._seq)
+            self._live[item] = seq
+            self._heap.append((deadline, seq, item))
+        heapq.heapify(self._heap)
+
+    def peek(self):
+        """Return `(deadline, item)` for the earliest break, or None."""
+        heap = self._heap
+        while heap:
+            deadline, seq, item = heap[0]
+            if self._live.get(item) == seq:
+                return deadline, item
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now):
+        """Remove and return every item whose deadline is at or before `now`."""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, seq, item = heapq.heappop(heap)
+            if self._live.get(item) == seq:
+                del self._live[item]
+                due.append(item)
+        return due
+
+    def _compact(self):
+        """Drop superseded entries once they outnumber live ones."""
+        self._heap = [e for e in self._heap if self._live.get(e[2]) == e[1]]
+        heapq.heapify(self._heap)
+
+
+# ------------------ BREAK CONFIG ------------------
+
+TIME_UNIT_SECONDS = {"sec": 1, "min": 60, "hour": 3600}
+
+# Default break configurations
+DEFAULT_BREAKS = [
+    {"name": "Micro Break", "interval_val": 25, "interval_unit": "min",
+     "duration_val": 5, "duration_unit": "sec", "start_sound": "Ping",
+     "end_sound": "Glass", "loop_end_sound": False, "auto_dismiss": True},
+    {"name": "Normal Break", "interval_val": 50, "interval_unit": "min",
+     "duration_val": 10, "duration_unit": "min", "start_sound": "Glass",
+     "end_sound": "Submarine", "loop_end_sound": True, "auto_dismiss": False}
+]
+
+
+def _safe_int(value, fallback=1):
+    """Safely parse a value to int, returning fallback for empty/invalid values."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return fallback
+
+
+@dataclass(frozen=True, slots=True)
+class BreakSpec:
+    """Immutable settings for one break type.
+
+    Interval and duration are parsed to seconds once, at construction; edits
+    build a new spec with `replace()`.
+    """
+
+    name: str
+    interval_val: int
+    interval_unit: str
+    duration_val: int
+    duration_unit: str
+    start_sound: str
+    end_sound: str
+    loop_end_sound: bool = False
+    auto_dismiss: bool = True
+    interval_seconds: int = field(init=False, repr=False, compare=False)
+    duration_seconds: int = field(init=False, repr=False, compare=False)
+
+    FIELDS = ("name", "interval_val", "interval_unit", "duration_val", "duration_unit",
+              "start_sound", "end_sound", "loop_end_sound", "auto_dismiss")
+
+    def __post_init__(self):
+        set_field = object.__setattr__
+        set_field(self, "interval_val", _safe_int(self.interval_val))
+        set_field(self, "duration_val", _safe_int(self.duration_val))
+        # At least a second each: a zero interval would re-arm as due forever
+        set_field(self, "interval_seconds",
+                  max(1, self.interval_val * TIME_UNIT_SECONDS.get(self.interval_unit, 3600)))
+        set_field(self, "duration_seconds",
+                  max(1, self.duration_val * TIME_UNIT_SECONDS.get(self.duration_unit, 3600)))
+
+    def replace(self, **changes):
+        """Return a copy with `changes` applied."""
+        return replace(self, **changes)
+
+    def to_dict(self):
+        """Serializable form used for preferences."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class BreakTimer:
+    """Countdown state for one break; `spec` is swapped wholesale on edit."""
+
+    __slots__ = ("spec", "remaining", "deadline")
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.remaining = spec.interval_seconds
+        self.deadline = None  # Monotonic due time while counting down
+
+    def reset_timer(self, now):
+        """Reset remaining time to interval, re-arming the deadline if counting down."""
+        self.remaining = self.spec.interval_seconds
+        if self.deadline is not None:
+            self.deadline = now + self.remaining
+
+    def arm(self, now):
+        """Start counting down the remaining time from `now`."""
+        if self.deadline is None:
+            self.deadline = now + self.remaining
+
+    def freeze(self, now):
+        """Stop counting down, keeping the time that is left."""
+        if self.deadline is not None:
+            self.remaining = max(0, self.deadline - now)
+            self.deadline = None
+
+    def seconds_left(self, now):
+        """Seconds until this break is due."""
+        if self.deadline is None:
+            return self.remaining
+        return max(0, self.deadline - now)
+
+
+def breaks_from_prefs(prefs):
+    """Build BreakSpecs from saved preferences, filling gaps from DEFAULT_BREAKS.
+
+    Saved breaks beyond the defaults (from a profile with more breaks) take
+    their missing fields from the last default.
+    """
+    saved = prefs.get("breaks") or [{}] * len(DEFAULT_BREAKS)
+    breaks = []
+    for i, break_prefs in enumerate(saved):
+        default = DEFAULT_BREAKS[min(i, len(DEFAULT_BREAKS) - 1)]
+        breaks.append(BreakSpec(**{key: break_prefs.get(key, value) for key, value in default.items()}))
+    return breaks
+
+
+# ------------------ CLOCKS ------------------
+
+class VirtualClock:
+    """Manually advanced clock for simulations; a drop-in for `time.monotonic`."""
+
+    def __init__(self, start=0.0):
+        self._now = start
+
+    def __call__(self):
+        return self._now
+
+    def set(self, now):
+        if now < self._now:
+            raise ValueError("VirtualClock cannot go backwards")
+        self._now = now
+
+    def advance(self, seconds):
+        self.set(self._now + seconds)
+
+
+def sleep_clock():
+    """A clock that keeps counting through system sleep, or None if there is none.
+
+    `time.monotonic` stops while the machine is suspended (on Linux and
+    macOS); comparing it with this clock measures how long the machine
+    slept. Neither clock moves when the wall clock is changed.
+    """
+    if hasattr(time, "CLOCK_BOOTTIME"):  # Linux
+        return functools.partial(time.clock_gettime, time.CLOCK_BOOTTIME)
+    if sys.platform == "darwin":  # CLOCK_MONOTONIC includes sleep on macOS, unlike time.monotonic
+        return functools.partial(time.clock_gettime, time.CLOCK_MONOTONIC)
+    return None  # Windows: time.monotonic already counts sleep
+
+
+# ------------------ SCHEDULER ------------------
+
+# What a system sleep means for the break timers
+SLEEP_POLICIES = {
+    "break": "Counts as a break",          # Breaks no longer than the sleep restart their interval
+    "resume": "Resumes where it left off",  # Timers continue as if the sleep never happened
+    "elapse": "Counts as working time",     # Timers run on; overdue breaks fire once on wake
+}
+SLEEP_THRESHOLD = 5         # seconds of clock divergence that count as a sleep
+SLEEP_CHECK_INTERVAL = 30   # seconds; longest timer-thread wait when watching for sleep
+
+class BreakScheduler:
+    """Headless break scheduler owning timers, the break queue, snooze and pause.
+
+    A single daemon thread sleeps until the earliest break or snooze deadline.
+    Front ends subscribe with `subscribe(listener)`; listeners are called as
+    `listener(event, data)` on whichever thread produced the event, so a Tk
+    subscriber must hop to the main thread itself.
+
+    Events: "started", "paused", "resumed", "reset", "break_queued",
+    "breaks_coalesced", "break_skipped", "break_started", "break_ended",
+    "break_snoozed", "breaks_deferred", "breaks_changed", "idle_started",
+    "idle_ended", "slept".
+
+    `clock` is any zero-argument callable returning monotonic seconds. With
+    `threaded=False` no timer thread is started and the caller drives the
+    scheduler by advancing the clock and calling `run_due()`, which is how
+    simulator.py replays long horizons without waiting.
+
+    If `sleep_clock` is given (see `sleep_clock()`), time it gains on
+    `clock` is a system sleep, handled according to `sleep_policy` (one of
+    SLEEP_POLICIES) in a single pass over the breaks.
+
+    Breaks and snoozes falling due inside a quiet period (`quiet`, a
+    quiet.QuietSchedule looked up by `wall_clock` time) are pushed back to
+    its end instead of firing.
+    """
+
+    def __init__(self, specs, clock=time.monotonic, threaded=True, sleep_clock=None, sleep_policy="break",
+                 quiet=None, wall_clock=time.time):
+        self.breaks = [BreakTimer(spec) for spec in specs]
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self.quiet = quiet
+        self._threaded = threaded
+        self._sleep_clock = sleep_clock
+        self._sleep_mark = None  # (clock, sleep_clock) at the last sleep check
+        self.sleep_policy = sleep_policy
+        self.running = False
+        self.paused = False
+        self.idle_since = None  # Clock time the user went idle, while away (see begin_idle)
+        self.active_break = None
+        self.break_queue = deque()
+        self._queue_elapsed = 0  # Total break time so far; queued durations are relative to it
+        self._break_start = None
+        self._index = BreakIndex()  # Armed breaks ordered by deadline
+        self._snoozed = []  # Heap of (due, seq, break_data)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._listeners = []
+
+    # Subscribers
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, event, data=None):
+        """Notify listeners. Never call with `_cond` held: listeners may block."""
+        for listener in list(self._listeners):
+            listener(event, data)
+
+    # Controls
+
+    def start(self):
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+            self.paused = False
+            self._sleep_mark = None  # Sleeps while stopped do not count
+            now = self._clock()
+            for timer in self.breaks:
+                timer.reset_timer(now)
+                timer.arm(now)
+            self._index.rebuild((t, t.deadline) for t in self.breaks)
+            if self._threaded:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._emit("started")
+
+    def pause(self):
+        with self._cond:
+            if not self.running or self.paused:
+                return
+            self.paused = True
+            self._freeze()
+        self._emit("paused")
+
+    def resume(self):
+        with self._cond:
+            if not self.running or not self.paused:
+                return
+            self.paused = False
+            self._thaw()
+        self._emit("resumed")
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def reset(self):
+        """Stop the scheduler, drop pending breaks and reset all timers."""
+        with self._cond:
+            self.running = False
+            self.paused = False
+            self.idle_since = None
+            self._thread = None
+            self.break_queue.clear()
+            self._snoozed.clear()
+            self.active_break = None
+            self._break_start = None
+            self._freeze()
+            now = self._clock()
+            for timer in self.breaks:
+                timer.reset_timer(now)
+        self._emit("reset")
+
+    def update_break(self, timer, **changes):
+        """Edit a break's settings; a changed interval restarts its timer.
+
+        Rewriting the same interval (every keystroke in the settings field
+        reports one) leaves the countdown alone.
+        """
+        with self._cond:
+            interval = timer.spec.interval_seconds
+            timer.spec = timer.spec.replace(**changes)
+            if timer.spec.interval_seconds != interval:
+                timer.reset_timer(self._clock())
+                if timer.deadline is not None:
+                    self._index.schedule(timer, timer.deadline)
+                self._cond.notify_all()
+
+    def set_quiet(self, quiet):
+        """Replace the quiet schedule (None for no quiet hours)."""
+        with self._cond:
+            self.quiet = quiet
+            self._cond.notify_all()
+
+    def set_sleep_policy(self, policy):
+        if policy not in SLEEP_POLICIES:
+            raise ValueError(f"unknown sleep policy: {policy!r}")
+        with self._cond:
+            self.sleep_policy = policy
+            self._cond.notify_all()  # The timer thread's wait cap depends on the policy
+
+    def check_sleep(self):
+        """Detect a system sleep since the last check and apply the sleep policy.
+
+        Returns the seconds slept, or 0. Called by the timer thread on every
+        wake-up and by `run_due()`.
+        """
+        if self._sleep_clock is None:
+            return 0
+        with self._cond:
+            now, awake = self._clock(), self._sleep_clock()
+            mark, self._sleep_mark = self._sleep_mark, (now, awake)
+            if mark is None:
+                return 0
+            slept = (awake - mark[1]) - (now - mark[0])
+            if slept < SLEEP_THRESHOLD or not self.running:
+                return 0
+            credited, skipped = self._apply_sleep(slept, now)
+        for break_data in skipped:
+            self._emit("break_skipped", break_data)
+        self._emit("slept", {'seconds': slept, 'policy': self.sleep_policy, 'credited': credited})
+        return slept
+
+    def _apply_sleep(self, slept, now):
+        """Adjust timers and snoozes for `slept` seconds of sleep ending at `now`.
+
+        One pass over the breaks and snoozes plus an O(n) index rebuild,
+        however long the sleep. Returns the names of breaks credited as taken
+        and the snoozed breaks dropped as covered by the sleep.
+        """
+        credited = []
+        skipped = []
+        if self.sleep_policy == "break":
+            if self.idle_since is not None:
+                self.idle_since -= slept  # The sleep is part of the time away
+            else:
+                for timer in self.breaks:
+                    if slept >= timer.spec.duration_seconds:
+                        timer.reset_timer(now)
+                        credited.append(timer.spec.name)
+            kept = []
+            for entry in self._snoozed:
+                if slept >= entry[2]['duration']:
+                    skipped.append(entry[2])
+                else:
+                    kept.append(entry)
+            self._snoozed = kept
+        elif self.sleep_policy == "elapse":
+            for timer in self.breaks:
+                if timer.deadline is not None:
+                    timer.deadline -= slept  # run_due() fires overdue breaks once, coalesced
+            self._snoozed = [(due - slept, seq, data) for due, seq, data in self._snoozed]
+        else:
+            return credited, skipped
+        heapq.heapify(self._snoozed)
+        self._index.rebuild((t, t.deadline) for t in self.breaks if t.deadline is not None)
+        self._cond.notify_all()
+        return credited, skipped
+
+    def set_breaks(self, specs):
+        """Replace the break list in place, e.g. when switching profiles.
+
+        Timers are matched by break name: a break that stays keeps its
+        countdown unless its interval changed, new breaks start counting
+        from now (if the timers are running) and missing ones are dropped.
+        Returns the names of the breaks whose countdown (re)started.
+        """
+        with self._cond:
+            now = self._clock()
+            counting = (self.running and not self.paused and self.idle_since is None
+                        and self.active_break is None)
+            current = {timer.spec.name: timer for timer in self.breaks}
+            breaks = []
+            restarted = []
+            for spec in specs:
+                timer = current.pop(spec.name, None)
+                if timer is None:
+                    timer = BreakTimer(spec)
+                    if counting:
+                        timer.arm(now)
+                    restarted.append(spec.name)
+                elif timer.spec != spec:
+                    interval_changed = timer.spec.interval_seconds != spec.interval_seconds
+                    timer.spec = spec
+                    if interval_changed:
+                        timer.reset_timer(now)
+                        restarted.append(spec.name)
+                breaks.append(timer)
+            self.breaks = breaks
+            self._index.rebuild((t, t.deadline) for t in breaks if t.deadline is not None)
+            self._cond.notify_all()
+        self._emit("breaks_changed", {'names': [t.spec.name for t in breaks], 'restarted': restarted})
+        return restarted
+
+    def begin_idle(self, since):
+        """The user has been away since clock time `since`: stop the countdowns as of then.
+
+        Time away does not count as work; see `end_idle` for the credit
+        given when the user comes back.
+        """
+        with self._cond:
+            if not self.running or self.idle_since is not None:
+                return
+            self.idle_since = since
+            for timer in self.breaks:
+                if timer.deadline is not None:
+                    # Remaining time as of `since`, capped for breaks re-armed since then
+                    timer.remaining = max(0, min(timer.spec.interval_seconds, timer.deadline - since))
+                    timer.deadline = None
+            self._index.clear()
+            self._cond.notify_all()
+        self._emit("idle_started", {'since': since})
+
+    def end_idle(self, until=None):
+        """The user came back at clock time `until` (default: now).
+
+        Every break no longer than the time away counts as taken and
+        restarts its full interval; the others resume where they stopped.
+        """
+        with self._cond:
+            if self.idle_since is None:
+                return
+            until = self._clock() if until is None else until
+            away = max(0, until - self.idle_since)
+            self.idle_since = None
+            credited = []
+            for timer in self.breaks:
+                if away >= timer.spec.duration_seconds:
+                    timer.remaining = timer.spec.interval_seconds
+                    credited.append(timer.spec.name)
+            self._thaw()
+        self._emit("idle_ended", {'away': away, 'credited': credited})
+
+    # Queries
+
+    def time_left(self):
+        """Seconds until each break is due, in `breaks` order."""
+        with self._cond:
+            now = self._clock()
+            return [timer.seconds_left(now) for timer in self.breaks]
+
+    def next_due(self):
+        """Return `(timer, seconds_left)` for the next armed break, or None."""
+        with self._cond:
+            earliest = self._index.peek()
+            if earliest is None:
+                return None
+            deadline, timer = earliest
+            return timer, max(0, deadline - self._clock())
+
+    def next_wakeup(self):
+        """Clock time of the next break or snooze deadline, or None if nothing is armed."""
+        with self._cond:
+            return self._next_wakeup()
+
+    def status(self):
+        """Snapshot of the scheduler state as plain, JSON-serializable data."""
+        with self._cond:
+            now = self._clock()
+            earliest = self._index.peek()
+            return {
+                'running': self.running,
+                'paused': self.paused,
+                'idle': self.idle_since is not None,
+                'on_break': self.active_break['name'] if self.active_break else None,
+                'queued': len(self.break_queue),
+                'snoozed': len(self._snoozed),
+                'breaks': [{'name': t.spec.name, 'seconds_left': t.seconds_left(now)} for t in self.breaks],
+                'next': ({'name': earliest[1].spec.name, 'seconds_left': max(0, earliest[0] - now)}
+                         if earliest else None),
+            }
+
+    # Break queue
+
+    def trigger(self, spec):
+        """Queue a test break with the given settings.
+
+        Its events carry `'test': True`, so history and adherence can tell
+        it from a break that came due.
+        """
+        with self._cond:
+            break_data = self._enqueue(dict(self._make_break_data(spec), test=True))
+        self._emit("break_queued", break_data)
+
+    def fire_next(self):
+        """Make the next armed break due now; returns its timer, or None if none is armed.
+
+        The break then fires through the normal timer path (on the next
+        `run_due()`), so its timer restarts from now like any other break.
+        """
+        with self._cond:
+            earliest = self._index.peek()
+            if earliest is None:
+                return None
+            _, timer = earliest
+            timer.deadline = self._clock()
+            self._index.schedule(timer, timer.deadline)
+            self._cond.notify_all()
+            return timer
+
+    def begin_next_break(self):
+        """Pop the next queued break and start it, or return None if busy or empty."""
+        skipped = []
+        with self._cond:
+            if self.active_break is not None:
+                return None
+            break_data = None
+            while self.break_queue:
+                candidate = self.break_queue.popleft()
+                # Apply break time that elapsed while this entry was waiting
+                candidate['duration'] -= self._queue_elapsed - candidate.pop('elapsed_mark')
+                if candidate['duration'] > 0:
+                    break_data = candidate
+                    break
+                skipped.append(candidate)  # Already covered by breaks taken meanwhile
+            if break_data is not None:
+                self.active_break = break_data
+                self._break_start = self._clock()
+                self._freeze()
+        for candidate in skipped:
+            self._emit("break_skipped", candidate)
+        if break_data is not None:
+            self._emit("break_started", break_data)
+        return break_data
+
+    def end_break(self):
+        """Finish the active break and resume the timers."""
+        with self._cond:
+            break_data = self.active_break
+            if break_data is None:
+                return
+            elapsed = int(self._clock() - self._break_start)
+            self._queue_elapsed += elapsed
+            self.active_break = None
+            self._break_start = None
+            self._thaw()
+        self._emit("break_ended", dict(break_data, elapsed=elapsed))
+
+    def snooze_break(self, minutes):
+        """Dismiss the active break and re-queue it after `minutes`."""
+        with self._cond:
+            break_data = self.active_break
+            if break_data is None:
+                return
+            self.active_break = None
+            self._break_start = None
+            self._thaw()
+            break_data['snoozes'] += 1
+            if self.running and not self.paused:
+                due = self._clock() + minutes * 60
+                heapq.heappush(self._snoozed, (due, next(self._seq), break_data))
+                self._cond.notify_all()
+        self._emit("break_snoozed", break_data)
+
+    @staticmethod
+    def _make_break_data(spec):
+        return {
+            'name': spec.name,
+            'duration': spec.duration_seconds,
+            'auto_dismiss': spec.auto_dismiss,
+            'start_sound': spec.start_sound,
+            'end_sound': spec.end_sound,
+            'loop_end_sound': spec.loop_end_sound,
+            'snoozes': 0  # Times this break was snoozed and re-queued
+        }
+
+    def _enqueue(self, break_data):
+        """Append a break to the queue, stamping the current elapsed-time offset."""
+        break_data['elapsed_mark'] = self._queue_elapsed
+        self.break_queue.append(break_data)
+        return break_data
+
+    # Timer
+
+    def _freeze(self):
+        """Stop all break countdowns (pause, reset or break in progress)."""
+        now = self._clock()
+        for timer in self.breaks:
+            timer.freeze(now)
+        self._index.clear()
+        self._cond.notify_all()
+
+    def _thaw(self):
+        """Resume break countdowns if running, unpaused, not idle and no break is active."""
+        if not self.running or self.paused or self.idle_since is not None or self.active_break is not None:
+            return
+        now = self._clock()
+        for timer in self.breaks:
+            timer.arm(now)
+        self._index.rebuild((t, t.deadline) for t in self.breaks)
+        self._cond.notify_all()
+
+    def _next_wakeup(self):
+        earliest = self._index.peek()
+        wake = earliest[0] if earliest else None
+        if self._snoozed and (wake is None or self._snoozed[0][0] < wake):
+            wake = self._snoozed[0][0]
+        return wake
+
+    def run_due(self):
+        """Queue every break and snooze that is due at the current clock time.
+
+        Returns the list of queued breaks. Called by the timer thread, or
+        directly by callers driving a non-threaded scheduler.
+        """
+        self.check_sleep()
+        queued = []
+        coalesced = []
+        skipped = []
+        deferred = []
+        with self._cond:
+            if not self.running:
+                return queued
+            now = self._clock()
+            quiet_for = None  # Seconds until the current quiet period ends, looked up once if needed
+
+            fired_breaks = self._index.pop_due(now)
+            if fired_breaks and self.quiet:
+                quiet_for = self._quiet_for()
+                if quiet_for:
+                    for timer in fired_breaks:
+                        timer.deadline = now + quiet_for
+                        self._index.schedule(timer, timer.deadline)
+                        deferred.append(timer.spec.name)
+                    fired_breaks = []
+            if fired_breaks:
+                longest = max(fired_breaks, key=lambda t: t.spec.duration_seconds)
+                lateness = now - longest.deadline
+                for timer in fired_breaks:
+                    # Anchor to the missed deadline so wake-up latency never accumulates
+                    anchor = timer.deadline
+                    if anchor + timer.spec.interval_seconds <= now:
+                        anchor = now
+                    timer.reset_timer(anchor)
+                    self._index.schedule(timer, timer.deadline)
+                    if timer is not longest:
+                        coalesced.append(timer.spec.name)
+                break_data = self._make_break_data(longest.spec)
+                break_data['lateness'] = lateness  # Seconds past its deadline when it fired
+                queued.append(self._enqueue(break_data))
+
+            requeue = []
+            while self._snoozed and self._snoozed[0][0] <= now:
+                due, seq, break_data = heapq.heappop(self._snoozed)
+                if not self.paused and self.quiet and quiet_for is None:
+                    quiet_for = self._quiet_for()
+                if self.paused:
+                    break_data['lateness'] = now - due
+                    skipped.append(break_data)
+                elif quiet_for:
+                    requeue.append((now + quiet_for, seq, break_data))
+                    deferred.append(break_data['name'])
+                else:
+                    break_data['lateness'] = now - due
+                    queued.append(self._enqueue(break_data))
+            for entry in requeue:
+                heapq.heappush(self._snoozed, entry)
+
+        # Outside the lock: listeners may block on a UI thread
+        if deferred:
+            self._emit("breaks_deferred", {'names': deferred, 'seconds': quiet_for})
+        if coalesced:
+            self._emit("breaks_coalesced", {'into': queued[0]['name'], 'names': coalesced})
+        for break_data in skipped:
+            self._emit("break_skipped", break_data)
+        for break_data in queued:
+            self._emit("break_queued", break_data)
+        return queued
+
+    def _quiet_for(self):
+        """Seconds until the quiet period in progress ends, or 0 outside quiet hours."""
+        wall = self._wall_clock()
+        return max(0, self.quiet.free_at(wall) - wall)
+
+    def _wait_limit(self):
+        """Longest timer-thread wait in seconds, or None for no cap.
+
+        When a sleep changes the timers ("break" and "elapse"), waits are
+        capped at SLEEP_CHECK_INTERVAL: a wait's timeout does not count time
+        asleep, so an uncapped wait would notice a sleep only at the next
+        deadline. "resume" leaves the timers alone, so it needs no cap.
+        """
+        if self._sleep_clock is None or self.sleep_policy == "resume":
+            return None
+        return SLEEP_CHECK_INTERVAL
+
+    def _run(self):
+        """Timer thread: sleep until the earliest deadline, then queue due breaks."""
+        me = threading.current_thread()
+        while True:
+            self.check_sleep()
+            with self._cond:
+                if not self.running or self._thread is not me:
+                    return
+                limit = self._wait_limit()
+                wake = self._next_wakeup()
+                if wake is None:
+                    self._cond.wait(limit)  # Paused or break in progress
+                    continue
+                delay = wake - self._clock()
+                if delay > 0:
+                    self._cond.wait(delay if limit is None else min(delay, limit))
+                    continue
+            self.run_due()
+
+
+# ------------------ HEADLESS MODE ------------------
+
+def run_headless(breaks, sleep_policy="break", quiet=None):
+    """Run the scheduler without a display, announcing breaks on stdout."""
+    scheduler = BreakScheduler(breaks, sleep_clock=sleep_clock(), sleep_policy=sleep_policy, quiet=quiet)
+
+    def present_next():
+        break_data = scheduler.begin_next_break()
+        if break_data is None:
+            return
+        print(f"[{time.strftime('%H:%M:%S')}] {break_data['name']}: "
+              f"take a break for {break_data['duration']}s", flush=True)
+        threading.Timer(break_data['duration'], finish).start()
+
+    def finish():
+        scheduler.end_break()
+        present_next()
+
+    def on_event(event, data):
+        if event == "break_queued":
+            present_next()
+
+    scheduler.subscribe(on_event)
+    scheduler.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        scheduler.reset()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the break scheduler without a UI.")
+    parser.add_argument("--prefs", type=Path,
+                        help="preferences JSON to read break settings from (default: built-in breaks)")
+    parser.add_argument("--on-sleep", choices=list(SLEEP_POLICIES),
+                        help="what a system sleep means for the timers (default: from --prefs, else break)")
+    args = parser.parse_args(argv)
+
+    prefs = {}
+    if args.prefs:
+        with open(args.prefs, 'r') as f:
+            prefs = json.load(f)
+    sleep_policy = args.on_sleep or prefs.get("sleep_policy", "break")
+    from quiet import load_quiet_schedule  # Only the headless runner reads quiet hours itself
+    quiet = load_quiet_schedule(prefs.get("quiet_hours", []), prefs.get("calendars", []))
+    run_headless(breaks_from_prefs(prefs), sleep_policy if sleep_policy in SLEEP_POLICIES else "break", quiet)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Deterministic virtual-clock simulation of the break scheduler.
+
+Replays simulated work weeks against BreakScheduler in well under a second
+and reports what happened, so scheduling changes can be checked (and
+benchmarked) over long horizons without waiting in real time.
+
+With `--calendar-events N`, meetings are booked in a calendar of N events
+(quiet hours) instead of being sat out with manual pauses.
+
+Usage: python simulator.py [--days 7] [--seed 1] [--extra-breaks 0] [--calendar-events 0] [--json]
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import random
+import time
+
+from quiet import QuietSchedule
+from scheduler import DEFAULT_BREAKS, BreakScheduler, BreakSpec, VirtualClock
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+WORK_START = 9 * HOUR
+WORK_END = 17 * HOUR + 30 * 60
+LUNCH = (12 * HOUR, 13 * HOUR)
+MEETING_SLOTS = [10 * HOUR, 11 * HOUR, 14 * HOUR, 15 * HOUR, 16 * HOUR]
+EPOCH = 1767571200  # Monday 2026-01-05 00:00 UTC: wall-clock time of simulated day 0
+
+
+class Simulation:
+    """Drives a non-threaded BreakScheduler with a scripted user."""
+
+    def __init__(self, specs, days=7, seed=1, snooze_probability=0.3, calendar_events=0):
+        self.clock = VirtualClock()
+        self.scheduler = BreakScheduler(specs, clock=self.clock, threaded=False,
+                                        wall_clock=lambda: EPOCH + self.clock())
+        self.scheduler.subscribe(self._on_event)
+        self.days = days
+        self.rng = random.Random(seed)
+        self.calendar_events = calendar_events
+        self._meetings = []  # Calendar events, when meetings are quiet hours
+        self.snooze_probability = snooze_probability
+        self._actions = []  # Heap of (time, seq, action)
+        self._seq = itertools.count()
+        self._snoozed_ids = set()
+        self.stats = {
+            'fired': 0,
+            'coalesced': 0,
+            'skipped': 0,
+            'snoozed': 0,
+            'requeued': 0,
+            'started': 0,
+            'completed': 0,
+            'deferred': 0,
+            'events': 0,
+        }
+
+    # User script
+
+    def _at(self, when, action):
+        heapq.heappush(self._actions, (when, next(self._seq), action))
+
+    def _plan_days(self):
+        for day in range(self.days):
+            if day % 7 >= 5:
+                continue  # Weekend
+            base = day * DAY
+            self._at(base + WORK_START, self.scheduler.start)
+            self._at(base + LUNCH[0], self.scheduler.pause)
+            self._at(base + LUNCH[1], self.scheduler.resume)
+            for slot in self.rng.sample(MEETING_SLOTS, self.rng.randint(0, 3)):
+                length = self.rng.choice([30 * 60, 45 * 60, HOUR - 5 * 60])
+                if self.calendar_events:
+                    self._meetings.append((EPOCH + base + slot, EPOCH + base + slot + length, "Meeting"))
+                else:
+                    self._at(base + slot, self.scheduler.pause)
+                    self._at(base + slot + length, self.scheduler.resume)
+            self._at(base + WORK_END, self.scheduler.reset)
+        if self.calendar_events:
+            self._book_calendar()
+
+    def _book_calendar(self):
+        """Quiet hours from the meetings plus random events up to `calendar_events`."""
+        events = list(self._meetings)
+        horizon = self.days * DAY
+        while len(events) < self.calendar_events:
+            start = EPOCH + self.rng.uniform(0, horizon)
+            events.append((start, start + self.rng.choice([15, 30, 60]) * 60, "Event"))
+        self.scheduler.set_quiet(QuietSchedule(events))
+
+    def _present(self):
+        """What the UI does when a break is queued or a popup closes."""
+        self.scheduler.begin_next_break()
+
+    def _respond(self, break_data):
+        """Schedule the user's reaction to a break popup."""
+        now = self.clock()
+        reaction = self.rng.uniform(2, 60)
+        if break_data['auto_dismiss']:
+            self._at(now + break_data['duration'], lambda: self._finish(break_data))
+        elif self.rng.random() < self.snooze_probability:
+            self._at(now + reaction, lambda: self._snooze(break_data))
+        else:
+            self._at(now + break_data['duration'] + reaction, lambda: self._finish(break_data))
+
+    def _finish(self, break_data):
+        if self.scheduler.active_break is break_data:
+            self.scheduler.end_break()
+            self._present()
+
+    def _snooze(self, break_data):
+        if self.scheduler.active_break is break_data:
+            self._snoozed_ids.add(id(break_data))
+            self.scheduler.snooze_break(5)
+            self._present()
+
+    # Scheduler subscriber
+
+    def _on_event(self, event, data):
+        stats = self.stats
+        stats['events'] += 1
+        if event == "break_queued":
+            if id(data) in self._snoozed_ids:
+                self._snoozed_ids.discard(id(data))
+                stats['requeued'] += 1
+            else:
+                stats['fired'] += 1
+            self._present()
+        elif event == "breaks_coalesced":
+            stats['coalesced'] += len(data['names'])
+        elif event == "breaks_deferred":
+            stats['deferred'] += len(data['names'])
+        elif event == "break_skipped":
+            stats['skipped'] += 1
+        elif event == "break_snoozed":
+            stats['snoozed'] += 1
+        elif event == "break_started":
+            stats['started'] += 1
+            self._respond(data)
+        elif event == "break_ended":
+            stats['completed'] += 1
+
+    # Main loop
+
+    def run(self):
+        """Run the whole horizon and return the stats with timing figures."""
+        self._plan_days()
+        horizon = self.days * DAY
+        user_actions = 0
+        wall_start = time.perf_counter()
+
+        while True:
+            wake = self.scheduler.next_wakeup()
+            next_action = self._actions[0][0] if self._actions else None
+            candidates = [t for t in (wake, next_action) if t is not None]
+            if not candidates:
+                break
+            when = min(candidates)
+            if when > horizon:
+                break
+            self.clock.set(max(self.clock(), when))
+            if next_action is not None and next_action <= when:
+                _, _, action = heapq.heappop(self._actions)
+                action()
+                user_actions += 1
+            else:
+                self.scheduler.run_due()
+
+        wall = time.perf_counter() - wall_start
+        stats = dict(self.stats)
+        stats['user_actions'] = user_actions
+        stats['simulated_days'] = self.days
+        stats['wall_seconds'] = wall
+        total = stats['events'] + user_actions
+        stats['events_per_second'] = total / wall if wall > 0 else float('inf')
+        return stats
+
+
+def extra_break_specs(count, seed):
+    """Synthetic break types (hydration, posture, ...) for stress runs."""
+    rng = random.Random(seed)
+    return [
+        BreakSpec(
+            name=f"Extra {i + 1}",
+            interval_val=rng.randint(10, 180), interval_unit="min",
+            duration_val=rng.randint(5, 120), duration_unit="sec",
+            start_sound="None", end_sound="None",
+            auto_dismiss=rng.random() < 0.7
+        )
+        for i in range(count)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay simulated work weeks against the break scheduler.")
+    parser.add_argument("--days", type=int, default=7, help="simulated days (default: 7)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--extra-breaks", type=int, default=0,
+                        help="additional synthetic break types (default: 0)")
+    parser.add_argument("--snooze-probability", type=float, default=0.3,
+                        help="chance a dismissable break is snoozed (default: 0.3)")
+    parser.add_argument("--calendar-events", type=int, default=0,
+                        help="book meetings in a calendar of this many events instead of pausing (default: 0)")
+    parser.add_argument("--json", action="store_true", help="print stats as JSON")
+    args = parser.parse_args(argv)
+
+    specs = [BreakSpec(**b) for b in DEFAULT_BREAKS] + extra_break_specs(args.extra_breaks, args.seed)
+    stats = Simulation(specs, days=args.days, seed=args.seed,
+                       snooze_probability=args.snooze_probability,
+                       calendar_events=args.calendar_events).run()
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"Simulated {stats['simulated_days']} days with {len(specs)} break types")
+    for key in ('fired', 'coalesced', 'skipped', 'snoozed', 'requeued', 'deferred', 'started', 'completed'):
+        print(f"  {key:<10} {stats[key]:>8}")
+    print(f"  {stats['events'] + stats['user_actions']} events in {stats['wall_seconds'] * 1e3:.1f} ms "
+          f"({stats['events_per_second']:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
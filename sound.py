@@ -0,0 +1,286 @@
+"""In-process sound playback for Don't Forget Your Breaks.
+
+Each sound is loaded once and cached by a long-lived backend, so chimes and
+looping end sounds do not fork a player process per play:
+
+- macOS: NSSound through the Objective-C runtime (ctypes), with `afplay`
+  as a last resort if AppKit cannot be reached.
+- Linux and others: `simpleaudio` when installed, playing WAV files from
+  SOUND_DIRS or a synthesized chime; otherwise the terminal bell.
+- Windows: `winsound.MessageBeep`.
+
+Backends are pluggable via `PLAYER.set_backend()`. `PLAYER.spawn_count`
+counts player processes started, which stays at zero unless the `afplay`
+fallback is in use.
+"""
+
+import io
+import math
+import struct
+import subprocess
+import sys
+import threading
+import wave
+from pathlib import Path
+
+SOUND_LOOP_INTERVAL = 1.2
+
+# Sound options including "None"
+SOUNDS = {
+    "None": None,
+    "Glass": "Glass.aiff",
+    "Ping": "Ping.aiff",
+    "Pop": "Pop.aiff",
+    "Submarine": "Submarine.aiff"
+}
+
+MAC_SOUND_DIR = Path("/System/Library/Sounds")
+
+# Where non-macOS backends look for "<Sound name>.wav"
+SOUND_DIRS = [
+    Path(__file__).parent / "sounds",
+    Path.home() / ".local" / "share" / "sounds" / "dont-forget-your-breaks",
+]
+
+# Synthesized fallback chimes: (frequency Hz, duration s) per note
+CHIMES = {
+    "Glass": [(1318.5, 0.25)],
+    "Ping": [(1760.0, 0.15)],
+    "Pop": [(660.0, 0.08)],
+    "Submarine": [(392.0, 0.2), (523.3, 0.3)],
+}
+
+
+# ------------------ BACKENDS ------------------
+
+class SoundBackend:
+    """Loads a sound once into a handle, then plays that handle on demand."""
+
+    name = "base"
+
+    def load(self, sound_name):
+        """Return a playable handle for `sound_name`, or None if unavailable."""
+        raise NotImplementedError
+
+    def play(self, handle):
+        raise NotImplementedError
+
+
+class NSSoundBackend(SoundBackend):
+    """Plays cached NSSound objects in-process (macOS)."""
+
+    name = "nssound"
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library('objc'))
+        ctypes.cdll.LoadLibrary(ctypes.util.find_library('AppKit'))  # Registers NSSound
+        objc.objc_getClass.restype = ctypes.c_void_p
+        objc.objc_getClass.argtypes = [ctypes.c_char_p]
+        objc.sel_registerName.restype = ctypes.c_void_p
+        objc.sel_registerName.argtypes = [ctypes.c_char_p]
+
+        # Fixed-signature views of objc_msgSend; never mutate shared argtypes across threads
+        send = ctypes.cast(objc.objc_msgSend, ctypes.c_void_p).value
+        self._send = ctypes.CFUNCTYPE(ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p)(send)
+        self._send_bool = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)(send)
+        self._send_str = ctypes.CFUNCTYPE(
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_char_p)(send)
+        self._send_init_file = ctypes.CFUNCTYPE(
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_bool)(send)
+
+        sel = objc.sel_registerName
+        self._NSSound = objc.objc_getClass(b'NSSound')
+        self._NSString = objc.objc_getClass(b'NSString')
+        if not self._NSSound or not self._NSString:
+            raise OSError("AppKit classes unavailable")
+        self._sel_alloc = sel(b'alloc')
+        self._sel_release = sel(b'release')
+        self._sel_init_utf8 = sel(b'initWithUTF8String:')
+        self._sel_init_file = sel(b'initWithContentsOfFile:byReference:')
+        self._sel_is_playing = sel(b'isPlaying')
+        self._sel_stop = sel(b'stop')
+        self._sel_play = sel(b'play')
+
+    def load(self, sound_name):
+        sound_file = SOUNDS.get(sound_name)
+        if not sound_file:
+            return None
+        path = self._send_str(self._send(self._NSString, self._sel_alloc), self._sel_init_utf8,
+                              str(MAC_SOUND_DIR / sound_file).encode('utf-8'))
+        try:
+            sound = self._send(self._NSSound, self._sel_alloc)
+            return self._send_init_file(sound, self._sel_init_file, path, False) or None
+        finally:
+            self._send(path, self._sel_release)
+
+    def play(self, handle):
+        if self._send_bool(handle, self._sel_is_playing):
+            self._send(handle, self._sel_stop)
+        self._send(handle, self._sel_play)
+
+
+class AfplayBackend(SoundBackend):
+    """Fallback that forks `afplay` per play (macOS without AppKit access)."""
+
+    name = "afplay"
+
+    def __init__(self, on_spawn):
+        self._on_spawn = on_spawn
+
+    def load(self, sound_name):
+        sound_file = SOUNDS.get(sound_name)
+        return str(MAC_SOUND_DIR / sound_file) if sound_file else None
+
+    def play(self, handle):
+        self._on_spawn()
+        subprocess.Popen(
+            ["afplay", handle],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+
+class SimpleAudioBackend(SoundBackend):
+    """Plays cached PCM with the optional `simpleaudio` package."""
+
+    name = "simpleaudio"
+
+    SAMPLE_RATE = 44100
+
+    def __init__(self):
+        import simpleaudio
+        self._simpleaudio = simpleaudio
+
+    def load(self, sound_name):
+        if not SOUNDS.get(sound_name):
+            return None
+        for directory in SOUND_DIRS:
+            path = directory / f"{sound_name}.wav"
+            if path.exists():
+                return self._simpleaudio.WaveObject.from_wave_file(str(path))
+        wav = io.BytesIO(synthesize_chime(CHIMES.get(sound_name, [(880.0, 0.2)]), self.SAMPLE_RATE))
+        with wave.open(wav, 'rb') as w:
+            return self._simpleaudio.WaveObject(
+                w.readframes(w.getnframes()), w.getnchannels(), w.getsampwidth(), w.getframerate())
+
+    def play(self, handle):
+        handle.play()
+
+
+class BellBackend(SoundBackend):
+    """System beep: `winsound.MessageBeep` on Windows, terminal bell elsewhere."""
+
+    name = "bell"
+
+    def load(self, sound_name):
+        return sound_name if SOUNDS.get(sound_name) else None
+
+    def play(self, handle):
+        if sys.platform == "win32":
+            import winsound
+            winsound.MessageBeep()
+        else:
+            print("\a")
+
+
+def synthesize_chime(notes, sample_rate=44100):
+    """Render (frequency, seconds) notes as a mono 16-bit WAV with a soft decay."""
+    frames = bytearray()
+    for frequency, seconds in notes:
+        count = int(sample_rate * seconds)
+        for i in range(count):
+            envelope = math.exp(-5.0 * i / count)
+            sample = int(12000 * envelope * math.sin(2 * math.pi * frequency * i / sample_rate))
+            frames += struct.pack('<h', sample)
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(bytes(frames))
+    return out.getvalue()
+
+
+# ------------------ PLAYER ------------------
+
+class SoundPlayer:
+    """Process-wide player that picks a backend lazily and caches loaded sounds."""
+
+    def __init__(self, backend=None):
+        self.spawn_count = 0  # Player processes started (afplay fallback only)
+        self._backend = backend
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        with self._lock:
+            if self._backend is None:
+                self._backend = self._default_backend()
+            return self._backend
+
+    def set_backend(self, backend):
+        """Swap the backend (e.g. for tests or a user choice) and drop cached sounds."""
+        with self._lock:
+            self._backend = backend
+            self._cache.clear()
+
+    def _count_spawn(self):
+        self.spawn_count += 1
+
+    def _default_backend(self):
+        if sys.platform == "darwin":
+            try:
+                return NSSoundBackend()
+            except Exception:
+                return AfplayBackend(self._count_spawn)
+        if sys.platform != "win32":
+            try:
+                return SimpleAudioBackend()
+            except ImportError:
+                pass
+        return BellBackend()
+
+    def _handle(self, sound_name):
+        backend = self.backend
+        with self._lock:
+            if sound_name not in self._cache:
+                try:
+                    self._cache[sound_name] = backend.load(sound_name)
+                except Exception:
+                    self._cache[sound_name] = None
+            return self._cache[sound_name]
+
+    def preload(self, sound_names=None):
+        """Load sounds ahead of their first play."""
+        for sound_name in sound_names or SOUNDS:
+            self._handle(sound_name)
+
+    def play(self, sound_name):
+        handle = self._handle(sound_name)
+        if handle is None:
+            return
+        try:
+            self.backend.play(handle)
+        except Exception:
+            pass
+
+
+PLAYER = SoundPlayer()
+
+
+# ------------------ SOUND FUNCTIONS ------------------
+
+def play_sound(sound_name="Glass"):
+    if sound_name == "None" or sound_name is None:
+        return
+    PLAYER.play(sound_name)
+
+
+def looping_sound(stop_event, sound_name):
+    while not stop_event.is_set():
+        play_sound(sound_name)
+        stop_event.wait(SOUND_LOOP_INTERVAL)
@@ -0,0 +1,47 @@
+"""Shared fixtures; the modules under test live at the repository root."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scheduler import BreakScheduler, BreakSpec, VirtualClock  # noqa: E402
+
+
+def make_spec(name, interval, duration, interval_unit="sec", duration_unit="sec", **fields):
+    """A BreakSpec with silent sounds; `interval` and `duration` in the given units."""
+    return BreakSpec(name=name, interval_val=interval, interval_unit=interval_unit,
+                     duration_val=duration, duration_unit=duration_unit,
+                     start_sound="None", end_sound="None", **fields)
+
+
+class Recorder:
+    """Scheduler subscriber keeping (event, data) pairs."""
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event, data):
+        self.events.append((event, data))
+
+    def named(self, event):
+        return [data for name, data in self.events if name == event]
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+@pytest.fixture
+def make_scheduler(clock):
+    """Build a started, non-threaded scheduler on the virtual clock; returns (scheduler, recorder)."""
+    def build(specs, **kwargs):
+        scheduler = BreakScheduler(specs, clock=clock, threaded=False, **kwargs)
+        recorder = Recorder()
+        scheduler.subscribe(recorder)
+        scheduler.start()
+        return scheduler, recorder
+    return build
@@ -0,0 +1,109 @@
+"""Adherence counting and incremental rollups."""
+
+import json
+from datetime import date, datetime, timedelta
+
+from analytics import ROLLUPS_FILE, Rollups, load_rollups
+from history import EventLog
+
+MONDAY = date(2026, 1, 5)
+
+
+def at(day, hour=10, minute=0):
+    """Epoch seconds for local time on `day` (rollups bucket by local date)."""
+    return datetime(day.year, day.month, day.day, hour, minute).timestamp()
+
+
+def entry(ts, event, name="Micro", **fields):
+    return dict(fields, ts=ts, event=event, **{'break': name})
+
+
+def test_counting_rules():
+    rollups = Rollups()
+    for e in [
+        entry(at(MONDAY, 9), "trigger", duration=5),
+        entry(at(MONDAY, 9, 1), "close", duration=5, elapsed=5),
+        entry(at(MONDAY, 10), "trigger", duration=5),
+        entry(at(MONDAY, 10, 1), "snooze"),
+        entry(at(MONDAY, 10, 6), "trigger", duration=5, snoozes=1),  # Coming back: not due again
+        entry(at(MONDAY, 10, 7), "close", duration=5, elapsed=2),
+        entry(at(MONDAY, 11), "skip"),
+        {'ts': at(MONDAY, 12), 'event': "coalesce", 'break': "Normal", 'names': ["Micro"]},
+        entry(at(MONDAY, 13), "pause"),
+    ]:
+        rollups.add(e)
+
+    [row] = rollups.report(MONDAY, MONDAY)
+    assert (row['due'], row['taken'], row['completed'], row['skipped'], row['coalesced']) == (2, 2, 1, 1, 1)
+    assert row['adherence'] == 1.0
+    assert row['avg_snoozes'] == 0.5
+    assert row['avg_length'] == 3.5
+    assert rollups.through == at(MONDAY, 13)
+
+
+def test_test_breaks_are_not_counted():
+    rollups = Rollups()
+    rollups.add(entry(at(MONDAY), "trigger", duration=5, test=True))
+    rollups.add(entry(at(MONDAY, 10, 1), "close", duration=5, elapsed=5, test=True))
+    assert rollups.report(MONDAY, MONDAY) == []
+    assert rollups.through == at(MONDAY, 10, 1)
+
+
+def test_ranges_combine_weekly_and_daily_rollups():
+    rollups = Rollups()
+    days = [MONDAY + timedelta(days=i) for i in range(-3, 18)]
+    for day in days:
+        rollups.add(entry(at(day), "trigger", duration=5))
+    start, end = MONDAY - timedelta(days=2), MONDAY + timedelta(days=15)
+    expected = sum(start <= day <= end for day in days)
+    assert rollups.query(start, end)["Micro"]['due'] == expected
+    assert rollups.query(MONDAY, MONDAY + timedelta(days=6))["Micro"]['due'] == 7
+
+
+def test_load_rollups_catches_up_incrementally(tmp_path):
+    clock = iter(at(MONDAY, 9, minute) for minute in range(60))
+    log = EventLog(tmp_path, clock=lambda: next(clock))
+    for _ in range(3):
+        log.record("trigger", **{'break': "Micro", 'duration': 5})
+    log.flush()
+
+    first = load_rollups(tmp_path)
+    assert (tmp_path / ROLLUPS_FILE).exists()
+    assert first.query(MONDAY, MONDAY)["Micro"]['due'] == 3
+
+    log.record("close", **{'break': "Micro", 'duration': 5, 'elapsed': 5})
+    log.close()
+    second = load_rollups(tmp_path)
+    counters = second.query(MONDAY, MONDAY)["Micro"]
+    assert (counters['due'], counters['taken']) == (3, 1)  # Saved events are not counted twice
+
+
+def test_catch_up_keeps_events_sharing_the_last_timestamp(tmp_path):
+    log = EventLog(tmp_path, clock=lambda: at(MONDAY, 9))  # Every event in the same second
+    log.record("trigger", **{'break': "Micro", 'duration': 5})
+    log.flush()
+    first = load_rollups(tmp_path)
+    assert (first.through, first.through_count) == (at(MONDAY, 9), 1)
+
+    log.record("trigger", **{'break': "Normal", 'duration': 600})
+    log.record("close", **{'break': "Micro", 'duration': 5, 'elapsed': 5})
+    log.close()
+    second = load_rollups(tmp_path)
+    totals = second.query(MONDAY, MONDAY)
+    assert (totals["Micro"]['due'], totals["Micro"]['taken'], totals["Normal"]['due']) == (1, 1, 1)
+    assert second.through_count == 3
+    assert second.catch_up(tmp_path) == 0
+
+
+def test_rollups_saved_without_a_count_skip_the_whole_last_second(tmp_path):
+    log = EventLog(tmp_path, clock=lambda: at(MONDAY, 9))
+    log.record("trigger", **{'break': "Micro", 'duration': 5})
+    log.record("trigger", **{'break': "Micro", 'duration': 5})
+    log.close()
+    saved = load_rollups(tmp_path).to_dict()
+    del saved['through_count']  # As written before the count was tracked
+    (tmp_path / ROLLUPS_FILE).write_text(json.dumps(saved))
+
+    rollups = Rollups.load(tmp_path / ROLLUPS_FILE)
+    assert rollups.catch_up(tmp_path) == 0
+    assert rollups.query(MONDAY, MONDAY)["Micro"]['due'] == 2
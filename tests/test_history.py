@@ -0,0 +1,134 @@
+"""EventLog storage, rotation and time-range reads."""
+
+import itertools
+import threading
+import time
+
+import pytest
+
+from history import LIVE_FILE, EventLog, _seek_since, log_files, read_events
+
+START = 1_760_000_000
+
+
+@pytest.fixture
+def log(tmp_path):
+    """EventLog on a counter clock: event i is stamped START + i // 2 (so timestamps repeat)."""
+    ticks = itertools.count()
+    event_log = EventLog(tmp_path, clock=lambda: START + next(ticks) // 2)
+    yield event_log
+    event_log.close()
+
+
+def write(log, count):
+    for i in range(count):
+        log.record("trigger", **{'break': f"B{i}", 'duration': i})
+    log.flush()
+
+
+def test_events_round_trip_in_order(log, tmp_path):
+    write(log, 50)
+    entries = list(read_events(tmp_path))
+    assert [e['duration'] for e in entries] == list(range(50))
+    assert entries[0] == {'ts': START, 'event': "trigger", 'break': "B0", 'duration': 0}
+
+
+def test_seek_since_matches_a_linear_scan(log, tmp_path):
+    write(log, 300)
+    everything = list(read_events(tmp_path))
+    for since in range(START - 1, START + 152):
+        expected = [e for e in everything if e['ts'] >= since]
+        assert list(read_events(tmp_path, since=since)) == expected, since
+
+
+def test_seek_since_positions_at_line_start(log, tmp_path):
+    write(log, 100)
+    with open(tmp_path / LIVE_FILE, 'rb') as f:
+        _seek_since(f, START + 10)
+        assert f.readline().startswith(b'{"ts":%d,' % (START + 10))
+
+
+def test_until_is_exclusive(log, tmp_path):
+    write(log, 20)
+    entries = list(read_events(tmp_path, since=START + 2, until=START + 5))
+    assert sorted({e['ts'] for e in entries}) == [START + 2, START + 3, START + 4]
+
+
+def test_rotation_keeps_every_event_readable(tmp_path):
+    ticks = itertools.count()
+    log = EventLog(tmp_path, max_bytes=2000, flush_batch=10, clock=lambda: START + next(ticks) * 60)
+    for i in range(200):
+        log.record("close", **{'break': "Micro", 'elapsed': i})
+        if i % 10 == 9:
+            log.flush()
+    log.close()
+
+    assert len(log_files(tmp_path)) > 3
+    entries = list(read_events(tmp_path))
+    assert [e['elapsed'] for e in entries] == list(range(200))
+    late = list(read_events(tmp_path, since=entries[150]['ts']))
+    assert [e['elapsed'] for e in late] == list(range(150, 200))
+
+
+def test_truncated_line_is_skipped(log, tmp_path):
+    write(log, 3)
+    with open(tmp_path / LIVE_FILE, 'ab') as f:
+        f.write(b'{"ts": 17600')  # Write cut short by a crash
+    assert len(list(read_events(tmp_path))) == 3
+
+
+def test_records_nothing_after_close(log, tmp_path):
+    write(log, 2)
+    log.close()
+    log.record("trigger", **{'break': "late"})
+    log.flush()
+    assert len(list(read_events(tmp_path))) == 2
+
+
+def test_scheduler_events_are_mapped(log, tmp_path):
+    log.record_scheduler_event("break_ended", {'name': "Micro", 'duration': 5, 'elapsed': 4, 'test': True})
+    log.record_scheduler_event("breaks_coalesced", {'into': "Normal", 'names': ["Micro"]})
+    log.record_scheduler_event("idle_started", {'since': 0})  # Not logged
+    log.flush()
+    entries = list(read_events(tmp_path))
+    assert [(e['event'], e['break']) for e in entries] == [("close", "Micro"), ("coalesce", "Normal")]
+    assert entries[0]['test'] is True and entries[0]['elapsed'] == 4
+
+
+class RecordingCondition(threading.Condition):
+    """Condition that remembers the timeout of every wait."""
+
+    def __init__(self):
+        super().__init__()
+        self.timeouts = []
+
+    def wait(self, timeout=None):
+        self.timeouts.append(timeout)
+        return super().wait(timeout)
+
+
+def wait_for(predicate, limit=2.0):
+    deadline = time.monotonic() + limit
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_writer_only_times_out_while_events_are_pending(tmp_path):
+    event_log = EventLog(tmp_path, flush_interval=0.05)
+    event_log._cond = RecordingCondition()
+    try:
+        event_log.record("run")
+        wait_for(lambda: event_log.write_count == 1)
+        # With the batch written, the writer parks without a timeout and stays parked
+        wait_for(lambda: event_log._cond.timeouts[-1] is None)
+        waits = len(event_log._cond.timeouts)
+        time.sleep(0.2)
+        assert len(event_log._cond.timeouts) == waits
+        assert 0.05 in event_log._cond.timeouts
+
+        event_log.record("pause")
+        wait_for(lambda: event_log.write_count == 2)
+    finally:
+        event_log.close()
+    assert [e['event'] for e in read_events(tmp_path)] == ["run", "pause"]
@@ -0,0 +1,138 @@
+"""Idle detection: IdleMonitor polling, idle credit and the /proc/interrupts backend."""
+
+import threading
+import time
+
+import pytest
+
+from conftest import make_spec
+from idle import IDLE_THRESHOLD, MAX_POLL, MIN_POLL, FakeIdleBackend, IdleMonitor, ProcInterruptsIdleBackend
+from scheduler import BreakScheduler
+
+
+@pytest.fixture
+def setup(clock, make_scheduler):
+    scheduler, events = make_scheduler([make_spec("Micro", 1200, 20), make_spec("Normal", 3600, 1200)])
+    backend = FakeIdleBackend(clock)
+    monitor = IdleMonitor(scheduler, backend, clock=clock)
+    return scheduler, events, backend, monitor
+
+
+def test_time_away_longer_than_a_break_counts_as_taking_it(clock, setup):
+    scheduler, events, backend, monitor = setup
+    clock.set(100)
+    backend.touch()
+    clock.set(100 + IDLE_THRESHOLD)
+    monitor.poll()
+    assert monitor.away and scheduler.idle_since == 100
+    assert scheduler.time_left() == [1100, 3500]  # Frozen as of the last input
+
+    clock.set(999)
+    assert scheduler.run_due() == []  # Nothing fires while away
+    clock.set(1001)
+    backend.touch(1000)
+    monitor.poll()
+    assert not monitor.away
+    assert events.named("idle_ended") == [{'away': 900, 'credited': ["Micro"]}]
+    assert scheduler.time_left() == [1200, 3500]
+
+
+def test_short_absence_does_not_count(clock, setup):
+    scheduler, events, backend, monitor = setup
+    clock.set(IDLE_THRESHOLD - 1)
+    monitor.poll()
+    assert not monitor.away
+    assert events.named("idle_started") == []
+
+
+def test_poll_interval_adapts(clock, setup):
+    _, _, backend, monitor = setup
+    clock.set(10)
+    assert monitor.poll() == MAX_POLL
+    clock.set(IDLE_THRESHOLD - 10)
+    assert monitor.poll() == 10  # Cannot go idle before then
+    clock.set(IDLE_THRESHOLD)
+    assert monitor.poll() == MIN_POLL
+    delays = [monitor.poll() for _ in range(10)]
+    assert delays[0] == 2 * MIN_POLL
+    assert delays[-1] == MAX_POLL
+    backend.touch()
+    assert monitor.poll() == MAX_POLL  # Back, and far from the threshold again
+
+
+def test_no_idle_period_while_stopped(clock, setup):
+    scheduler, _, _, monitor = setup
+    scheduler.reset()
+    clock.set(10 * IDLE_THRESHOLD)
+    monitor.poll()
+    assert scheduler.idle_since is None
+
+
+def test_stopping_the_monitor_ends_the_idle_period(clock, setup):
+    scheduler, events, _, monitor = setup
+    clock.set(IDLE_THRESHOLD)
+    monitor.poll()
+    monitor.stop()
+    assert scheduler.idle_since is None
+    assert len(events.named("idle_ended")) == 1
+
+
+def test_monitor_thread_restarts_cleanly(setup):
+    _, _, _, monitor = setup
+    for _ in range(5):
+        monitor.start()
+        monitor.stop()
+    assert monitor._thread is None
+
+
+def test_proc_interrupts_backend(tmp_path, clock):
+    path = tmp_path / "interrupts"
+
+    def write(keyboard):
+        path.write_text(f"           CPU0       CPU1\n"
+                        f"  1:  {keyboard}  0   IO-APIC   1-edge      i8042\n"
+                        f"  9:  7   0   IO-APIC   9-fasteoi   acpi\n")
+
+    write(100)
+    backend = ProcInterruptsIdleBackend(str(path), clock=clock)
+    clock.set(50)
+    assert backend.idle_seconds() == 50
+    write(101)
+    assert backend.idle_seconds() == 0
+    clock.set(80)
+    assert backend.idle_seconds() == 30
+
+
+def test_proc_interrupts_backend_needs_input_devices(tmp_path):
+    path = tmp_path / "interrupts"
+    path.write_text("  9:  7   0   IO-APIC   9-fasteoi   acpi\n")
+    with pytest.raises(OSError):
+        ProcInterruptsIdleBackend(str(path))
+
+
+def test_stop_does_not_wait_for_a_poll_blocked_in_a_listener():
+    # A Tk listener blocks the poller until the main thread (here: the test) is free again
+    scheduler = BreakScheduler([make_spec("Micro", 1200, 20)], threaded=False)
+    entered, release = threading.Event(), threading.Event()
+
+    def blocking_listener(event, data):
+        if event == "idle_started":
+            entered.set()
+            release.wait(5)
+
+    scheduler.subscribe(blocking_listener)
+    scheduler.start()
+    backend = FakeIdleBackend()
+    backend.touch(time.monotonic() - 2 * IDLE_THRESHOLD)
+    monitor = IdleMonitor(scheduler, backend, min_poll=0.01)
+    monitor.start()
+    assert entered.wait(2)
+
+    thread = monitor._thread
+    started = time.monotonic()
+    monitor.stop()
+    assert time.monotonic() - started < 0.5
+    release.set()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert scheduler.idle_since is None  # The late begin_idle was undone
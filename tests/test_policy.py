@@ -0,0 +1,109 @@
+"""Policy layering and the settings watcher."""
+
+import json
+import threading
+import time
+
+import pytest
+
+import policy
+from policy import ConfigWatcher, merge_layers, read_policy, user_layer
+from prefs import PreferenceStore
+from scheduler import DEFAULT_BREAKS
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+
+
+def test_policy_files_apply_in_name_order(tmp_path):
+    write_json(tmp_path / "10-company.json", {"always_on_top": False, "sleep_policy": "resume",
+                                               "profiles": {"A": {"breaks": DEFAULT_BREAKS[:1]}}})
+    write_json(tmp_path / "50-team.json", {"sleep_policy": "elapse", "locked": ["sleep_policy"],
+                                            "profiles": {"B": {"breaks": DEFAULT_BREAKS[1:]}}})
+    settings, locked, warnings = read_policy(tmp_path)
+    assert settings["always_on_top"] is False
+    assert settings["sleep_policy"] == "elapse"
+    assert list(settings["profiles"]) == ["A", "B"]  # Merged by name
+    assert locked == {"sleep_policy"}
+    assert warnings == []
+
+
+def test_bad_policy_files_are_reported(tmp_path):
+    (tmp_path / "broken.json").write_text("{")
+    write_json(tmp_path / "types.json", {"always_on_top": "no", "locked": "breaks"})
+    settings, locked, warnings = read_policy(tmp_path)
+    assert settings == {} and locked == set()
+    assert len(warnings) == 3
+    assert read_policy(tmp_path / "missing") == ({}, set(), [])
+
+
+def test_user_settings_override_unlocked_policy():
+    policy_settings = {"always_on_top": False, "sleep_policy": "resume", "profiles": {"A": 1, "B": 2}}
+    user = {"always_on_top": True, "sleep_policy": "elapse", "profiles": {"B": 3, "C": 4}}
+    merged = merge_layers(policy_settings, {"sleep_policy"}, user)
+    assert merged == {"always_on_top": True, "sleep_policy": "resume", "profiles": {"A": 1, "B": 3, "C": 4}}
+
+
+def test_user_layer_keeps_only_differences():
+    policy_settings = {"always_on_top": False, "idle_detection": True, "profiles": {"A": 1, "B": 2}}
+    prefs = {"always_on_top": False, "idle_detection": False, "sleep_policy": "break",
+             "profiles": {"A": 1, "B": 5}}
+    layer = user_layer(prefs, policy_settings, {"sleep_policy"})
+    assert layer == {"idle_detection": False, "profiles": {"B": 5}}
+    # Merging the saved layer back gives the preferences again, less the locked key
+    assert merge_layers(policy_settings, {"sleep_policy"}, layer) == {
+        "always_on_top": False, "idle_detection": False, "profiles": {"A": 1, "B": 5}}
+
+
+# ------------------ WATCHER ------------------
+
+@pytest.fixture(params=["inotify", "poll"])
+def watched(request, tmp_path, monkeypatch):
+    """A started watcher on a preferences file and a policy directory that does not exist yet."""
+    if request.param == "poll":
+        monkeypatch.setattr(policy._Inotify, "create", classmethod(lambda cls: None))
+    elif policy._Inotify.create() is None:
+        pytest.skip("inotify not available")
+    (tmp_path / "etc").mkdir()
+    prefs_path = tmp_path / "prefs.json"
+    policy_dir = tmp_path / "etc" / "policy.d"
+    store = PreferenceStore(prefs_path, delay=0)
+    changes = []
+    changed = threading.Event()
+
+    def on_change():
+        changes.append(time.monotonic())
+        changed.set()
+
+    watcher = ConfigWatcher([prefs_path], [policy_dir], on_change, poll_interval=0.1,
+                            ignore=lambda path: path == prefs_path and store.is_own_write())
+    watcher.start()
+    time.sleep(0.2)  # Let the watcher take its first look
+    yield watcher, store, prefs_path, policy_dir, changes, changed
+    watcher.stop()
+    watcher._thread.join(2)
+    assert not watcher._thread.is_alive()
+
+
+def test_watcher_sees_outside_edits_but_not_own_writes(watched):
+    watcher, store, prefs_path, _, changes, changed = watched
+    store.save({"always_on_top": False})
+    store.flush()
+    time.sleep(0.6)
+    assert changes == []
+
+    write_json(prefs_path, {"always_on_top": True})
+    assert changed.wait(3)
+    assert watcher.change_count == 1
+
+
+def test_watcher_picks_up_a_policy_directory_created_later(watched):
+    _, _, _, policy_dir, changes, changed = watched
+    policy_dir.mkdir()
+    time.sleep(0.4)  # inotify reports the new (empty) directory too; polling has nothing to report yet
+    changed.clear()
+    count = len(changes)
+    write_json(policy_dir / "10-company.json", {"always_on_top": False})
+    assert changed.wait(3)
+    assert len(changes) > count
@@ -0,0 +1,90 @@
+"""PreferenceStore debouncing, change detection and atomic writes."""
+
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from prefs import PreferenceStore
+
+DELAY = 0.05
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PreferenceStore(tmp_path / "prefs.json", delay=DELAY)
+    yield store
+    store.flush()
+
+
+def settle(store, writes, limit=2.0):
+    """Wait for `writes` writes, then a few more debounce periods for any stragglers."""
+    deadline = time.monotonic() + limit
+    while store.write_count < writes:
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+    time.sleep(4 * DELAY)
+
+
+def test_rapid_saves_cost_one_write(store):
+    for i in range(20):
+        store.save({'interval': i})
+    assert store.write_count == 0  # Nothing until the edits settle
+    settle(store, 1)
+    assert store.write_count == 1
+    assert json.loads(store.path.read_text()) == {'interval': 19}
+
+
+def test_identical_payload_is_not_written(store):
+    store.save({'sound': "Glass"})
+    store.flush()
+    mtime = store.path.stat().st_mtime_ns
+    store.save({'sound': "Glass"})
+    store.flush()
+    assert (store.write_count, store.skipped_count) == (1, 1)
+    assert store.path.stat().st_mtime_ns == mtime
+
+
+def test_saving_what_was_loaded_is_skipped(tmp_path):
+    path = tmp_path / "prefs.json"
+    path.write_text(json.dumps({'sound': "Pop"}, indent=2))
+    store = PreferenceStore(path, delay=DELAY)
+    store.save(store.load())
+    store.flush()
+    assert (store.write_count, store.skipped_count) == (0, 1)
+
+
+def test_write_keeps_the_file_mode(store):
+    store.path.write_text("{}")
+    os.chmod(store.path, 0o644)
+    store.save({'sound': "Ping"})
+    store.flush()
+    assert stat.S_IMODE(store.path.stat().st_mode) == 0o644
+
+
+def test_write_replaces_the_file_and_leaves_no_temp_files(store):
+    store.path.write_text("{}")
+    inode = store.path.stat().st_ino
+    store.save({'sound': "Ping"})
+    store.flush()
+    assert store.path.stat().st_ino != inode  # Renamed over, not rewritten in place
+    assert [p.name for p in store.path.parent.iterdir()] == ["prefs.json"]
+    assert store.is_own_write()
+    store.path.write_text('{"sound": "Pop"}')  # Edited by someone else
+    assert not store.is_own_write()
+
+
+def test_failed_replace_keeps_the_old_file(store, monkeypatch):
+    store.path.write_text('{"sound": "Pop"}')
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("prefs.os.replace", fail)
+    store.save({'sound': "Ping"})
+    store.flush()
+    assert store.write_count == 0
+    assert store.path.read_text() == '{"sound": "Pop"}'
+    assert [p.name for p in store.path.parent.iterdir()] == ["prefs.json"]
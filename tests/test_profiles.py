@@ -0,0 +1,107 @@
+"""Profile schema validation, preference sanitizing and bundle round trips."""
+
+import json
+
+import pytest
+
+import profiles
+from conftest import make_spec
+from profiles import (BUNDLE_FORMAT, BUNDLE_VERSION, ProfileError, make_bundle, read_bundle, sanitize_prefs,
+                      saved_profiles, validate_bundle, write_bundle)
+from scheduler import DEFAULT_BREAKS
+
+
+def bundle(**profile_breaks):
+    return {"format": BUNDLE_FORMAT, "version": BUNDLE_VERSION,
+            "profiles": {name: {"breaks": breaks} for name, breaks in profile_breaks.items()}}
+
+
+def errors_for(data):
+    with pytest.raises(ProfileError) as info:
+        validate_bundle(data)
+    return info.value.errors
+
+
+def test_bundle_round_trip(tmp_path):
+    original = {"Focus": [make_spec("Eyes", 20, 20, interval_unit="min"), make_spec("Walk", 1, 5, "hour", "min")],
+                "Default": [make_spec("Micro", 25, 5, interval_unit="min", auto_dismiss=False)]}
+    path = tmp_path / "bundle.json"
+    write_bundle(path, original)
+    assert read_bundle(path) == original
+    assert json.loads(path.read_text()) == make_bundle(original)
+
+
+def test_errors_name_the_field_and_suggest_fixes():
+    entry = dict(DEFAULT_BREAKS[0], interval_unit="mins", duraton_val=3)
+    errors = errors_for(bundle(Team=[entry]))
+    assert 'profiles["Team"].breaks[0].interval_unit: must be one of sec, min, hour (got "mins")' in errors
+    assert "profiles[\"Team\"].breaks[0]: unknown field 'duraton_val' (did you mean 'duration_val'?)" in errors
+
+
+def test_every_problem_is_reported_at_once():
+    errors = errors_for({"format": "other", "version": 2, "extra": 1,
+                         "profiles": {"A": {"breaks": [{"name": "x"}]}, "": {"breaks": []}}})
+    assert len(errors) >= 5
+    assert any(e.startswith("format:") for e in errors)
+    assert any(e.startswith("version:") for e in errors)
+    assert any("required" in e for e in errors)
+
+
+@pytest.mark.parametrize("field, value", [("interval_val", 0), ("duration_val", -5),
+                                          ("interval_val", 2.5), ("interval_val", "10"), ("auto_dismiss", 1)])
+def test_invalid_values_are_rejected(field, value):
+    errors = errors_for(bundle(Team=[dict(DEFAULT_BREAKS[0], **{field: value})]))
+    assert [e for e in errors if f".{field}:" in e]
+
+
+def test_duplicate_break_names_and_empty_bundles():
+    assert any("duplicate break name" in e for e in errors_for(bundle(Team=[DEFAULT_BREAKS[0]] * 2)))
+    assert errors_for(bundle()) == ["profiles: must contain at least one profile"]
+
+
+def test_sanitize_replaces_bad_fields_with_defaults():
+    prefs = {"breaks": [dict(DEFAULT_BREAKS[0], interval_val=0)], "always_on_top": "yes", "extra": 1}
+    clean, warnings = sanitize_prefs(prefs)
+    assert clean["breaks"][0]["interval_val"] == DEFAULT_BREAKS[0]["interval_val"]
+    assert "always_on_top" not in clean
+    assert clean["extra"] == 1  # Unknown settings are left alone
+    assert len(warnings) == 2
+
+
+def test_sanitize_drops_invalid_profiles_only():
+    prefs = {"profiles": {"Good": {"breaks": DEFAULT_BREAKS}, "Bad": {"breaks": "none"}}}
+    clean, warnings = sanitize_prefs(prefs)
+    assert list(clean["profiles"]) == ["Good"]
+    assert warnings
+    assert sanitize_prefs([1, 2]) == ({}, ["preferences: must be a JSON object; using defaults"])
+
+
+def test_saved_profiles_use_the_edited_breaks_for_the_active_profile():
+    edited = [dict(DEFAULT_BREAKS[0], interval_val=10)]
+    prefs = {"active_profile": "Work", "breaks": edited,
+             "profiles": {"Work": {"breaks": DEFAULT_BREAKS}, "Home": {"breaks": DEFAULT_BREAKS}}}
+    result = saved_profiles(prefs)
+    assert [s.interval_val for s in result["Work"]] == [10]
+    assert len(result["Home"]) == 2
+
+
+def test_cli_imports_into_preferences_without_a_running_app(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(profiles, "CONTROL_SOCKET", tmp_path / "none.sock")
+    prefs_path = tmp_path / "prefs.json"
+    bundle_path = tmp_path / "bundle.json"
+    bundle_path.write_text(json.dumps(bundle(Team=[DEFAULT_BREAKS[1]])))
+
+    assert profiles.main(["--prefs", str(prefs_path), "validate", str(bundle_path)]) == 0
+    assert profiles.main(["--prefs", str(prefs_path), "import", str(bundle_path)]) == 0
+    assert list(json.loads(prefs_path.read_text())["profiles"]) == ["Team"]
+
+    capsys.readouterr()
+    profiles.main(["--prefs", str(prefs_path), "list"])
+    assert "Team (1 breaks)" in capsys.readouterr().out
+
+
+def test_cli_rejects_an_invalid_bundle(tmp_path, capsys):
+    path = tmp_path / "bad.json"
+    path.write_text("{not json")
+    assert profiles.main(["--prefs", str(tmp_path / "prefs.json"), "validate", str(path)]) == 1
+    assert "invalid" in capsys.readouterr().out
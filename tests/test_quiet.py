@@ -0,0 +1,121 @@
+"""Quiet hours: recurrence rules, ICS parsing, schedule lookups and break deferral."""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import make_spec
+from quiet import QuietSchedule, load_quiet_schedule, parse_ics, rule_recurrence
+
+MONDAY = datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp()
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+@pytest.fixture(autouse=True)
+def utc(monkeypatch):
+    """Rules are in local time; pin it to UTC so the expected timestamps are fixed."""
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def ics(*events):
+    body = "".join(f"BEGIN:VEVENT\r\n{event.strip()}\r\nEND:VEVENT\r\n" for event in events)
+    return f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\n{body}END:VCALENDAR\r\n"
+
+
+def test_weekday_rule():
+    schedule = load_quiet_schedule([{"days": ["mon", "wed"], "start": "10:00", "end": "10:30"}])
+    assert schedule.busy_until(MONDAY + 10.25 * HOUR) == MONDAY + 10.5 * HOUR
+    assert schedule.busy_until(MONDAY + 10.5 * HOUR) is None  # End is exclusive
+    assert schedule.busy_until(MONDAY + DAY + 10.25 * HOUR) is None
+    assert schedule.busy_until(MONDAY + 2 * DAY + 10.25 * HOUR) == MONDAY + 2 * DAY + 10.5 * HOUR
+
+
+def test_rule_past_midnight():
+    schedule = load_quiet_schedule([{"start": "22:00", "end": "07:00"}])
+    assert schedule.free_at(MONDAY + 23 * HOUR) == MONDAY + DAY + 7 * HOUR
+
+
+def test_invalid_rule():
+    with pytest.raises(ValueError, match="invalid quiet hours rule"):
+        rule_recurrence({"days": ["funday"], "start": "10:00", "end": "11:00"})
+
+
+def test_ics_events_and_exclusions():
+    events, recurrences = parse_ics(ics(
+        "DTSTART:20260105T090000Z\r\nDTEND:20260105T093000Z\r\nSUMMARY:Standup",
+        "DTSTART:20260105T120000Z\r\nDURATION:PT1H\r\nTRANSP:TRANSPARENT",
+        "DTSTART:20260105T130000Z\r\nDURATION:PT1H\r\nSTATUS:CANCELLED",
+        "DTSTART;VALUE=DATE:20260106\r\nDTEND;VALUE=DATE:20260107\r\nSUMMARY:Holiday",
+        "DTSTART:20260105T150000Z\r\nDURATION:PT45M\r\nSUMMARY:Long\r\n  folded title",
+        "DTSTART:bogus\r\nDURATION:PT1H",
+    ))
+    assert recurrences == []
+    assert events == [(MONDAY + 9 * HOUR, MONDAY + 9.5 * HOUR, "Standup"),
+                      (MONDAY + 15 * HOUR, MONDAY + 15.75 * HOUR, "Long folded title")]
+
+
+def test_ics_weekly_recurrence_with_count_and_exdate():
+    _, recurrences = parse_ics(ics(
+        "DTSTART:20260105T100000Z\r\nDTEND:20260105T110000Z\r\n"
+        "RRULE:FREQ=WEEKLY;BYDAY=MO,WE;COUNT=4\r\nEXDATE:20260107T100000Z"))
+    schedule = QuietSchedule(recurrences=recurrences)
+    starts = [s for s, _ in schedule.busy_periods(MONDAY, MONDAY + 4 * 7 * DAY)]
+    assert starts == [MONDAY + 10 * HOUR + d * DAY for d in (0, 7, 9)]  # Wed 7th excluded, 4 in all
+
+
+def test_ics_until_and_interval():
+    _, recurrences = parse_ics(ics(
+        "DTSTART:20260105T100000Z\r\nDURATION:PT30M\r\nRRULE:FREQ=DAILY;INTERVAL=2;UNTIL=20260110T000000Z"))
+    schedule = QuietSchedule(recurrences=recurrences)
+    starts = [s for s, _ in schedule.busy_periods(MONDAY, MONDAY + 14 * DAY)]
+    assert starts == [MONDAY + 10 * HOUR + d * DAY for d in (0, 2, 4)]
+
+
+def test_unsupported_rule_keeps_the_first_occurrence_only():
+    _, recurrences = parse_ics(ics(
+        "DTSTART:20260113T100000Z\r\nDURATION:PT1H\r\nRRULE:FREQ=MONTHLY;BYDAY=2TU"))
+    schedule = QuietSchedule(recurrences=recurrences)
+    assert len(schedule.busy_periods(MONDAY, MONDAY + 90 * DAY)) == 1
+
+
+def test_free_at_follows_back_to_back_periods_across_weeks():
+    sunday_night = MONDAY + 6 * DAY + 23 * HOUR
+    schedule = QuietSchedule([(sunday_night, MONDAY + 7 * DAY + HOUR, "a"),
+                              (MONDAY + 7 * DAY + HOUR, MONDAY + 7 * DAY + 2 * HOUR, "b")])
+    assert schedule.free_at(sunday_night + 60) == MONDAY + 7 * DAY + 2 * HOUR
+    assert schedule.free_at(MONDAY) == MONDAY
+
+
+def test_overlapping_periods_merge_and_weeks_are_cached():
+    schedule = QuietSchedule([(MONDAY + HOUR, MONDAY + 3 * HOUR, "a"), (MONDAY + 2 * HOUR, MONDAY + 4 * HOUR, "b")])
+    assert schedule.busy_periods(MONDAY, MONDAY + DAY) == [(MONDAY + HOUR, MONDAY + 4 * HOUR)]
+    for offset in range(0, DAY, HOUR):
+        schedule.busy_until(MONDAY + offset)
+    assert schedule.expanded_weeks == 1
+
+
+def test_calendar_file_errors_are_skipped(tmp_path, capsys):
+    path = tmp_path / "work.ics"
+    path.write_text(ics("DTSTART:20260105T090000Z\r\nDTEND:20260105T100000Z"))
+    schedule = load_quiet_schedule([], [str(path), str(tmp_path / "missing.ics")])
+    assert schedule.busy_until(MONDAY + 9.5 * HOUR) == MONDAY + 10 * HOUR
+    assert "Could not read calendar" in capsys.readouterr().out
+
+
+def test_scheduler_defers_breaks_until_quiet_hours_end(clock, make_scheduler):
+    meeting = (MONDAY + 600 - 60, MONDAY + 1800, "Meeting")
+    scheduler, events = make_scheduler([make_spec("Micro", 600, 5)], quiet=QuietSchedule([meeting]),
+                                       wall_clock=lambda: MONDAY + clock())
+    clock.set(600)
+    assert scheduler.run_due() == []
+    assert events.named("breaks_deferred") == [{'names': ["Micro"], 'seconds': 1200}]
+
+    assert scheduler.next_wakeup() == 1800
+    clock.set(1800)
+    assert [b['name'] for b in scheduler.run_due()] == ["Micro"]
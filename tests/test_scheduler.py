@@ -0,0 +1,164 @@
+"""BreakIndex and BreakScheduler driven by a virtual clock."""
+
+from conftest import make_spec
+from scheduler import BreakIndex
+
+
+# ------------------ BREAK INDEX ------------------
+
+def test_index_peeks_earliest_and_moves_deadlines():
+    index = BreakIndex()
+    index.schedule("a", 30)
+    index.schedule("b", 10)
+    index.schedule("c", 20)
+    assert index.peek() == (10, "b")
+
+    index.schedule("b", 40)  # Superseded entry stays in the heap until it surfaces
+    assert index.peek() == (20, "c")
+    assert len(index) == 3
+
+
+def test_index_pop_due_skips_discarded_and_superseded_entries():
+    index = BreakIndex()
+    for item, deadline in [("a", 5), ("b", 10), ("c", 15), ("d", 20)]:
+        index.schedule(item, deadline)
+    index.discard("a")
+    index.schedule("b", 25)
+
+    assert index.pop_due(15) == ["c"]
+    assert "c" not in index
+    assert index.pop_due(30) == ["d", "b"]
+    assert index.peek() is None
+
+
+def test_index_compacts_without_losing_live_items():
+    index = BreakIndex()
+    for step in range(1000):
+        index.schedule(step % 3, step)
+    assert len(index) == 3
+    assert len(index._heap) <= 2 * len(index) + 16
+    assert index.pop_due(10_000) == [1, 2, 0]  # Deadlines 997, 998, 999
+
+
+def test_index_rebuild_replaces_contents():
+    index = BreakIndex()
+    index.schedule("old", 1)
+    index.rebuild([("x", 3), ("y", 2)])
+    assert "old" not in index
+    assert index.peek() == (2, "y")
+
+
+# ------------------ SCHEDULER ------------------
+
+def test_break_fires_at_its_interval(clock, make_scheduler):
+    scheduler, events = make_scheduler([make_spec("Micro", 600, 5), make_spec("Normal", 1800, 60)])
+    assert scheduler.next_wakeup() == 600
+
+    clock.set(599)
+    assert scheduler.run_due() == []
+    clock.set(600)
+    queued = scheduler.run_due()
+    assert [b['name'] for b in queued] == ["Micro"]
+    assert events.named("break_queued") == queued
+    assert scheduler.time_left() == [600, 1200]
+
+
+def test_rearm_is_anchored_to_the_missed_deadline(clock, make_scheduler):
+    scheduler, _ = make_scheduler([make_spec("Micro", 600, 5)])
+    clock.set(603)  # Woke up late
+    scheduler.run_due()
+    assert scheduler.next_wakeup() == 1200
+
+    clock.set(5000)  # Missed several intervals: restart from now instead of firing repeatedly
+    assert len(scheduler.run_due()) == 1
+    assert scheduler.next_wakeup() == 5600
+
+
+def test_breaks_due_together_are_coalesced_into_the_longest(clock, make_scheduler):
+    scheduler, events = make_scheduler([make_spec("Micro", 600, 5), make_spec("Normal", 600, 60)])
+    clock.set(600)
+    queued = scheduler.run_due()
+
+    assert [b['name'] for b in queued] == ["Normal"]
+    assert events.named("breaks_coalesced") == [{'into': "Normal", 'names': ["Micro"]}]
+    assert scheduler.time_left() == [600, 600]
+
+
+def test_snoozed_break_comes_back(clock, make_scheduler):
+    scheduler, events = make_scheduler([make_spec("Normal", 600, 60)])
+    clock.set(600)
+    scheduler.run_due()
+    assert scheduler.begin_next_break()['name'] == "Normal"
+
+    scheduler.snooze_break(5)
+    assert scheduler.next_wakeup() == 900  # Snooze is earlier than the re-armed interval
+    clock.set(900)
+    queued = scheduler.run_due()
+    assert [(b['name'], b['snoozes']) for b in queued] == [("Normal", 1)]
+    assert len(events.named("break_snoozed")) == 1
+
+
+def test_snooze_while_paused_is_skipped(clock, make_scheduler):
+    scheduler, events = make_scheduler([make_spec("Normal", 600, 60)])
+    clock.set(600)
+    scheduler.run_due()
+    scheduler.begin_next_break()
+    scheduler.snooze_break(1)
+    scheduler.pause()
+    clock.set(700)
+    assert scheduler.run_due() == []
+    assert [b['name'] for b in events.named("break_skipped")] == ["Normal"]
+
+
+def test_pause_and_active_break_freeze_countdowns(clock, make_scheduler):
+    scheduler, _ = make_scheduler([make_spec("Micro", 600, 5)])
+    clock.set(100)
+    scheduler.pause()
+    clock.set(1100)
+    assert scheduler.next_wakeup() is None
+    scheduler.resume()
+    assert scheduler.time_left() == [500]
+
+    scheduler.trigger(make_spec("Test", 600, 30))
+    scheduler.begin_next_break()
+    clock.advance(30)
+    assert scheduler.time_left() == [500]
+    scheduler.end_break()
+    assert scheduler.next_wakeup() == clock() + 500
+
+
+def test_queued_break_covered_by_break_taken_meanwhile_is_skipped(clock, make_scheduler):
+    scheduler, events = make_scheduler([make_spec("Micro", 600, 5)])
+    scheduler.trigger(make_spec("Long", 600, 60))
+    scheduler.trigger(make_spec("Short", 600, 30))
+    scheduler.begin_next_break()
+    clock.advance(60)
+    scheduler.end_break()
+
+    assert scheduler.begin_next_break() is None
+    assert [b['name'] for b in events.named("break_skipped")] == ["Short"]
+
+
+def test_triggered_breaks_are_marked_as_tests(make_scheduler):
+    scheduler, events = make_scheduler([make_spec("Micro", 600, 5)])
+    scheduler.trigger(make_spec("Micro", 600, 5))
+    assert events.named("break_queued")[0]['test'] is True
+
+
+def test_update_break_restarts_timer_only_when_interval_changes(clock, make_scheduler):
+    scheduler, _ = make_scheduler([make_spec("Micro", 600, 5)])
+    timer = scheduler.breaks[0]
+    clock.set(200)
+    scheduler.update_break(timer, interval_val=600, duration_val=10)
+    assert scheduler.time_left() == [400]
+    scheduler.update_break(timer, interval_val=900)
+    assert scheduler.time_left() == [900]
+
+
+def test_non_positive_interval_is_clamped(clock, make_scheduler):
+    spec = make_spec("Zero", 0, -5)
+    assert (spec.interval_seconds, spec.duration_seconds) == (1, 1)
+    scheduler, _ = make_scheduler([spec])
+    clock.set(1)
+    assert len(scheduler.run_due()) == 1
+    assert scheduler.run_due() == []  # Not due again at the same instant
@@ -0,0 +1,43 @@
+"""VirtualClock and the deterministic week simulator."""
+
+import pytest
+
+from scheduler import DEFAULT_BREAKS, BreakSpec, VirtualClock
+from simulator import Simulation, extra_break_specs
+
+TIMING_KEYS = ('wall_seconds', 'events_per_second')
+
+
+def run(days=3, seed=1, **kwargs):
+    specs = [BreakSpec(**b) for b in DEFAULT_BREAKS] + extra_break_specs(kwargs.pop('extra_breaks', 0), seed)
+    stats = Simulation(specs, days=days, seed=seed, **kwargs).run()
+    return {key: value for key, value in stats.items() if key not in TIMING_KEYS}
+
+
+def test_virtual_clock_only_moves_forward():
+    clock = VirtualClock(10)
+    clock.advance(5)
+    assert clock() == 15
+    with pytest.raises(ValueError):
+        clock.set(14)
+
+
+def test_simulation_is_deterministic():
+    assert run(seed=7) == run(seed=7)
+
+
+def test_simulation_fires_and_takes_breaks():
+    stats = run(days=5)
+    assert stats['simulated_days'] == 5
+    assert stats['fired'] > 0
+    assert stats['started'] > 0
+    assert stats['completed'] <= stats['started']
+
+
+def test_calendar_meetings_defer_breaks():
+    stats = run(days=5, calendar_events=200)
+    assert stats['deferred'] > 0
+
+
+def test_extra_breaks_coalesce():
+    assert run(days=2, extra_breaks=20)['coalesced'] > 0
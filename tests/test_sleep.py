@@ -0,0 +1,108 @@
+"""System sleep detection and the sleep policies."""
+
+import pytest
+
+from conftest import make_spec
+from scheduler import SLEEP_CHECK_INTERVAL, SLEEP_THRESHOLD, VirtualClock
+
+HOUR = 3600
+
+
+@pytest.fixture
+def sleepy(clock, make_scheduler):
+    """Scheduler whose sleep clock (boot time) can run ahead of the monotonic clock."""
+    boot = VirtualClock()
+
+    def build(policy):
+        scheduler, events = make_scheduler([make_spec("Micro", 1200, 20), make_spec("Normal", 3000, 600)],
+                                           sleep_clock=boot, sleep_policy=policy)
+        clock.set(600)
+        boot.set(600)
+        scheduler.run_due()  # First check only records the mark
+        return scheduler, events
+
+    def sleep(seconds):
+        boot.advance(seconds)  # The monotonic clock stands still while asleep
+
+    return build, sleep
+
+
+def test_break_policy_counts_the_sleep_as_a_break(sleepy):
+    build, sleep = sleepy
+    scheduler, events = build("break")
+    sleep(300)
+    scheduler.run_due()
+    assert events.named("slept") == [{'seconds': 300, 'policy': "break", 'credited': ["Micro"]}]
+    assert scheduler.time_left() == [1200, 2400]
+
+
+def test_break_policy_drops_snoozes_covered_by_the_sleep(clock, sleepy):
+    build, sleep = sleepy
+    scheduler, events = build("break")
+    scheduler.trigger(make_spec("Micro", 1200, 20))
+    scheduler.begin_next_break()
+    scheduler.snooze_break(5)
+    sleep(8 * HOUR)
+    scheduler.run_due()
+    assert [b['name'] for b in events.named("break_skipped")] == ["Micro"]
+    clock.advance(300)
+    assert scheduler.run_due() == []
+
+
+def test_resume_policy_leaves_timers_alone(sleepy):
+    build, sleep = sleepy
+    scheduler, events = build("resume")
+    sleep(8 * HOUR)
+    scheduler.run_due()
+    assert events.named("slept")[0]['credited'] == []
+    assert scheduler.time_left() == [600, 2400]
+
+
+def test_only_policies_that_act_on_sleep_cap_timer_waits(sleepy):
+    build, _ = sleepy
+    scheduler, _ = build("resume")
+    assert scheduler._wait_limit() is None
+    for policy in ("break", "elapse"):
+        scheduler.set_sleep_policy(policy)
+        assert scheduler._wait_limit() == SLEEP_CHECK_INTERVAL
+
+
+def test_no_sleep_clock_means_no_wait_cap(make_scheduler):
+    scheduler, _ = make_scheduler([make_spec("Micro", 1200, 20)])
+    assert scheduler._wait_limit() is None
+
+
+def test_elapse_policy_fires_overdue_breaks_once(sleepy):
+    build, sleep = sleepy
+    scheduler, events = build("elapse")
+    sleep(8 * HOUR)
+    queued = scheduler.run_due()
+    assert [b['name'] for b in queued] == ["Normal"]
+    assert events.named("breaks_coalesced") == [{'into': "Normal", 'names': ["Micro"]}]
+    assert scheduler.run_due() == []
+
+
+def test_short_gaps_are_not_sleeps(sleepy):
+    build, sleep = sleepy
+    scheduler, events = build("break")
+    sleep(SLEEP_THRESHOLD - 1)
+    scheduler.run_due()
+    assert events.named("slept") == []
+
+
+def test_sleep_while_idle_extends_the_time_away(clock, sleepy):
+    build, sleep = sleepy
+    scheduler, events = build("break")
+    scheduler.begin_idle(500)
+    sleep(HOUR)
+    scheduler.run_due()
+    assert scheduler.idle_since == 500 - HOUR
+    scheduler.end_idle()
+    assert events.named("idle_ended")[0]['away'] == HOUR + 100
+
+
+def test_unknown_policy_is_rejected(sleepy):
+    build, _ = sleepy
+    scheduler, _ = build("break")
+    with pytest.raises(ValueError):
+        scheduler.set_sleep_policy("hibernate")
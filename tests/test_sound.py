@@ -0,0 +1,93 @@
+"""SoundPlayer backend selection, handle caching and process spawns."""
+
+import pytest
+
+from sound import AfplayBackend, SoundBackend, SoundPlayer, play_sound
+
+
+class FakeBackend(SoundBackend):
+    """In-process backend that records loads and plays."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.loads = []
+        self.plays = []
+
+    def load(self, sound_name):
+        self.loads.append(sound_name)
+        return None if sound_name == "None" else object()
+
+    def play(self, handle):
+        self.plays.append(handle)
+
+
+@pytest.fixture
+def player():
+    backend = FakeBackend()
+    return SoundPlayer(backend), backend
+
+
+def test_repeated_plays_reuse_the_cached_handle(player):
+    player, backend = player
+    for _ in range(5):
+        player.play("Glass")
+    assert backend.loads == ["Glass"]
+    assert len(backend.plays) == 5 and len({id(h) for h in backend.plays}) == 1
+
+
+def test_in_process_backend_spawns_no_processes(player):
+    player, backend = player
+    player.preload()
+    for name in ("Glass", "Ping", "Pop", "Submarine", "Glass"):
+        player.play(name)
+    assert player.spawn_count == 0
+    assert len(backend.loads) == len(set(backend.loads))  # Each sound loaded once, by preload
+
+
+def test_unavailable_sound_is_cached_and_not_played(player):
+    player, backend = player
+    player.play("None")
+    player.play("None")
+    assert backend.loads == ["None"] and backend.plays == []
+
+
+def test_failing_load_is_not_retried(player):
+    player, backend = player
+
+    def broken(sound_name):
+        backend.loads.append(sound_name)
+        raise OSError("no audio device")
+
+    backend.load = broken
+    player.play("Ping")
+    player.play("Ping")
+    assert backend.loads == ["Ping"] and backend.plays == []
+
+
+def test_set_backend_drops_cached_handles(player):
+    player, backend = player
+    player.play("Pop")
+    other = FakeBackend()
+    player.set_backend(other)
+    player.play("Pop")
+    assert backend.loads == ["Pop"] and other.loads == ["Pop"]
+
+
+def test_afplay_fallback_counts_each_spawn(monkeypatch):
+    spawned = []
+    monkeypatch.setattr("sound.subprocess.Popen", lambda args, **kwargs: spawned.append(args))
+    player = SoundPlayer()
+    player.set_backend(AfplayBackend(player._count_spawn))
+    player.play("Glass")
+    player.play("Glass")
+    assert player.spawn_count == 2 and len(spawned) == 2
+
+
+def test_play_sound_ignores_none(monkeypatch, player):
+    player, backend = player
+    monkeypatch.setattr("sound.PLAYER", player)
+    play_sound("None")
+    play_sound(None)
+    play_sound("Glass")
+    assert backend.loads == ["Glass"]